@@ -0,0 +1,14 @@
+from team_league_generator.manifest import MANIFEST_FILE, write_manifest
+
+
+# This script does the following:
+# - scan the package's data/geography directory
+# - for each country code, record its cities file, states file,
+#   English name (from _ABBR_KEY) and line counts
+# - write the result to data/geography/_MANIFEST.json
+#
+# Re-run this whenever the geography data files change.
+
+
+manifest = write_manifest()
+print(f"Wrote {len(manifest['countries'])} countries to {MANIFEST_FILE}")
@@ -0,0 +1,17 @@
+import os
+from team_league_generator.pack import DATA_PACK_FILE, DataPack, compile_pack
+
+
+# This script does the following:
+# - read every text data file in the package (team names, first/last names,
+#   leagues/divisions, and every cities/states file under data/geography)
+# - compile them into a single binary pack, data/wordlists.pack, with a
+#   per-list offset table and packed utf-8 strings
+#
+# The text files remain the source of truth. Re-run this whenever they change.
+
+
+compile_pack()
+pack = DataPack(DATA_PACK_FILE)
+print(f"Wrote {len(pack.names())} lists ({os.path.getsize(DATA_PACK_FILE)} bytes) to {DATA_PACK_FILE}")
+print(f"Data version: {pack.data_version:08x}")
@@ -0,0 +1,16 @@
+from team_league_generator.population import build_alias_tables
+
+
+# This script does the following:
+# - read every population file (<country-code>.pop, <country-code>_states.pop)
+#   under data/geography, as written by parse_all.py
+# - build the alias table for each one and save it next to it as a .alias file,
+#   so the population-weighted generators can load it without rebuilding it
+#
+# Re-run this whenever the population files change.
+
+
+written = build_alias_tables()
+for fpath in written:
+    print(f"Wrote {fpath}")
+print(f"Wrote {len(written)} alias tables")
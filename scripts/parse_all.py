@@ -17,12 +17,21 @@ CITY_POPLIM = 1e3
 #   - create <country-code>.txt with cities greater than city population limit
 #   - create <country-code>_states.txt with names of states
 # - cities and states shall be sorted in order from largest first to smallest last
+#   - create <country-code>.pop and <country-code>_states.pop with the matching
+#     populations, one per line (used by the population-weighted generators)
+# - a name that appears more than once is kept only in its largest place, as the
+#   generators drop repeated lines when they load a list, so the .pop files line up
 
 
 HERE = os.path.abspath(os.path.dirname(__file__))
 XML = os.path.join(HERE, 'world_full.xml')
 
 
+def first_of_each_name(pairs):
+    seen = set()
+    return [p for p in pairs if not (p[0] in seen or seen.add(p[0]))]
+
+
 with open(XML) as f:
     doc = xmltodict.parse(f.read())
 
@@ -104,20 +113,28 @@ for continent in continents_list:
                         cities_pop.append((cname, cpop))
 
         cities_pop.sort(key=lambda x: x[1], reverse=True)
+        cities_pop = first_of_each_name(cities_pop)
         final_cities = [c[0] for c in cities_pop]
 
         states_pop.sort(key=lambda x: x[1], reverse=True)
+        states_pop = first_of_each_name(states_pop)
         final_states = [s[0] for s in states_pop]
 
         if len(final_cities)>0:
             cfname = os.path.join(outputdir, f'{abbr}.txt')
             with open(cfname, 'w') as f:
                 f.write("\n".join(final_cities))
+            cpfname = os.path.join(outputdir, f'{abbr}.pop')
+            with open(cpfname, 'w') as f:
+                f.write("\n".join([str(max(c[1], 1)) for c in cities_pop]))
 
         if len(final_states)>0:
             sfname = os.path.join(outputdir, f'{abbr}_states.txt')
             with open(sfname, 'w') as f:
                 f.write("\n".join(final_states))
+            spfname = os.path.join(outputdir, f'{abbr}_states.pop')
+            with open(spfname, 'w') as f:
+                f.write("\n".join([str(max(s[1], 1)) for s in states_pop]))
 
 keyfname = os.path.join(outputdir, '_ABBR_KEY')
 with open(keyfname, 'w') as f:
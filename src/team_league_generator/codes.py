@@ -0,0 +1,198 @@
+import base64
+from .errors import LeagueCodeError
+from .league import League
+from .pack import get_data_pack, get_data_version
+from .splortsleague import SplortsLeagueGenerator
+
+
+# League codes look like "tlg1.<base64url>". The payload is a sequence of
+# unsigned LEB128 varints:
+#
+#   data version, geo type, country code length, country code (ascii bytes),
+#   number of leagues, number of divisions, teams per division,
+#   league and division name indices (into the distinct league/division names),
+#   location indices, team name indices
+#
+# A code only holds indices, so it can be decoded only against the same
+# word lists: the data version is checked when decoding. The data version
+# describes the data pack, so a list read from an edited text file instead
+# of the pack can neither make nor read codes.
+LEAGUE_CODE_PREFIX = "tlg1."
+
+# Order matters: geo types are stored by their position in this tuple
+GEO_TYPES = ("cities", "bigcities", "smalltowns", "states", "bigstates", "smallstates")
+
+# Constructor arguments that point a generator at files a code cannot name
+_CUSTOM_FILE_KWARGS = ("team_names_file", "leagues_divisions_file")
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Reader(object):
+    """
+    Cursor over a league code payload
+    """
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.pos = 0
+
+    def varint(self):
+        value = 0
+        shift = 0
+        while True:
+            if self.pos >= len(self.payload):
+                raise LeagueCodeError("Error: league code is truncated")
+            byte = self.payload[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+    def varints(self, count, limit):
+        values = [self.varint() for _ in range(count)]
+        if any(value >= limit for value in values):
+            raise LeagueCodeError("Error: league code has an index out of range")
+        return values
+
+    def read(self, count):
+        if self.pos + count > len(self.payload):
+            raise LeagueCodeError("Error: league code is truncated")
+        data = self.payload[self.pos:self.pos + count]
+        self.pos += count
+        return data
+
+
+def encode_league(generator, league):
+    """
+    Return a short code for a League made by generator.generate_league().
+
+    The generator must use the built-in word lists, since the code records
+    only indices into them (plus the data version, geo type and country code).
+    """
+    init_kwargs = generator._init_kwargs
+    for key in _CUSTOM_FILE_KWARGS:
+        if init_kwargs.get(key) is not None:
+            raise LeagueCodeError(f"Error: leagues generated from a custom {key} cannot be encoded")
+    if league.locations is not generator.geo.data or league.nicknames is not generator.team.data:
+        raise LeagueCodeError("Error: league was not generated by this generator")
+    _check_data_version(generator)
+
+    country_code = init_kwargs["country_code"].encode("ascii")
+    name_indices = generator.lea.get_index().name_indices
+
+    out = bytearray()
+    for value in (
+        get_data_version(),
+        GEO_TYPES.index(init_kwargs["geo"]),
+        len(country_code),
+    ):
+        _write_varint(out, value)
+    out.extend(country_code)
+    for value in (len(league.leagues), len(league.divisions), league.teams_per_division):
+        _write_varint(out, value)
+    for name in league.leagues + league.divisions:
+        _write_varint(out, name_indices[name])
+    for i in league.location_indices:
+        _write_varint(out, i)
+    for i in league.nickname_indices:
+        _write_varint(out, i)
+    return LEAGUE_CODE_PREFIX + base64.urlsafe_b64encode(bytes(out)).decode("ascii").rstrip("=")
+
+
+def decode_league(code):
+    """
+    Rebuild the League that encode_league() turned into code.
+    """
+    if not code.startswith(LEAGUE_CODE_PREFIX):
+        raise LeagueCodeError(f"Error: {code[:16]} is not a league code")
+    body = code[len(LEAGUE_CODE_PREFIX):]
+    try:
+        payload = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+    except ValueError:
+        raise LeagueCodeError("Error: league code is not valid base64")
+
+    reader = _Reader(payload)
+    data_version = reader.varint()
+    if data_version != get_data_version():
+        raise LeagueCodeError(
+            f"Error: league code was made with data version {data_version}, "
+            f"this package has data version {get_data_version()}"
+        )
+    geo_index = reader.varint()
+    if geo_index >= len(GEO_TYPES):
+        raise LeagueCodeError(f"Error: league code has an invalid geo type {geo_index}")
+    try:
+        country_code = reader.read(reader.varint()).decode("ascii")
+    except UnicodeDecodeError:
+        raise LeagueCodeError("Error: league code has an invalid country code")
+    nleagues, ndivisions, teams_per_division = reader.varint(), reader.varint(), reader.varint()
+
+    generator = _get_generator(GEO_TYPES[geo_index], country_code)
+    _check_data_version(generator)
+    names = generator.lea.get_index().names
+    name_indices = reader.varints(nleagues + ndivisions, len(names))
+    nteams = nleagues * ndivisions * teams_per_division
+    location_indices = reader.varints(nteams, len(generator.geo.data))
+    nickname_indices = reader.varints(nteams, len(generator.team.data))
+    if reader.pos != len(payload):
+        raise LeagueCodeError("Error: league code has trailing data")
+
+    return League(
+        [names[i] for i in name_indices[:nleagues]],
+        [names[i] for i in name_indices[nleagues:]],
+        teams_per_division,
+        generator.geo.data,
+        generator.team.data,
+        location_indices,
+        nickname_indices,
+    )
+
+
+def _check_data_version(generator):
+    """
+    Raise LeagueCodeError unless every word list generator uses holds the
+    data that get_data_version() describes: a list served from the data pack,
+    or read from a text file that still matches the pack.
+    """
+    pack = get_data_pack()
+    if pack is None:
+        # The data version was computed from the text files themselves
+        return
+    geo = generator.geo
+    for gen, fpath in (
+        (geo, getattr(geo, "cities_file", None) or geo.states_file),
+        (generator.team, generator.team.team_names_file),
+        (generator.lea, generator.lea.leagues_divisions_file),
+    ):
+        if not gen.file_backed and pack.lookup(fpath) is not None:
+            continue
+        # Read from the text file: only its contents can tell
+        if not pack.is_current(fpath):
+            raise LeagueCodeError(
+                f"Error: {fpath} has changed since the data pack was built, "
+                f"league codes cannot be made or read from it"
+            )
+
+
+# Generators used for decoding, one per (geo type, country code).
+# They only serve as handles on the shared word lists.
+_generators = {}
+
+
+def _get_generator(geo, country_code):
+    key = (geo, country_code)
+    generator = _generators.get(key)
+    if generator is None:
+        try:
+            generator = SplortsLeagueGenerator(geo=geo, country_code=country_code)
+        except Exception as e:
+            raise LeagueCodeError(f"Error: league code has an invalid country code {country_code}: {e}")
+        _generators[key] = generator
+    return generator
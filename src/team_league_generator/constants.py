@@ -4,3 +4,9 @@ import os
 HERE = os.path.abspath(os.path.dirname(__file__))
 DATA = os.path.join(HERE, 'data')
 GEO = os.path.join(DATA, 'geography')
+
+# Big cities are the first 1/3 of a country's cities list, small towns the rest
+CITIES_BUCKET_DIVISOR = 3
+
+# Big states are the first 1/2 of a country's states list, small states the rest
+STATES_BUCKET_DIVISOR = 2
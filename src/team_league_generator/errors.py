@@ -16,3 +16,15 @@ class GeographyError(Exception):
 
 class CountryCodeError(GeographyError):
     pass
+
+
+class DataPackError(Exception):
+    pass
+
+
+class BackendError(Exception):
+    pass
+
+
+class LeagueCodeError(Exception):
+    pass
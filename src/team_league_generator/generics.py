@@ -1,47 +1,363 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from itertools import islice
 import random
-from .errors import NotIterableError, InvalidSizeRequestError
+import threading
+from .errors import NotIterableError, InvalidSizeRequestError, KeywordError
+from .indexes import PrefixIndex
+from .registry import word_lists
+from .samplers import (
+    AliasTable,
+    Deck,
+    FeistelPermutation,
+    LinearSampler,
+    iter_weighted_ranking,
+    linear_weights,
+    get_rng,
+    reservoir_sample,
+    reservoir_sample_with_replacement,
+    sample_indices,
+    weighted_reservoir_sample,
+    weighted_sample_without_replacement,
+)
+
+
+# Unique linear-biased requests for at most 1/REJECTION_SAMPLING_RATIO of the
+# data are drawn by rejection from the alias table; larger ones use
+# exponential keys so the cost does not blow up as the sample fills the list.
+REJECTION_SAMPLING_RATIO = 4
+
+# Number of items drawn at a time by the iter_generate and stream methods
+STREAM_CHUNK_SIZE = 1024
+
+# Default for IterableDataLoader's data argument, meaning "call load_data() on first use"
+_LAZY = object()
 
 
 class IterableDataLoader(object):
-    def __init__(self, data):
-        if isinstance(data, Iterable):
+    """
+    Holds the data that a generator samples from, as self.data.
+
+    Data can be passed to the constructor, or a subclass can implement
+    load_data() and call the constructor without data. In that case the data
+    is loaded lazily, exactly once, the first time self.data is accessed
+    (by generate, generate_nonunique, len, ...). Loading is guarded by a lock
+    so that threads racing on first use load the data only once.
+    Call warm() to pay the loading cost up front.
+
+    Generators draw from self.rng. Pass rng (a random.Random instance or a
+    seed) to give a generator its own random stream; by default it shares
+    the module-level random generator.
+
+    Pass backend="numpy" to draw batches with vectorized NumPy calls, or
+    backend="auto" to do so only for large batches when NumPy is installed.
+
+    Pass file_backed=True to leave the data files that load_data() reads on
+    disk: lines are then read through a memory-mapped line index when they
+    are drawn, for word files too big to hold in memory.
+
+    Data that cannot be indexed (a generator, a database cursor, ...) is
+    sampled by streaming: each generate or generate_nonunique call makes one
+    pass over it with reservoir sampling, in memory proportional to the size
+    requested. Pass an iterable that can be iterated again (rather than a
+    one-shot iterator) to draw from it more than once. Front-biased
+    sampling needs the stream's length up front, as length_hint.
+
+    Keyword arguments a generator does not use are ignored, so the same
+    options can be passed to every generator.
+    """
+
+    def __init__(self, data=_LAZY, rng=None, backend="python", file_backed=False, length_hint=None, **kwargs):
+        self._data = None
+        self._data_lock = threading.Lock()
+        self.file_backed = file_backed
+        self.length_hint = length_hint
+        self.rng = get_rng(rng)
+        if backend != "python":
+            # NumPy is only imported by generators that may use it
+            from . import numpy_backend
+            numpy_backend.check_backend(backend)
+        self.backend = backend
+        if data is not _LAZY:
             self.data = data
+
+    def set_rng(self, rng):
+        """
+        Replace this generator's random stream (a random.Random instance or a seed).
+        """
+        self.rng = get_rng(rng)
+
+    def get_rng(self, rng=None):
+        """
+        Return the random stream to draw with: rng (a random.Random instance
+        or a seed) if given, otherwise this generator's own random stream.
+        """
+        if rng is None:
+            return self.rng
+        return get_rng(rng)
+
+    def get_numpy_rng(self, size, rng=None):
+        """
+        Return the numpy.random.Generator to draw a batch of this size with,
+        or None if the batch should be drawn with the Python samplers.
+
+        A new NumPy generator is seeded from rng (or self.rng) for every
+        batch, so reseeding the Python random stream reseeds the NumPy draws too.
+        """
+        if self.backend == "python":
+            return None
+        from . import numpy_backend
+        if not numpy_backend.use_numpy(self.backend, size):
+            return None
+        return numpy_backend.make_rng(self.get_rng(rng))
+
+    @property
+    def data(self):
+        if self._data is None:
+            with self._data_lock:
+                if self._data is None:
+                    self.data = self.load_data()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        if isinstance(data, Iterable):
+            self._data = data
         else:
             raise NotIterableError(
-                "Error: data provided to {self.__class__.__name__} was not iterable!"
+                f"Error: data provided to {self.__class__.__name__} was not iterable!"
+            )
+
+    def load_data(self):
+        """
+        Return the data for this generator. Subclasses that load data lazily override this.
+        """
+        raise NotIterableError(
+            f"Error: no data provided to {self.__class__.__name__}!"
+        )
+
+    def is_streaming(self):
+        """
+        Return True if self.data cannot be indexed, and is sampled by streaming
+        """
+        return not isinstance(self.data, Sequence)
+
+    def require_sequence(self, method):
+        if self.is_streaming():
+            raise NotIterableError(
+                f"Error: {self.__class__.__name__}.{method} needs data that can be indexed, "
+                f"not a stream of type {type(self.data).__name__}"
+            )
+
+    def _check_stream_size(self, size):
+        if size < 0:
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: generate method got size parameter {size}, must be at least 0"
             )
 
+    def _check_stream_sample(self, size, sample):
+        if len(sample) < size:
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: generate method got size parameter {size}, "
+                f"the stream only had {len(sample)} items to draw from"
+            )
+        return sample
+
+    def _stream_nonunique(self, size, weight, rng):
+        self._check_stream_size(size)
+        sample = reservoir_sample_with_replacement(self.data, size, rng, weight=weight)
+        if size > 0 and not sample:
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: generate_nonunique method got an empty stream"
+            )
+        return sample
+
+    def get_prefix_index(self, length=1):
+        """
+        Return a PrefixIndex of self.data by its first length characters,
+        building it if the data has changed since it was last built.
+        """
+        cache = getattr(self, "_prefix_index_cache", None)
+        if cache is None or cache[0] is not self.data or cache[1] != len(self.data):
+            cache = (self.data, len(self.data), {})
+            self._prefix_index_cache = cache
+        indexes = cache[2]
+        if length not in indexes:
+            indexes[length] = PrefixIndex(self.data, length)
+        return indexes[length]
+
+    def get_deck(self, seed=None):
+        """
+        Return this generator's Deck over self.data, creating it on first use
+        or when the data has changed. seed is only used when a deck is
+        created; by default it is drawn from self.rng.
+        """
+        self.require_sequence("get_deck")
+        cache = getattr(self, "_deck_cache", None)
+        if cache is None or cache[0] is not self.data or cache[1].n != len(self.data):
+            if seed is None:
+                seed = self.rng.getrandbits(64)
+            cache = (self.data, Deck(len(self.data), seed))
+            self._deck_cache = cache
+        return cache[1]
+
+    def deal(self, size=1):
+        """
+        Deal size items from this generator's deck, in random order.
+
+        Unlike generate, uniqueness holds across calls: no item is dealt
+        twice until the deck is reset or reshuffled (see get_deck).
+        """
+        deck = self.get_deck()
+        if size < 0 or size > len(deck):
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: deal method got size parameter {size}, "
+                f"only {len(deck)} items are left in the deck"
+            )
+        data = self.data
+        return [data[i] for i in deck.draw(size)]
+
+    def get_decoded_data(self):
+        """
+        Return self.data as a tuple or list of ready-made strings, for bulk
+        draws that touch most of the list. Lazily decoded data (e.g. from the
+        data pack) is decoded once: word lists from the registry share one
+        decoded copy across every generator, other data is cached on this
+        generator until self.data is replaced.
+        File-backed data is returned as is.
+        """
+        data = self.data
+        if isinstance(data, (tuple, list)) or self.file_backed:
+            # File-backed data is never copied into memory
+            return data
+        decoded = word_lists.get_decoded(data)
+        if decoded is not None:
+            return decoded
+        cache = getattr(self, "_decoded_cache", None)
+        if cache is None or cache[0] is not data:
+            cache = (data, tuple(data))
+            self._decoded_cache = cache
+        return cache[1]
+
+    def warm(self):
+        """
+        Load the data now instead of on first use. Returns self.
+        """
+        self.data
+        return self
+
+    def __len__(self):
+        return len(self.data)
+
+
+def check_chunk_size(size):
+    if size < 1:
+        raise InvalidSizeRequestError(f"Error: chunk size {size} must be at least 1")
+
+
+def chunked(iterable, size):
+    """
+    Return an iterator over lists of up to size items from an iterable,
+    stopping when it runs out. size is checked right away.
+    """
+    check_chunk_size(size)
+    return _chunks(iter(iterable), size)
+
+
+def _chunks(iterator, size):
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 class UniformGenerator(object):
-    def generate_nonunique(self, size=1):
+    def generate_nonunique(self, size=1, rng=None):
         """
         Sample data with replacement using uniform bias.
         Returns a list of the specified size.
+        Draws from rng if given, otherwise from this generator's random stream.
         """
+        rng = self.get_rng(rng)
+        if self.is_streaming():
+            return self._stream_nonunique(size, None, rng)
         if size > len(self.data) or size < 0:
             raise InvalidSizeRequestError(
                 f"{self.__class__.__name__}: Error: generate_nonunique method got size parameter {size}, must be between 0 and {len(self.data)}"
             )
-        return random.choices(self.data, k=size)
+        np_rng = self.get_numpy_rng(size, rng)
+        if np_rng is not None:
+            from . import numpy_backend
+            indices = numpy_backend.uniform_indices(np_rng, len(self.data), size)
+            return numpy_backend.take(self.data, indices)
+        return rng.choices(self.data, k=size)
 
-    def generate(self, size=1):
+    def generate(self, size=1, rng=None):
         """
         Sample data without replacement using uniform bias.
-        Returns a list of the specified size.
+        Returns a list of the specified size, in random order.
+        Any size up to the full length of the data is allowed.
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
+        rng = self.get_rng(rng)
+        if self.is_streaming():
+            self._check_stream_size(size)
+            return self._check_stream_sample(size, reservoir_sample(self.data, size, rng))
+        return [self.data[i] for i in self.generate_indices(size, rng)]
+
+    def generate_indices(self, size=1, rng=None):
         """
+        Same as generate, but returns the list indices of the items instead of the items.
+        """
+        self.require_sequence("generate_indices")
+        rng = self.get_rng(rng)
         if size > len(self.data) or size < 0:
             raise InvalidSizeRequestError(
-                f"{self.__class__.__name__}: Error: generate_nonunique method got size parameter {size}, must be between 0 and {len(self.data)}"
-            )
-        if size > (2 * len(self.data)) // 3 and len(self.data) > 100:
-            raise InvalidSizeRequestError(
-                f"{self.__class__.__name__}: Error: requested too many unique choices (>2/3 of a data set with >1k items)"
+                f"{self.__class__.__name__}: Error: generate method got size parameter {size}, must be between 0 and {len(self.data)}"
             )
-        choices = set()
-        while len(choices) < size:
-            choices.add(random.choice(self.data))
-        return list(choices)
+        np_rng = self.get_numpy_rng(size, rng)
+        if np_rng is not None:
+            from . import numpy_backend
+            return numpy_backend.unique_uniform_indices(np_rng, len(self.data), size).tolist()
+        return sample_indices(len(self.data), size, rng)
+
+    def iter_generate(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        """
+        Yield items one at a time, drawn uniformly.
+
+        By default items are drawn with replacement, chunk_size at a time,
+        and the stream never ends. If unique is true, every item is yielded
+        exactly once, in random order, and then the stream ends; the order
+        comes from a FeistelPermutation, so memory use stays constant.
+        """
+        check_chunk_size(chunk_size)
+        if unique:
+            self.require_sequence("iter_generate")
+        return self._iter_generate(chunk_size, unique)
+
+    def _iter_generate(self, chunk_size, unique):
+        data = self.data
+        if self.is_streaming():
+            # One pass over the stream per chunk
+            while True:
+                yield from self.generate_nonunique(chunk_size)
+        elif len(data) == 0:
+            return
+        elif unique:
+            n = len(data)
+            permute = FeistelPermutation(n, self.rng.getrandbits(64)).permute
+            for i in range(n):
+                yield data[permute(i)]
+        else:
+            size = min(chunk_size, len(data))
+            while True:
+                yield from self.generate_nonunique(size)
+
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        """
+        Same as iter_generate, but yields lists of chunk_size items.
+        """
+        return chunked(self.iter_generate(chunk_size, unique=unique), chunk_size)
 
 
 class BaseLinearBiasedGenerator(object):
@@ -56,56 +372,204 @@ class BaseLinearBiasedGenerator(object):
     yellow  2 / ( ...     ) = 10%
     purple  1 / ( ...     ) = 5%
 
-    If reversed:
+    If reversed, the same probabilities apply from the back of the list.
+
+    Draws use an alias table that is built once per generator and rebuilt
+    only when self.data is replaced (e.g. by a subclass slicing the list).
+    File-backed generators use a LinearSampler instead, which needs no table.
     """
 
-    def generate_nonunique(self, size=1, reverse=False):
+    def get_alias_table(self):
+        """
+        Return the alias table for front-biased linear weights over self.data,
+        building it if the data has changed since it was last built.
+        """
+        cached = getattr(self, "_alias_cache", None)
+        if cached is not None:
+            data, n, table = cached
+            if data is self.data and n == len(self.data):
+                return table
+        table = AliasTable(linear_weights(len(self.data)))
+        self._alias_cache = (self.data, len(self.data), table)
+        return table
+
+    def get_sampler(self):
+        """
+        Return the sampler for linear weights over self.data: the alias table,
+        or for file-backed data, a LinearSampler that needs no table.
+        """
+        if self.file_backed:
+            cached = getattr(self, "_linear_sampler", None)
+            if cached is None or cached.n != len(self.data):
+                cached = LinearSampler(len(self.data))
+                self._linear_sampler = cached
+            return cached
+        return self.get_alias_table()
+
+    def generate_nonunique(self, size=1, reverse=False, rng=None):
         """
         Sample data with replacement using linear bias.
         Returns a list of the specified size.
 
         Normally, bias is toward items at front of list.
         If reverse is true, bias is twoard items at back of list.
+        Draws from rng if given, otherwise from this generator's random stream.
         """
+        rng = self.get_rng(rng)
+        if self.is_streaming():
+            return self._stream_nonunique(size, self._stream_weight(reverse), rng)
+        # Note: this returns repeats. it's up to the user to filter duplicates
+        return [self.data[i] for i in self._generate_nonunique_indices(size, reverse, rng)]
+
+    def _generate_nonunique_indices(self, size, reverse, rng):
         if size > len(self.data) or size < 0:
             raise InvalidSizeRequestError(
                 f"{self.__class__.__name__}: Error: generate_nonunique method got size parameter {size}, must be between 0 and {len(self.data)}"
             )
-        revweights = list(range(1, len(self.data) + 1))
-        if reverse:
-            weights = revweights
-        else:
-            weights = list(reversed(revweights))
+        sampler = self.get_sampler()
+        np_rng = self.get_numpy_rng(size, rng)
+        if np_rng is not None:
+            from . import numpy_backend
+            if isinstance(sampler, LinearSampler):
+                indices = numpy_backend.linear_indices(np_rng, len(self.data), size)
+            else:
+                indices = numpy_backend.alias_indices(np_rng, sampler, size)
+            if reverse:
+                indices = len(self.data) - 1 - indices
+            return indices.tolist()
 
-        # Note: this returns repeats. it's up to the user to filter duplicates
-        return random.choices(self.data, weights=weights, k=size)
+        indices = sampler.sample_many(size, rng)
+        if reverse:
+            last = len(self.data) - 1
+            indices = [last - i for i in indices]
+        return indices
 
-    def generate(self, size=1, reverse=False):
+    def generate(self, size=1, reverse=False, rng=None):
         """
         Sample data without replacement using linear bias.
-        Returns a list of the specified size.
+        Returns a list of the specified size, in the order the items were drawn.
+        Any size up to the full length of the data is allowed.
 
         Normally, bias is toward items at front of list.
         If reverse is true, bias is twoard items at back of list.
+        Draws from rng if given, otherwise from this generator's random stream.
         """
+        rng = self.get_rng(rng)
+        if self.is_streaming():
+            self._check_stream_size(size)
+            sample = weighted_reservoir_sample(self.data, size, self._stream_weight(reverse), rng)
+            return self._check_stream_sample(size, sample)
+        return [self.data[i] for i in self._generate_indices(size, reverse, rng)]
+
+    def generate_indices(self, size=1, reverse=False, rng=None):
+        """
+        Same as generate, but returns the list indices of the items instead of the items.
+        """
+        return self._generate_indices(size, reverse, self.get_rng(rng))
+
+    def _generate_indices(self, size, reverse, rng):
+        self.require_sequence("generate_indices")
         if size > len(self.data) or size < 1:
             raise InvalidSizeRequestError(
                 f"{self.__class__.__name__}: Error: generate method got size parameter {size}, must be between 0 and {len(self.data)}"
             )
-        if size > (2 * len(self.data)) // 3 and len(self.data) > 100:
-            raise InvalidSizeRequestError(
-                f"{self.__class__.__name__}: Error: requested too many unique choices (>2/3 of a data set with >1k items)"
-            )
-        revweights = list(range(1, len(self.data) + 1))
+        n = len(self.data)
+        np_rng = self.get_numpy_rng(size, rng)
+        if np_rng is not None:
+            from . import numpy_backend
+            indices = numpy_backend.linear_unique_indices(np_rng, n, size)
+            if reverse:
+                indices = n - 1 - indices
+            return indices.tolist()
+
+        if size * REJECTION_SAMPLING_RATIO <= n:
+            # Small requests: draw from the alias table and skip repeats.
+            # Collisions are rare, so this is O(size) on average.
+            sampler = self.get_sampler()
+            indices = {}
+            while len(indices) < size:
+                indices[sampler.sample(rng)] = None
+            indices = list(indices)
+        else:
+            # Large requests (up to a full ranking): exponential keys, O(n log size)
+            indices = weighted_sample_without_replacement(linear_weights(n), size, rng)
         if reverse:
-            weights = revweights
+            indices = [n - 1 - i for i in indices]
+        return indices
+
+    def iter_generate(self, chunk_size=STREAM_CHUNK_SIZE, unique=False, reverse=False):
+        """
+        Yield items one at a time, drawn with linear bias.
+
+        By default items are drawn with replacement, chunk_size at a time,
+        and the stream never ends. If unique is true, every item is yielded
+        exactly once, in the order successive biased draws without
+        replacement would produce, and then the stream ends.
+
+        Unlike the uniform generator's unique stream, which needs constant
+        memory, a biased unique stream keeps a heap of one key per item not
+        yet yielded, so it needs O(n) memory: exact biased draws without
+        replacement have to know which items are left.
+        """
+        check_chunk_size(chunk_size)
+        return self._check_iter_generate(chunk_size, unique, reverse)
+
+    def _check_iter_generate(self, chunk_size, unique, reverse):
+        # Report a stream that cannot be sampled now, not on the first draw
+        if unique:
+            self.require_sequence("iter_generate")
+            return self._iter_generate(chunk_size, unique, reverse, None)
+        weight = self._stream_weight(reverse) if self.is_streaming() else None
+        return self._iter_generate(chunk_size, unique, reverse, weight)
+
+    def _iter_generate(self, chunk_size, unique, reverse, weight):
+        data = self.data
+        if self.is_streaming():
+            # One pass over the stream per chunk
+            while True:
+                yield from self._stream_nonunique(chunk_size, weight, self.rng)
+        elif len(data) == 0:
+            return
+        elif unique:
+            n = len(data)
+            for i in iter_weighted_ranking(linear_weights(n), self.rng):
+                yield data[n - 1 - i] if reverse else data[i]
         else:
-            weights = list(reversed(revweights))
+            size = min(chunk_size, len(data))
+            while True:
+                for i in self._generate_nonunique_indices(size, reverse, self.rng):
+                    yield data[i]
 
-        choices = set()
-        while len(choices) < size:
-            choices.add(random.choices(self.data, weights=weights, k=1)[0])
-        return list(choices)
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, unique=False, reverse=False):
+        """
+        Same as iter_generate, but yields lists of chunk_size items.
+        """
+        check_chunk_size(chunk_size)
+        return chunked(self._check_iter_generate(chunk_size, unique, reverse), chunk_size)
+
+    def _stream_weight(self, reverse):
+        """
+        Return the weight of the item at each position of a streamed data set.
+        Back bias needs no length: the weights grow 1, 2, 3, ... along the stream.
+        Front bias counts down from the stream's length, so it needs length_hint,
+        and a stream longer than length_hint raises KeywordError when it is
+        sampled rather than leaving its extra items out.
+        """
+        if reverse:
+            return lambda i: i + 1
+        n = self.length_hint
+        if n is None:
+            raise KeywordError(
+                f"Error: {self.__class__.__name__} needs length_hint to sample a stream with front bias"
+            )
+        name = self.__class__.__name__
+
+        def weight(i):
+            if i >= n:
+                raise KeywordError(f"Error: {name} got a stream longer than its length_hint {n}")
+            return n - i
+
+        return weight
 
 
 class LinearBiasedGenerator(BaseLinearBiasedGenerator):
@@ -113,11 +577,20 @@ class LinearBiasedGenerator(BaseLinearBiasedGenerator):
     Generator that is linearly biased toward items at the front of the list
     """
 
-    def generate_nonunique(self, size=1):
-        return super().generate_nonunique(size, reverse=False)
+    def generate_nonunique(self, size=1, rng=None):
+        return super().generate_nonunique(size, reverse=False, rng=rng)
+
+    def generate(self, size=1, rng=None):
+        return super().generate(size, reverse=False, rng=rng)
+
+    def generate_indices(self, size=1, rng=None):
+        return super().generate_indices(size, reverse=False, rng=rng)
+
+    def iter_generate(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        return super().iter_generate(chunk_size, unique, reverse=False)
 
-    def generate(self, size=1):
-        return super().generate(size, reverse=False)
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        return super().stream(chunk_size, unique, reverse=False)
 
 
 class ReversedLinearBiasedGenerator(BaseLinearBiasedGenerator):
@@ -125,8 +598,154 @@ class ReversedLinearBiasedGenerator(BaseLinearBiasedGenerator):
     Generator that is linearly biased toward items at the back of the list
     """
 
-    def generate_nonunique(self, size=1):
-        return super().generate_nonunique(size, reverse=True)
+    def generate_nonunique(self, size=1, rng=None):
+        return super().generate_nonunique(size, reverse=True, rng=rng)
 
-    def generate(self, size=1):
-        return super().generate(size, reverse=True)
+    def generate(self, size=1, rng=None):
+        return super().generate(size, reverse=True, rng=rng)
+
+    def generate_indices(self, size=1, rng=None):
+        return super().generate_indices(size, reverse=True, rng=rng)
+
+    def iter_generate(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        return super().iter_generate(chunk_size, unique, reverse=True)
+
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        return super().stream(chunk_size, unique, reverse=True)
+
+
+class WeightedGenerator(object):
+    """
+    Returns a generator that draws items in proportion to arbitrary per-item
+    weights. Subclasses provide the weights as an AliasTable over self.data,
+    returned by their get_alias_table() method.
+    Draws with replacement are O(1) each. Every weight must be above zero.
+    """
+
+    def generate_nonunique(self, size=1, rng=None):
+        """
+        Sample data with replacement in proportion to the weights.
+        Returns a list of the specified size.
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
+        rng = self.get_rng(rng)
+        if size > len(self.data) or size < 0:
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: generate_nonunique method got size parameter {size}, must be between 0 and {len(self.data)}"
+            )
+        table = self.get_alias_table()
+        np_rng = self.get_numpy_rng(size, rng)
+        if np_rng is not None:
+            from . import numpy_backend
+            return numpy_backend.take(self.data, numpy_backend.alias_indices(np_rng, table, size))
+        return [self.data[i] for i in table.sample_many(size, rng)]
+
+    def generate(self, size=1, rng=None):
+        """
+        Sample data without replacement in proportion to the weights.
+        Returns a list of the specified size, in the order the items were drawn.
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
+        return [self.data[i] for i in self.generate_indices(size, rng)]
+
+    def generate_indices(self, size=1, rng=None):
+        """
+        Same as generate, but returns the list indices of the items instead of the items.
+        """
+        rng = self.get_rng(rng)
+        n = len(self.data)
+        if size > n or size < 0:
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: generate method got size parameter {size}, must be between 0 and {n}"
+            )
+        table = self.get_alias_table()
+        # Recovering the weights costs O(n) once per table
+        weights = table.weights()
+        if size * REJECTION_SAMPLING_RATIO > n:
+            return weighted_sample_without_replacement(weights, size, rng)
+
+        # Draw from the alias table and skip repeats while at most half of
+        # the weight (which sums to n) is taken, so that a draw needs at most
+        # two tries on average, however skewed the weights are
+        indices = {}
+        taken = 0.0
+        while len(indices) < size and taken <= n / 2:
+            i = table.sample(rng)
+            if i not in indices:
+                indices[i] = None
+                taken += weights[i]
+        if len(indices) == size:
+            return list(indices)
+        # Draw the rest from the items left, with exponential keys
+        rest = [0.0 if i in indices else w for i, w in enumerate(weights)]
+        return list(indices) + weighted_sample_without_replacement(rest, size - len(indices), rng)
+
+    def iter_generate(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        """
+        Yield items one at a time, drawn in proportion to the weights.
+
+        By default items are drawn with replacement from the alias table,
+        chunk_size at a time, and the stream never ends. If unique is true,
+        every item is yielded exactly once, in the order successive weighted
+        draws without replacement would produce, and then the stream ends;
+        like the linearly biased unique stream, it keeps one key per item
+        not yet yielded, so it needs O(n) memory.
+        """
+        check_chunk_size(chunk_size)
+        return self._iter_generate(chunk_size, unique)
+
+    def _iter_generate(self, chunk_size, unique):
+        data = self.data
+        if len(data) == 0:
+            return
+        table = self.get_alias_table()
+        if unique:
+            for i in iter_weighted_ranking(table.weights(), self.rng):
+                yield data[i]
+        else:
+            while True:
+                for i in table.sample_many(chunk_size, self.rng):
+                    yield data[i]
+
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, unique=False):
+        """
+        Same as iter_generate, but yields lists of chunk_size items.
+        """
+        return chunked(self.iter_generate(chunk_size, unique), chunk_size)
+
+
+class GeneratorPool(object):
+    """
+    Hands out one generator instance per thread, so that concurrent threads
+    (e.g. web request handlers) draw from separate random streams without
+    sharing or locking any state. Word lists are shared through the registry,
+    so extra instances cost little memory.
+
+    Example:
+
+        pool = GeneratorPool(TeamNameGenerator)
+        teams = pool.get(seed=request_seed).generate(size=8)
+    """
+
+    def __init__(self, factory, *args, **kwargs):
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+        self._local = threading.local()
+
+    def get(self, seed=None):
+        """
+        Return the calling thread's generator, creating it on first use.
+        If seed is given, the generator's random stream is reseeded with it,
+        so the results that follow are reproducible.
+        """
+        gen = getattr(self._local, "generator", None)
+        if gen is None:
+            gen = self.factory(*self.args, **self.kwargs)
+            if seed is None:
+                # Never fall back on the shared module-level generator
+                gen.set_rng(random.Random())
+            self._local.generator = gen
+        if seed is not None:
+            gen.set_rng(seed)
+        return gen
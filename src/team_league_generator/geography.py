@@ -1,23 +1,28 @@
 from collections.abc import Iterable
 import random
 import os
+from .constants import CITIES_BUCKET_DIVISOR, STATES_BUCKET_DIVISOR
 from .utils import (
-    get_city_country_codes,
-    get_state_country_codes,
+    is_city_country_code,
+    is_state_country_code,
     get_cities_data_file_from_country_code,
     get_states_data_file_from_country_code,
     country_code_to_english,
     get_cities_count,
     get_states_count,
 )
+from .registry import get_word_list
 from .generics import (
     IterableDataLoader,
     UniformGenerator,
     LinearBiasedGenerator,
     ReversedLinearBiasedGenerator,
+    WeightedGenerator,
 )
+from .population import get_alias_file, get_population_file, get_population_table
 from .errors import (
     InvalidSizeRequestError,
+    KeywordError,
     GeographyError,
     CountryCodeError,
 )
@@ -32,17 +37,17 @@ class CitiesGeneratorBase(IterableDataLoader):
         if "country_code" not in kwargs:
             raise KeywordError("Error: country_code is a required keyword argument")
         else:
-            country_code = kwargs["country_code"]
-        if country_code not in get_city_country_codes():
+            country_code = kwargs.pop("country_code")
+        if not is_city_country_code(country_code):
             raise CountryCodeError(
-                "Error: invalid country code {country_code} passed to {cls.__name__}"
+                f"Error: invalid country code {country_code} passed to {self.__class__.__name__}"
             )
         self.country_code = country_code
-        cities_file = get_cities_data_file_from_country_code(country_code)
-        with open(cities_file, "r") as f:
-            data = f.readlines()
-        data = [j.strip() for j in data if len(j.strip()) > 0]
-        super().__init__(data)
+        self.cities_file = get_cities_data_file_from_country_code(country_code)
+        super().__init__(**kwargs)
+
+    def load_data(self):
+        return get_word_list(self.cities_file, file_backed=self.file_backed)
 
 
 class CitiesGenerator(CitiesGeneratorBase, UniformGenerator):
@@ -50,27 +55,30 @@ class CitiesGenerator(CitiesGeneratorBase, UniformGenerator):
     Generate random cities uniformly
     """
 
-    def generate(self, *args, **kwargs):
+    def generate(self, size=1, rng=None):
+        try:
+            return super().generate(size, rng)
+        except InvalidSizeRequestError:
+            raise _size_error(self, size, "cities")
+
+    def generate_indices(self, size=1, rng=None):
         try:
-            return super().generate(*args, **kwargs)
+            return super().generate_indices(size, rng)
         except InvalidSizeRequestError:
-            country_name = country_code_to_english(self.country_code)
-            err = f"{self.__class__.__name__}: Error: {kwargs['size']} cities requested, only {len(self.data)} exist "
-            err += f"for country {country_name} ({country_code})"
-            raise GeographyError(err)
+            raise _size_error(self, size, "cities")
 
 
 class BigCitiesGenerator(CitiesGeneratorBase, LinearBiasedGenerator):
     """
-    Generate random cities with a log bias for big cities
+    Generate random cities with a linear bias for big cities
     """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def load_data(self):
+        data = super().load_data()
 
         # reduce list to first 1/3 in list
-        index = len(self.data) // 3
-        self.data = self.data[:index]
+        index = len(data) // CITIES_BUCKET_DIVISOR
+        return data[:index]
 
 
 class SmallTownsGenerator(CitiesGeneratorBase, ReversedLinearBiasedGenerator):
@@ -78,12 +86,30 @@ class SmallTownsGenerator(CitiesGeneratorBase, ReversedLinearBiasedGenerator):
     Generate random cities with a linear bias for small towns
     """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def load_data(self):
+        data = super().load_data()
 
         # reduce list to last 2/3 in list
-        index = len(self.data) // 3
-        self.data = self.data[index:]
+        index = len(data) // CITIES_BUCKET_DIVISOR
+        return data[index:]
+
+
+class PopulationWeightedCitiesGenerator(CitiesGeneratorBase, WeightedGenerator):
+    """
+    Generate random cities in true proportion to their population
+
+    Uses the alias table precomputed for the country's cities, or the
+    population_file passed in (a .pop file with one population per city,
+    or a .alias table file). The package does not ship population data,
+    so until scripts/parse_all.py has written it, population_file is required.
+    """
+
+    def __init__(self, population_file=None, **kwargs):
+        super().__init__(**kwargs)
+        self.population_file = _find_population_file(self, self.cities_file, population_file, "city")
+
+    def get_alias_table(self):
+        return _check_population_table(self, get_population_table(self.population_file))
 
 
 class StatesGeneratorBase(IterableDataLoader):
@@ -95,17 +121,17 @@ class StatesGeneratorBase(IterableDataLoader):
         if "country_code" not in kwargs:
             raise KeywordError("Error: country_code is a required keyword argument")
         else:
-            country_code = kwargs["country_code"]
-        if country_code not in get_state_country_codes():
+            country_code = kwargs.pop("country_code")
+        if not is_state_country_code(country_code):
             raise CountryCodeError(
-                "Error: invalid country code {country_code} passed to {cls.__name__}"
+                f"Error: invalid country code {country_code} passed to {self.__class__.__name__}"
             )
         self.country_code = country_code
-        states_file = get_states_data_file_from_country_code(country_code)
-        with open(states_file, "r") as f:
-            data = f.readlines()
-        data = [j.strip() for j in data if len(j.strip()) > 0]
-        super().__init__(data)
+        self.states_file = get_states_data_file_from_country_code(country_code)
+        super().__init__(**kwargs)
+
+    def load_data(self):
+        return get_word_list(self.states_file, file_backed=self.file_backed)
 
 
 class StatesGenerator(StatesGeneratorBase, UniformGenerator):
@@ -113,14 +139,17 @@ class StatesGenerator(StatesGeneratorBase, UniformGenerator):
     Generate random states uniformly
     """
 
-    def generate(self, *args, **kwargs):
+    def generate(self, size=1, rng=None):
         try:
-            return super().generate(*args, **kwargs)
+            return super().generate(size, rng)
         except InvalidSizeRequestError:
-            country_name = country_code_to_english(self.country_code)
-            err = f"{self.__class__.__name__}: Error: {kwargs['size']} states requested, only {len(self.data)} exist "
-            err += f"for country {country_name} ({country_code})"
-            raise GeographyError(err)
+            raise _size_error(self, size, "states")
+
+    def generate_indices(self, size=1, rng=None):
+        try:
+            return super().generate_indices(size, rng)
+        except InvalidSizeRequestError:
+            raise _size_error(self, size, "states")
 
 
 class BigStatesGenerator(StatesGeneratorBase, LinearBiasedGenerator):
@@ -128,12 +157,12 @@ class BigStatesGenerator(StatesGeneratorBase, LinearBiasedGenerator):
     Generate random states with a linear bias for big states
     """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def load_data(self):
+        data = super().load_data()
 
         # reduce list to first 1/2 in list
-        index = len(self.data) // 2
-        self.data = self.data[:index]
+        index = len(data) // STATES_BUCKET_DIVISOR
+        return data[:index]
 
 
 class SmallStatesGenerator(StatesGeneratorBase, ReversedLinearBiasedGenerator):
@@ -141,9 +170,63 @@ class SmallStatesGenerator(StatesGeneratorBase, ReversedLinearBiasedGenerator):
     Generate random states with a linear bias for small states
     """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def load_data(self):
+        data = super().load_data()
 
         # reduce list to last 1/2 in list
-        index = len(self.data) // 2
-        self.data = self.data[index:]
+        index = len(data) // STATES_BUCKET_DIVISOR
+        return data[index:]
+
+
+class PopulationWeightedStatesGenerator(StatesGeneratorBase, WeightedGenerator):
+    """
+    Generate random states in true proportion to their population
+
+    Uses the alias table precomputed for the country's states, or the
+    population_file passed in (a .pop file with one population per state,
+    or a .alias table file). The package does not ship population data,
+    so until scripts/parse_all.py has written it, population_file is required.
+    """
+
+    def __init__(self, population_file=None, **kwargs):
+        super().__init__(**kwargs)
+        self.population_file = _find_population_file(self, self.states_file, population_file, "state")
+
+    def get_alias_table(self):
+        return _check_population_table(self, get_population_table(self.population_file))
+
+
+def _size_error(gen, size, kind):
+    country_name = country_code_to_english(gen.country_code)
+    err = f"{gen.__class__.__name__}: Error: {size} {kind} requested, only {len(gen.data)} exist "
+    err += f"for country {country_name} ({gen.country_code})"
+    return GeographyError(err)
+
+
+def _find_population_file(gen, data_file, population_file, kind):
+    """
+    Return the population data to use for a data file: population_file if given,
+    otherwise the precomputed alias table or population file next to the data file.
+    """
+    if population_file is not None:
+        if not os.path.exists(population_file):
+            raise FileNotFoundError(
+                f"{gen.__class__.__name__}: Error: specified population file does not exist: {population_file}"
+            )
+        return population_file
+    for fpath in (get_alias_file(data_file), get_population_file(data_file)):
+        if os.path.exists(fpath):
+            return fpath
+    country_name = country_code_to_english(gen.country_code)
+    raise GeographyError(
+        f"{gen.__class__.__name__}: Error: no {kind} population data for country {country_name} ({gen.country_code})"
+    )
+
+
+def _check_population_table(gen, table):
+    if len(table) != len(gen.data):
+        raise GeographyError(
+            f"{gen.__class__.__name__}: Error: population data {gen.population_file} has {len(table)} entries, "
+            f"but there are {len(gen.data)} places for country code {gen.country_code}"
+        )
+    return table
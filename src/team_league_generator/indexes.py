@@ -0,0 +1,50 @@
+class PrefixIndex(object):
+    """
+    Index of a word list by (case-insensitive) prefix, e.g. by initial letter.
+
+    Maps each prefix to the tuple of indices of the words that start with it,
+    so a word with a given prefix can be drawn uniformly in O(1) instead of
+    redrawing from the whole list until one matches.
+    """
+
+    def __init__(self, data, length=1):
+        self.length = length
+        buckets = {}
+        for i, word in enumerate(data):
+            buckets.setdefault(self.key(word), []).append(i)
+        self._buckets = {prefix: tuple(indices) for prefix, indices in buckets.items()}
+
+    def key(self, word):
+        """
+        Return the prefix of a word that this index is keyed on
+        """
+        return word[:self.length].lower()
+
+    def __contains__(self, prefix):
+        return self.key(prefix) in self._buckets
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def prefixes(self):
+        return sorted(self._buckets.keys())
+
+    def indices(self, prefix):
+        """
+        Return the indices of the words that share this prefix (only the first
+        length characters of prefix are used, so a whole word may be passed)
+        """
+        return self._buckets.get(self.key(prefix), ())
+
+    def count(self, prefix):
+        return len(self.indices(prefix))
+
+    def sample(self, prefix, rng):
+        """
+        Return the index of a uniformly chosen word sharing this prefix,
+        or None if there is no such word
+        """
+        indices = self.indices(prefix)
+        if not indices:
+            return None
+        return indices[int(rng.random() * len(indices)) % len(indices)]
@@ -0,0 +1,181 @@
+from array import array
+from collections.abc import Sequence
+
+
+class TeamList(Sequence):
+    """
+    Read-only view of a run of teams in a League.
+
+    Team names ("location nickname") are built only when they are indexed.
+    Slicing with a step of 1 returns another TeamList view.
+    """
+
+    __slots__ = ("_league", "_start", "_stop")
+
+    def __init__(self, league, start, stop):
+        self._league = league
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return TeamList(self._league, self._start + start, self._start + max(start, stop))
+        n = len(self)
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("TeamList index out of range")
+        return self._league.team_at(self._start + index)
+
+    def __eq__(self, other):
+        if isinstance(other, (TeamList, tuple, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TeamList({list(self)})"
+
+
+class League(object):
+    """
+    A generated league, stored compactly.
+
+    Each team is a pair of indices into the shared location and team name
+    word lists, kept in two array columns, so a league costs a few bytes per
+    team no matter how long the names are. Teams are laid out league by
+    league, then division by division, with teams_per_division teams each,
+    so any team can be found in O(1).
+
+    to_dict() returns the nested dictionary form that
+    SplortsLeagueGenerator.generate() returns. Like that dictionary, a League
+    iterates over (and counts) its league names; nteams is the number of teams.
+    """
+
+    __slots__ = (
+        "leagues",
+        "divisions",
+        "teams_per_division",
+        "locations",
+        "nicknames",
+        "location_indices",
+        "nickname_indices",
+        "_league_pos",
+        "_division_pos",
+    )
+
+    def __init__(
+        self,
+        league_names,
+        division_names,
+        teams_per_division,
+        locations,
+        nicknames,
+        location_indices,
+        nickname_indices,
+    ):
+        self.leagues = tuple(league_names)
+        self.divisions = tuple(division_names)
+        self.teams_per_division = teams_per_division
+        self.locations = locations
+        self.nicknames = nicknames
+        self.location_indices = array("I", location_indices)
+        self.nickname_indices = array("I", nickname_indices)
+        self._league_pos = {name: i for i, name in enumerate(self.leagues)}
+        self._division_pos = {name: i for i, name in enumerate(self.divisions)}
+
+        nteams = len(self.leagues) * len(self.divisions) * teams_per_division
+        if len(self.location_indices) != nteams or len(self.nickname_indices) != nteams:
+            raise ValueError(
+                f"Error: League needs {nteams} location and team indices, got "
+                f"{len(self.location_indices)} and {len(self.nickname_indices)}"
+            )
+
+    def __len__(self):
+        return len(self.leagues)
+
+    def __iter__(self):
+        return iter(self.leagues)
+
+    def __contains__(self, league_name):
+        return league_name in self._league_pos
+
+    def __getitem__(self, league_name):
+        """
+        Return a dictionary of division name -> TeamList for one league
+        """
+        return {division_name: self.division(league_name, division_name) for division_name in self.divisions}
+
+    def __eq__(self, other):
+        if isinstance(other, League):
+            return (
+                self.leagues == other.leagues
+                and self.divisions == other.divisions
+                and self.teams_per_division == other.teams_per_division
+                and list(self.teams) == list(other.teams)
+            )
+        return NotImplemented
+
+    def __repr__(self):
+        return f"League({len(self.leagues)} leagues, {len(self.divisions)} divisions, {self.nteams} teams)"
+
+    @property
+    def nteams(self):
+        """
+        Number of teams in the whole league
+        """
+        return len(self.location_indices)
+
+    @property
+    def teams(self):
+        """
+        All teams, as a TeamList
+        """
+        return TeamList(self, 0, self.nteams)
+
+    def team_at(self, i):
+        """
+        Return the name of team number i, in layout order
+        """
+        return self.locations[self.location_indices[i]] + " " + self.nicknames[self.nickname_indices[i]]
+
+    def division(self, league_name, division_name):
+        """
+        Return the teams in one division of one league, as a TeamList
+        """
+        start = self._offset(league_name, division_name)
+        return TeamList(self, start, start + self.teams_per_division)
+
+    def team(self, league_name, division_name, k):
+        """
+        Return the name of team number k in one division of one league
+        """
+        if k < 0 or k >= self.teams_per_division:
+            raise IndexError(f"Error: team {k} out of range for {self.teams_per_division} teams per division")
+        return self.team_at(self._offset(league_name, division_name) + k)
+
+    def to_dict(self):
+        """
+        Return the league in the nested dictionary form:
+        {league name: {division name: [team names]}}
+        """
+        return {
+            league_name: {
+                division_name: list(self.division(league_name, division_name))
+                for division_name in self.divisions
+            }
+            for league_name in self.leagues
+        }
+
+    def _offset(self, league_name, division_name):
+        try:
+            i = self._league_pos[league_name]
+            j = self._division_pos[division_name]
+        except KeyError:
+            raise KeyError(f"Error: no division {division_name} in league {league_name}")
+        return (i * len(self.divisions) + j) * self.teams_per_division
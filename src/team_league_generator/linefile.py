@@ -0,0 +1,223 @@
+from collections.abc import Sequence
+import hashlib
+import io
+import mmap
+import os
+import struct
+import tempfile
+
+
+# Line index sidecar layout (all integers little-endian):
+#
+#   header    magic (8 bytes), format version (u32),
+#             source file size (u64), source file mtime in ns (u64), line count (u64)
+#   lines     one (start, end) pair of u64 byte offsets per non-blank line,
+#             with leading and trailing whitespace already trimmed
+#             the way str.strip() trims it, leaving out lines that repeat
+#             an earlier one
+#
+# The index is rebuilt whenever the source file's size or mtime no longer
+# match the ones recorded in the header. If it cannot be written at all,
+# it is kept in memory instead.
+LINE_INDEX_MAGIC = b"TLGLIDX\x00"
+LINE_INDEX_FORMAT_VERSION = 3
+LINE_INDEX_SUFFIX = ".lineidx"
+
+_HEADER = struct.Struct("<8sIQQQ")
+_PAIR = struct.Struct("<QQ")
+
+# What str.strip() removes from an ASCII line; bytes.strip() leaves out \x1c-\x1f
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+def get_line_index_path(path):
+    """
+    Return the path of the sidecar line index for a text file: next to the
+    file if its directory is writable, otherwise in the temporary directory.
+    """
+    path = os.path.realpath(path)
+    if os.access(os.path.dirname(path), os.W_OK):
+        return path + LINE_INDEX_SUFFIX
+    return _cache_index_path(path)
+
+
+def _cache_index_path(path):
+    digest = hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+    cache_dir = os.path.join(tempfile.gettempdir(), "team_league_generator")
+    return os.path.join(cache_dir, digest + LINE_INDEX_SUFFIX)
+
+
+def _line_index_paths(path):
+    """
+    Return the places to look for a line index, best first
+    """
+    paths = [get_line_index_path(path), _cache_index_path(path)]
+    return paths[:1] if paths[0] == paths[1] else paths
+
+
+def build_line_index(path, index_path=None):
+    """
+    Scan a text file once and write its line index to index_path.
+    The file is read a line at a time; to leave out repeated lines, the
+    distinct lines seen so far are kept in memory until the scan is done.
+    """
+    if index_path is None:
+        index_path = get_line_index_path(path)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            _write_line_index(path, out)
+        # Replace atomically, so readers never see a half-written index
+        os.replace(tmp_path, index_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return index_path
+
+
+def _write_line_index(path, out):
+    st = os.stat(path)
+    count = 0
+    seen = set()
+    with open(path, "rb") as src:
+        out.write(_HEADER.pack(LINE_INDEX_MAGIC, LINE_INDEX_FORMAT_VERSION, 0, 0, 0))
+        pos = 0
+        for line in src:
+            span = _strip_span(line)
+            if span is not None and line[span[0]:span[1]] not in seen:
+                seen.add(line[span[0]:span[1]])
+                out.write(_PAIR.pack(pos + span[0], pos + span[1]))
+                count += 1
+            pos += len(line)
+        out.seek(0)
+        out.write(
+            _HEADER.pack(LINE_INDEX_MAGIC, LINE_INDEX_FORMAT_VERSION, st.st_size, st.st_mtime_ns, count)
+        )
+
+
+def _strip_span(line):
+    """
+    Return the (start, end) byte offsets of a UTF-8 line once stripped like
+    str.strip() would strip its text, or None if nothing is left
+    """
+    if line.isascii():
+        stripped = line.lstrip(_ASCII_WHITESPACE)
+        start = len(line) - len(stripped)
+        return (start, start + len(stripped.rstrip(_ASCII_WHITESPACE))) if stripped else None
+    # Unicode whitespace such as a no-break space is only visible once decoded
+    text = line.decode("utf-8")
+    stripped = text.lstrip()
+    if not stripped.rstrip():
+        return None
+    start = len(line) - len(stripped.encode("utf-8"))
+    return (start, start + len(stripped.rstrip().encode("utf-8")))
+
+
+def _map(fpath):
+    with open(fpath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class FileBackedList(Sequence):
+    """
+    Read-only list of the stripped, non-empty lines of a text file, like
+    the tuple read_word_list() returns, without reading the file into memory.
+
+    The file and its line index are memory-mapped, and each line is decoded
+    only when it is indexed. Slicing with a step of 1 returns another
+    FileBackedList view without copying anything.
+    """
+
+    __slots__ = ("fpath", "_src", "_idx", "_start", "_stop")
+
+    def __init__(self, fpath, src, idx, start, stop):
+        self.fpath = fpath
+        self._src = src
+        self._idx = idx
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            stop = max(start, stop)
+            return FileBackedList(self.fpath, self._src, self._idx, self._start + start, self._start + stop)
+        n = len(self)
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("FileBackedList index out of range")
+        begin, end = _PAIR.unpack_from(self._idx, _HEADER.size + _PAIR.size * (self._start + index))
+        return self._src[begin:end].decode("utf-8").strip()
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (FileBackedList, tuple, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"FileBackedList({self.fpath}, {len(self)} lines)"
+
+
+def _open_index(index_path, st):
+    """
+    Map a line index, or return None if it is missing, corrupt or stale
+    """
+    if not os.path.exists(index_path):
+        return None
+    idx = _map(index_path)
+    if len(idx) < _HEADER.size:
+        return None
+    magic, fmt, size, mtime_ns, count = _HEADER.unpack_from(idx, 0)
+    if (
+        magic != LINE_INDEX_MAGIC
+        or fmt != LINE_INDEX_FORMAT_VERSION
+        or size != st.st_size
+        or mtime_ns != st.st_mtime_ns
+        or len(idx) != _HEADER.size + _PAIR.size * count
+    ):
+        return None
+    return idx
+
+
+def open_line_file(path):
+    """
+    Return a FileBackedList over the lines of a text file, building or
+    rebuilding its sidecar line index first if needed. If the index cannot
+    be written next to the file or in the temporary directory, it is built
+    in memory, which costs 16 bytes per line.
+    """
+    path = os.path.realpath(path)
+    st = os.stat(path)
+    idx = None
+    for index_path in _line_index_paths(path):
+        idx = _open_index(index_path, st)
+        if idx is not None:
+            break
+        try:
+            build_line_index(path, index_path)
+        except OSError:
+            continue
+        idx = _map(index_path)
+        break
+    if idx is None:
+        out = io.BytesIO()
+        _write_line_index(path, out)
+        idx = out.getvalue()
+    count = _HEADER.unpack_from(idx, 0)[4]
+    return FileBackedList(path, _map(path), idx, 0, count)
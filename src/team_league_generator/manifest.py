@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+from glob import glob
+from .constants import GEO
+
+
+MANIFEST_FILE = os.path.join(GEO, "_MANIFEST.json")
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def _count_lines(fpath):
+    # Repeated lines are dropped when a list is loaded, see utils.read_word_list
+    with open(fpath, "r") as f:
+        return len(set(j.strip() for j in f if len(j.strip()) > 0))
+
+
+def _read_abbr_key(fpath):
+    names = {}
+    with open(fpath, "r") as f:
+        for line in f:
+            split = line.strip().split(" ")
+            if len(split) > 1:
+                names[split[0].lower()] = " ".join(split[1:])
+    return names
+
+
+def build_manifest(geo_dir=GEO):
+    """
+    Scan the geography data directory and return the manifest dictionary.
+
+    The manifest maps each country code to its cities file, states file,
+    English name and line counts. Entries for files that do not exist are None.
+    """
+    names = _read_abbr_key(os.path.join(geo_dir, "_ABBR_KEY"))
+    countries = {}
+    for fpath in sorted(glob(os.path.join(geo_dir, "*.txt"))):
+        fname = os.path.basename(fpath)
+        if fname.endswith("_states.txt"):
+            country_code = fname[: -len("_states.txt")]
+            kind = "states"
+        else:
+            country_code = fname[: -len(".txt")]
+            kind = "cities"
+        entry = countries.setdefault(
+            country_code,
+            {
+                "name": names.get(country_code),
+                "cities_file": None,
+                "cities_count": None,
+                "states_file": None,
+                "states_count": None,
+            },
+        )
+        entry[f"{kind}_file"] = fname
+        entry[f"{kind}_count"] = _count_lines(fpath)
+    return {"countries": countries}
+
+
+def write_manifest(fpath=MANIFEST_FILE, geo_dir=GEO):
+    """
+    Build the manifest and save it as JSON, to be shipped with the package data.
+    """
+    manifest = build_manifest(geo_dir)
+    with open(fpath, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+def get_manifest():
+    """
+    Return the geography manifest, loading it once per process.
+
+    The precomputed manifest file is used if it exists; otherwise the
+    manifest is built by scanning the data directory on first use.
+    """
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                if os.path.exists(MANIFEST_FILE):
+                    with open(MANIFEST_FILE, "r") as f:
+                        _manifest = json.load(f)
+                else:
+                    _manifest = build_manifest()
+    return _manifest
+
+
+def get_country_entry(country_code):
+    """
+    Return the manifest entry for a country code, or None if it is unknown.
+    """
+    return get_manifest()["countries"].get(country_code)
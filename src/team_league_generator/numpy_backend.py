@@ -0,0 +1,111 @@
+# Optional NumPy sampling backend.
+#
+# Generators created with backend="numpy" (or backend="auto", for large enough
+# batches) draw their indices here, in one vectorized call per batch, and only
+# turn indices into strings at the very end. NumPy is not a hard dependency:
+# if it is not installed, numpy is None and only the Python samplers are used.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .errors import BackendError
+
+
+BACKENDS = ("python", "numpy", "auto")
+
+# With backend="auto", batches smaller than this are drawn with the Python samplers
+NUMPY_MIN_BATCH = 256
+
+
+def numpy_available():
+    return numpy is not None
+
+
+def check_backend(backend):
+    if backend not in BACKENDS:
+        valid = ", ".join(BACKENDS)
+        raise BackendError(f"Error: invalid backend {backend}, should be in {valid}")
+    if backend == "numpy" and numpy is None:
+        raise BackendError("Error: backend numpy was requested but NumPy is not installed")
+
+
+def use_numpy(backend, size):
+    """
+    Return True if a batch of this size should be drawn with NumPy
+    """
+    if backend == "numpy":
+        return True
+    return backend == "auto" and numpy is not None and size >= NUMPY_MIN_BATCH
+
+
+def make_rng(rng):
+    """
+    Create a numpy.random.Generator seeded from a Python random number generator,
+    so seeding the Python generator also makes the NumPy draws reproducible.
+    """
+    return numpy.random.default_rng(rng.getrandbits(64))
+
+
+def uniform_indices(np_rng, n, size):
+    """
+    Draw size indices uniformly from range(n), with replacement
+    """
+    return np_rng.integers(0, n, size=size)
+
+
+def unique_uniform_indices(np_rng, n, size):
+    """
+    Draw size distinct indices uniformly from range(n), in random order
+    """
+    return np_rng.choice(n, size=size, replace=False)
+
+
+def alias_indices(np_rng, table, size):
+    """
+    Draw size indices with replacement from an AliasTable
+    """
+    arrays = getattr(table, "_numpy_arrays", None)
+    if arrays is None:
+        arrays = (numpy.asarray(table.prob), numpy.asarray(table.alias))
+        table._numpy_arrays = arrays
+    prob, alias = arrays
+    u = np_rng.random(size) * table.n
+    i = numpy.minimum(u.astype(numpy.int64), table.n - 1)
+    return numpy.where(u - i < prob[i], i, alias[i])
+
+
+def linear_indices(np_rng, n, size):
+    """
+    Draw size indices with replacement from range(n) with linear weights
+    n, n-1, ..., 1, the vectorized form of samplers.LinearSampler
+    """
+    # A uniform point (x, y) of the n by n + 1 grid lies on or below the
+    # diagonal (y <= x) with probability one half; reflecting the points
+    # above it onto the points below maps the grid two to one onto the
+    # triangle, where column x holds x + 1 points. No value exceeds n, so
+    # this stays exact in int64 for any n a list can have.
+    x = np_rng.integers(0, n, size=size, dtype=numpy.int64)
+    y = np_rng.integers(0, n + 1, size=size, dtype=numpy.int64)
+    return numpy.where(y > x, x, n - 1 - x)
+
+
+def linear_unique_indices(np_rng, n, size):
+    """
+    Draw size distinct indices from range(n) with linear weights n, n-1, ..., 1,
+    using exponential keys. Indices come back in draw order.
+    """
+    weights = numpy.arange(n, 0, -1, dtype=numpy.float64)
+    keys = numpy.log1p(-np_rng.random(n)) / weights
+    if size < n:
+        top = numpy.argpartition(-keys, size)[:size]
+    else:
+        top = numpy.arange(n)
+    return top[numpy.argsort(-keys[top], kind="stable")]
+
+
+def take(data, indices):
+    """
+    Materialize the strings for an array of indices
+    """
+    return [data[i] for i in indices.tolist()]
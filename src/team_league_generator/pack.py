@@ -0,0 +1,297 @@
+from collections.abc import Sequence
+from glob import glob
+import mmap
+import os
+import struct
+import threading
+import zlib
+from .constants import DATA
+from .errors import DataPackError
+from .utils import read_word_list
+
+
+DATA_PACK_FILE = os.path.join(DATA, "wordlists.pack")
+
+# Pack file layout (all integers little-endian):
+#
+#   header      magic (8 bytes), format version (u32), data version (u32), list count (u32)
+#   directory   one entry per list:
+#                 name length (u16), name (utf-8),
+#                 item count (u32), source file size (u64), source file CRC32 (u32),
+#                 offset table position (u64), strings position (u64)
+#   lists       for each list, an offset table of (count + 1) u32 offsets
+#               relative to the strings position, then the packed utf-8 strings
+#
+# The data version is a CRC32 of every list name and string in the pack,
+# so two packs built from the same text files have the same data version.
+# The source file size and CRC32 (of the file's raw bytes) tell whether a
+# text file has changed since the pack was built. Loading only compares the
+# size, which costs a stat; the CRC is checked by the build and test steps.
+PACK_MAGIC = b"TLGPACK\x00"
+PACK_FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<8sIII")
+_NAME_LEN = struct.Struct("<H")
+_ENTRY = struct.Struct("<IQIQQ")
+_OFFSET = struct.Struct("<I")
+_OFFSET_PAIR = struct.Struct("<II")
+
+_data_pack = None
+_data_pack_lock = threading.Lock()
+_data_version = None
+
+# Files are checksummed in blocks of this many bytes
+_CRC_BLOCK_SIZE = 1 << 20
+
+
+def get_pack_sources(data_dir=DATA):
+    """
+    Return a list of (list name, file path) pairs for every text data file
+    that goes into the pack. List names are paths relative to the data directory.
+    """
+    fpaths = sorted(glob(os.path.join(data_dir, "*.txt")))
+    fpaths += sorted(glob(os.path.join(data_dir, "geography", "*.txt")))
+    fpaths.append(os.path.join(data_dir, "geography", "_ABBR_KEY"))
+    return [(os.path.relpath(fpath, data_dir).replace(os.sep, "/"), fpath) for fpath in fpaths]
+
+
+def file_crc(fpath):
+    """
+    Return the CRC32 of a file's raw bytes, read a block at a time
+    """
+    crc = 0
+    with open(fpath, "rb") as f:
+        for block in iter(lambda: f.read(_CRC_BLOCK_SIZE), b""):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+def _read_sources(data_dir):
+    """
+    Return the data version and a list of (name, source file size, source file CRC32,
+    encoded strings) for every list that goes into the pack.
+    """
+    lists = []
+    crc = 0
+    for name, source in get_pack_sources(data_dir):
+        encoded = [j.encode("utf-8") for j in read_word_list(source)]
+        crc = zlib.crc32(name.encode("utf-8"), crc)
+        for j in encoded:
+            crc = zlib.crc32(j, crc)
+        lists.append((name, os.path.getsize(source), file_crc(source), encoded))
+    return crc, lists
+
+
+def compile_pack(fpath=DATA_PACK_FILE, data_dir=DATA):
+    """
+    Compile the text data files into a single pack file.
+    The text files remain the source of truth.
+    """
+    crc, lists = _read_sources(data_dir)
+
+    directory_size = sum(
+        _NAME_LEN.size + len(name.encode("utf-8")) + _ENTRY.size for name, _, _, _ in lists
+    )
+    pos = _HEADER.size + directory_size
+    directory = []
+    body = []
+    for name, source_size, source_crc, encoded in lists:
+        offsets = [0]
+        for j in encoded:
+            offsets.append(offsets[-1] + len(j))
+        table = b"".join(_OFFSET.pack(o) for o in offsets)
+        strings_pos = pos + len(table)
+        name_bytes = name.encode("utf-8")
+        directory.append(_NAME_LEN.pack(len(name_bytes)) + name_bytes)
+        directory.append(_ENTRY.pack(len(encoded), source_size, source_crc, pos, strings_pos))
+        body.append(table)
+        body.append(b"".join(encoded))
+        pos = strings_pos + offsets[-1]
+
+    with open(fpath, "wb") as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_FORMAT_VERSION, crc, len(lists)))
+        f.write(b"".join(directory))
+        f.write(b"".join(body))
+
+
+class PackedList(Sequence):
+    """
+    Read-only list of strings stored in a data pack.
+
+    Strings are decoded from the memory-mapped pack only when they are
+    indexed. Slicing with a step of 1 returns another PackedList view
+    without copying anything.
+    """
+
+    __slots__ = ("_buf", "_offsets_pos", "_strings_pos", "_start", "_stop")
+
+    def __init__(self, buf, offsets_pos, strings_pos, start, stop):
+        self._buf = buf
+        self._offsets_pos = offsets_pos
+        self._strings_pos = strings_pos
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if index.__class__ is int and 0 <= index < self._stop - self._start:
+            begin, end = _OFFSET_PAIR.unpack_from(
+                self._buf, self._offsets_pos + _OFFSET.size * (self._start + index)
+            )
+            return self._buf[self._strings_pos + begin:self._strings_pos + end].decode("utf-8")
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            stop = max(start, stop)
+            return PackedList(
+                self._buf,
+                self._offsets_pos,
+                self._strings_pos,
+                self._start + start,
+                self._start + stop,
+            )
+        n = len(self)
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("PackedList index out of range")
+        pos = self._offsets_pos + _OFFSET.size * (self._start + index)
+        begin, end = _OFFSET_PAIR.unpack_from(self._buf, pos)
+        return self._buf[self._strings_pos + begin:self._strings_pos + end].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (PackedList, tuple, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"PackedList({len(self)} items)"
+
+
+class DataPack(object):
+    """
+    A compiled pack of word lists, memory-mapped for lazy access.
+    data_dir is the directory the pack was compiled from.
+    """
+
+    def __init__(self, fpath=DATA_PACK_FILE, data_dir=DATA):
+        self.fpath = fpath
+        self.data_dir = data_dir
+        with open(fpath, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, data_version, nlists = _HEADER.unpack_from(self._buf, 0)
+        if magic != PACK_MAGIC or fmt != PACK_FORMAT_VERSION:
+            raise DataPackError(f"Error: {fpath} is not a version {PACK_FORMAT_VERSION} data pack")
+        self.data_version = data_version
+
+        self._lists = {}
+        pos = _HEADER.size
+        for _ in range(nlists):
+            (name_len,) = _NAME_LEN.unpack_from(self._buf, pos)
+            pos += _NAME_LEN.size
+            name = self._buf[pos:pos + name_len].decode("utf-8")
+            pos += name_len
+            self._lists[name] = _ENTRY.unpack_from(self._buf, pos)
+            pos += _ENTRY.size
+
+    def __contains__(self, name):
+        return name in self._lists
+
+    def names(self):
+        return list(self._lists.keys())
+
+    def source_size(self, name):
+        """
+        Return the size in bytes of the text file the named list was compiled from
+        """
+        return self._lists[name][1]
+
+    def source_crc(self, name):
+        """
+        Return the CRC32 of the text file the named list was compiled from
+        """
+        return self._lists[name][2]
+
+    def get(self, name):
+        """
+        Return the named list as a PackedList
+        """
+        try:
+            count, _, _, offsets_pos, strings_pos = self._lists[name]
+        except KeyError:
+            raise DataPackError(f"Error: list {name} not found in data pack {self.fpath}")
+        return PackedList(self._buf, offsets_pos, strings_pos, 0, count)
+
+    def lookup(self, fpath):
+        """
+        Return the packed list compiled from the text file fpath, or None if
+        the file is not in the pack or its size has changed since the pack
+        was built. The file is not read: a pack is trusted to match the files
+        it was built from (use is_current() to check their contents).
+        """
+        name = self._list_name(fpath)
+        if name is None or os.path.getsize(fpath) != self._lists[name][1]:
+            return None
+        return self.get(name)
+
+    def is_current(self, fpath):
+        """
+        Return True if the text file fpath is in the pack and its contents
+        (size and CRC32) are the ones the pack was built from. This reads the
+        whole file; it is meant for build and test steps, not for loading.
+        """
+        name = self._list_name(fpath)
+        if name is None:
+            return False
+        _, source_size, source_crc, _, _ = self._lists[name]
+        return os.path.getsize(fpath) == source_size and file_crc(fpath) == source_crc
+
+    def _list_name(self, fpath):
+        fpath = os.path.realpath(fpath)
+        data_dir = os.path.realpath(self.data_dir)
+        if not fpath.startswith(data_dir + os.sep):
+            return None
+        name = os.path.relpath(fpath, data_dir).replace(os.sep, "/")
+        return name if name in self._lists else None
+
+
+def get_data_pack():
+    """
+    Return the package's data pack, opened once per process,
+    or None if no pack has been compiled.
+    """
+    global _data_pack
+    if _data_pack is None:
+        with _data_pack_lock:
+            if _data_pack is None:
+                if not os.path.exists(DATA_PACK_FILE):
+                    return None
+                _data_pack = DataPack(DATA_PACK_FILE)
+    return _data_pack
+
+
+def get_data_version():
+    """
+    Return the data version of the package's word lists: the data pack's
+    version, or the same checksum computed from the text files if no pack
+    has been compiled. With a pack, it does not describe a list read from a
+    text file edited since the pack was built (see DataPack.is_current).
+    """
+    global _data_version
+    if _data_version is None:
+        pack = get_data_pack()
+        if pack is not None:
+            _data_version = pack.data_version
+        else:
+            _data_version = _read_sources(DATA)[0]
+    return _data_version
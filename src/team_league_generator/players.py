@@ -1,6 +1,8 @@
-import random
 import os
-from .generics import IterableDataLoader, UniformGenerator
+from .errors import InvalidSizeRequestError
+from .generics import IterableDataLoader, UniformGenerator, STREAM_CHUNK_SIZE, check_chunk_size, chunked
+from .registry import get_word_list
+from .samplers import FeistelPermutation, get_rng
 from .utils import (
     get_team_names_data_file, 
     get_leagues_divisions_data_file,
@@ -21,10 +23,11 @@ class FirstNameGeneratorBase(IterableDataLoader):
             raise FileNotFoundError(
                 f"Error: FirstNameGenerator passed a file that does not exist: {first_names_file}"
             )
-        with open(first_names_file, "r") as f:
-            data = f.readlines()
-        data = [j.strip() for j in data if len(j.strip()) > 0]
-        super().__init__(data)
+        self.first_names_file = first_names_file
+        super().__init__(**kwargs)
+
+    def load_data(self):
+        return get_word_list(self.first_names_file, file_backed=self.file_backed)
 
 
 class FirstNameGenerator(FirstNameGeneratorBase, UniformGenerator):
@@ -39,10 +42,11 @@ class LastNameGeneratorBase(IterableDataLoader):
             raise FileNotFoundError(
                 f"Error: LastNameGenerator passed a file that does not exist: {last_names_file}"
             )
-        with open(last_names_file, "r") as f:
-            data = f.readlines()
-        data = [j.strip() for j in data if len(j.strip()) > 0]
-        super().__init__(data)
+        self.last_names_file = last_names_file
+        super().__init__(**kwargs)
+
+    def load_data(self):
+        return get_word_list(self.last_names_file, file_backed=self.file_backed)
 
 
 class LastNameGenerator(LastNameGeneratorBase, UniformGenerator):
@@ -50,21 +54,219 @@ class LastNameGenerator(LastNameGeneratorBase, UniformGenerator):
 
 
 class NameGenerator(object):
-    def __init__(self, **kwargs):
-        self.fng = FirstNameGenerator(**kwargs)
-        self.lng = LastNameGenerator(**kwargs)
+    def __init__(self, rng=None, first_names_file=None, last_names_file=None, **kwargs):
+        self.rng = get_rng(rng)
+        self.fng = FirstNameGenerator(first_names_file=first_names_file, rng=self.rng, **kwargs)
+        self.lng = LastNameGenerator(last_names_file=last_names_file, rng=self.rng, **kwargs)
+
+    def set_rng(self, rng):
+        """
+        Replace the random stream shared by this generator and its first/last name generators.
+        """
+        self.rng = get_rng(rng)
+        self.fng.set_rng(self.rng)
+        self.lng.set_rng(self.rng)
+
+    def warm(self):
+        """
+        Load the first and last name lists now instead of on first use. Returns self.
+        """
+        self.fng.warm()
+        self.lng.warm()
+        return self
 
-    def generate(self, size=1, alliteration_rate=0.1):
+    def unique_sampler(self, seed=None, cursor=0):
+        """
+        Return a UniqueNameSampler over this generator's first and last names.
+        If seed is None, one is drawn from this generator's random stream.
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(64)
+        return UniqueNameSampler(self.fng, self.lng, seed, cursor=cursor)
+
+    def generate(self, size=1, alliteration_rate=0.1, rng=None):
+        """
+        Generate a list of size full names.
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
         if size < 1:
             raise InvalidSizeRequestError(f"Error: Invalid size passed to NameGenerator: {size}")
+        rng = self.rng if rng is None else get_rng(rng)
+        np_rng = self.fng.get_numpy_rng(size, rng)
+        if np_rng is not None:
+            return self._generate_numpy(np_rng, size, alliteration_rate, rng)
         names = []
         for i in range(size):
-            alliterate = random.random() < alliteration_rate
-            first = self.fng.generate()[0]
-            last = self.lng.generate()[0]
+            alliterate = rng.random() < alliteration_rate
+            first = self.fng.generate(rng=rng)[0]
+            last = None
             if alliterate:
-                while last[0] != first[0]:
-                    last = self.lng.generate()[0]
+                last = self._alliterative_last_name(first, rng)
+            if last is None:
+                last = self.lng.generate(rng=rng)[0]
             name = first + " " + last
             names.append(name)
         return names
+
+    def generate_rosters(self, nteams, roster_size, alliteration_rate=0.1):
+        """
+        Generate player names for many teams in one call.
+        Returns a list of nteams rosters, each a list of roster_size names.
+
+        All first names, last names and alliteration flags for every roster
+        are drawn in bulk rather than one name at a time.
+        """
+        if nteams < 0 or roster_size < 1:
+            raise InvalidSizeRequestError(
+                f"Error: Invalid number of teams {nteams} or roster size {roster_size} passed to NameGenerator"
+            )
+        total = nteams * roster_size
+        names = self._generate_many(total, alliteration_rate)
+        return [names[j:j + roster_size] for j in range(0, total, roster_size)]
+
+    def iter_generate(self, chunk_size=STREAM_CHUNK_SIZE, unique=False, alliteration_rate=0.1):
+        """
+        Yield names one at a time.
+
+        By default names are drawn in bulk, chunk_size at a time, and the
+        stream never ends. If unique is true, names come from a
+        UniqueNameSampler: no full name is ever repeated, and the stream ends
+        when every first x last pair has been used. alliteration_rate does
+        not apply to unique streams.
+        """
+        check_chunk_size(chunk_size)
+        return self._iter_generate(chunk_size, unique, alliteration_rate)
+
+    def _iter_generate(self, chunk_size, unique, alliteration_rate):
+        if unique:
+            sampler = self.unique_sampler()
+            while len(sampler) > 0:
+                yield from sampler.generate(min(chunk_size, len(sampler)))
+        else:
+            while True:
+                yield from self._generate_many(chunk_size, alliteration_rate)
+
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, unique=False, alliteration_rate=0.1):
+        """
+        Same as iter_generate, but yields lists of chunk_size names.
+        """
+        return chunked(self.iter_generate(chunk_size, unique, alliteration_rate), chunk_size)
+
+    def _generate_many(self, size, alliteration_rate):
+        np_rng = self.fng.get_numpy_rng(size)
+        if np_rng is not None:
+            return self._generate_numpy(np_rng, size, alliteration_rate, self.rng)
+        return self._generate_bulk(size, alliteration_rate)
+
+    def _generate_bulk(self, size, alliteration_rate):
+        """
+        Draw every first name, last name and alliteration flag in one pass each
+        """
+        rng = self.rng
+        rand = rng.random
+        last_data = self.lng.get_decoded_data()
+        firsts = rng.choices(self.fng.get_decoded_data(), k=size)
+        lasts = rng.choices(last_data, k=size)
+        if alliteration_rate > 0:
+            index = self.lng.get_prefix_index()
+            for j in range(size):
+                if rand() < alliteration_rate:
+                    i = index.sample(firsts[j], rng)
+                    if i is not None:
+                        lasts[j] = last_data[i]
+        return [first + " " + last for first, last in zip(firsts, lasts)]
+
+    def _generate_numpy(self, np_rng, size, alliteration_rate, rng):
+        """
+        Draw every first name, last name and alliteration flag in one vectorized call each
+        """
+        from . import numpy_backend
+        first_data = self.fng.get_decoded_data()
+        last_data = self.lng.get_decoded_data()
+        firsts = numpy_backend.take(
+            first_data, numpy_backend.uniform_indices(np_rng, len(first_data), size)
+        )
+        lasts = numpy_backend.take(
+            last_data, numpy_backend.uniform_indices(np_rng, len(last_data), size)
+        )
+        alliterates = (np_rng.random(size) < alliteration_rate).tolist()
+        index = self.lng.get_prefix_index()
+        names = []
+        for first, last, alliterate in zip(firsts, lasts, alliterates):
+            if alliterate:
+                i = index.sample(first, rng)
+                if i is not None:
+                    last = last_data[i]
+            names.append(first + " " + last)
+        return names
+
+    def _alliterative_last_name(self, first, rng):
+        """
+        Draw a last name with the same initial as first in one step, using the
+        last name list's prefix index. Returns None if no last name matches.
+        """
+        i = self.lng.get_prefix_index().sample(first, rng)
+        if i is None:
+            return None
+        return self.lng.data[i]
+
+
+class UniqueNameSampler(object):
+    """
+    Draw full names that never repeat, from the product of a first name list
+    and a last name list.
+
+    The product is treated as a virtual index space: index k stands for
+    first name k // nlast and last name k % nlast. A seeded FeistelPermutation
+    maps the sampler's cursor (0, 1, 2, ...) to a shuffled index, so every
+    (first, last) pair is drawn at most once, each draw is O(1) in time and
+    memory, and the product list is never built.
+
+    The sampler's position is just (seed, cursor): pass both back in to
+    resume where a previous sampler stopped.
+    """
+
+    def __init__(self, first_names, last_names, seed, cursor=0):
+        self.fng = first_names
+        self.lng = last_names
+        self.seed = seed
+        self.nlast = len(self.lng)
+        self.size = len(self.fng) * self.nlast
+        if cursor < 0 or cursor > self.size:
+            raise InvalidSizeRequestError(
+                f"Error: UniqueNameSampler cursor {cursor} must be between 0 and {self.size}"
+            )
+        self.cursor = cursor
+        self.permutation = FeistelPermutation(self.size, seed)
+
+    def __len__(self):
+        """
+        Number of names left before the sampler is exhausted
+        """
+        return self.size - self.cursor
+
+    def state(self):
+        """
+        Return the (seed, cursor) pair needed to resume this sampler
+        """
+        return self.seed, self.cursor
+
+    def name_at(self, k):
+        """
+        Return the name at index k of the (virtual) first x last product
+        """
+        first, last = divmod(k, self.nlast)
+        return self.fng.data[first] + " " + self.lng.data[last]
+
+    def generate(self, size=1):
+        """
+        Return the next size names. Names are unique across every call.
+        """
+        if size < 0 or size > len(self):
+            raise InvalidSizeRequestError(
+                f"Error: UniqueNameSampler got size parameter {size}, only {len(self)} unique names are left"
+            )
+        permute = self.permutation.permute
+        names = [self.name_at(permute(k)) for k in range(self.cursor, self.cursor + size)]
+        self.cursor += size
+        return names
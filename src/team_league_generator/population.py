@@ -0,0 +1,125 @@
+from array import array
+import os
+import struct
+import sys
+import threading
+from glob import glob
+from .constants import GEO
+from .errors import GeographyError
+from .samplers import AliasTable
+
+
+# Population data sits next to each cities/states file, line for line:
+#
+#   <code>.pop, <code>_states.pop       one population per line, written by parse_all.py
+#   <code>.alias, <code>_states.alias   the alias table for those populations,
+#                                       precomputed by build_population_tables.py
+#
+# Alias table file layout (all integers little-endian):
+#
+#   header    magic (8 bytes), format version (u32), item count n (u32)
+#   prob      n float64 acceptance probabilities
+#   alias     n u32 alias indices
+POPULATION_SUFFIX = ".pop"
+ALIAS_SUFFIX = ".alias"
+ALIAS_MAGIC = b"TLGALIAS"
+ALIAS_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_population_file(data_file):
+    """
+    Return the population file that goes with a cities or states data file
+    """
+    return os.path.splitext(data_file)[0] + POPULATION_SUFFIX
+
+
+def get_alias_file(data_file):
+    """
+    Return the precomputed alias table file that goes with a cities or states data file
+    """
+    return os.path.splitext(data_file)[0] + ALIAS_SUFFIX
+
+
+def read_populations(fpath):
+    """
+    Read a population file and return its populations as a list of ints
+    """
+    with open(fpath, "r") as f:
+        populations = [int(j) for j in f if len(j.strip()) > 0]
+    if any(p < 1 for p in populations):
+        raise GeographyError(f"Error: population file {fpath} has populations below 1")
+    return populations
+
+
+def write_alias_table(table, fpath):
+    """
+    Save an AliasTable in the alias table file format
+    """
+    prob = array("d", table.prob)
+    alias = array("I", table.alias)
+    if sys.byteorder == "big":
+        prob.byteswap()
+        alias.byteswap()
+    with open(fpath, "wb") as f:
+        f.write(_HEADER.pack(ALIAS_MAGIC, ALIAS_FORMAT_VERSION, table.n))
+        f.write(prob.tobytes())
+        f.write(alias.tobytes())
+
+
+def read_alias_table(fpath):
+    """
+    Load an AliasTable saved by write_alias_table, without rebuilding it
+    """
+    with open(fpath, "rb") as f:
+        buf = f.read()
+    magic, fmt, n = _HEADER.unpack_from(buf, 0)
+    if magic != ALIAS_MAGIC or fmt != ALIAS_FORMAT_VERSION:
+        raise GeographyError(f"Error: {fpath} is not a version {ALIAS_FORMAT_VERSION} alias table")
+    if len(buf) != _HEADER.size + 12 * n:
+        raise GeographyError(f"Error: alias table {fpath} is truncated")
+    prob = array("d")
+    prob.frombytes(buf[_HEADER.size:_HEADER.size + 8 * n])
+    alias = array("I")
+    alias.frombytes(buf[_HEADER.size + 8 * n:])
+    if sys.byteorder == "big":
+        prob.byteswap()
+        alias.byteswap()
+    return AliasTable.from_arrays(prob, alias)
+
+
+def build_alias_tables(geo_dir=GEO):
+    """
+    Precompute an alias table file for every population file in the
+    geography data directory. Returns the list of files written.
+    """
+    written = []
+    for pop_file in sorted(glob(os.path.join(geo_dir, "*" + POPULATION_SUFFIX))):
+        alias_file = os.path.splitext(pop_file)[0] + ALIAS_SUFFIX
+        write_alias_table(AliasTable(read_populations(pop_file)), alias_file)
+        written.append(alias_file)
+    return written
+
+
+def get_population_table(fpath):
+    """
+    Return the AliasTable for a population file (.pop) or a precomputed
+    alias table file (.alias), loading it once per process.
+    """
+    fpath = os.path.realpath(fpath)
+    st = os.stat(fpath)
+    key = (fpath, st.st_mtime_ns, st.st_size)
+    with _tables_lock:
+        table = _tables.get(key)
+    if table is None:
+        if fpath.endswith(ALIAS_SUFFIX):
+            table = read_alias_table(fpath)
+        else:
+            table = AliasTable(read_populations(fpath))
+        with _tables_lock:
+            _tables[key] = table
+    return table
@@ -0,0 +1,162 @@
+from collections import OrderedDict
+import os
+import threading
+from .utils import (
+    get_team_names_data_file,
+    get_leagues_divisions_data_file,
+    get_first_names_data_file,
+    get_last_names_data_file,
+    parse_leagues_divisions,
+    read_word_list,
+)
+from .linefile import open_line_file
+from .pack import get_data_pack
+
+
+class WordListRegistry(object):
+    """
+    Process-wide cache of word lists loaded from data files.
+
+    Lists are keyed by the resolved file path (and the parser used to turn
+    the lines into data), and are reloaded if the file's mtime or size has
+    changed since it was cached. Every generator that asks for the same file
+    shares one immutable, tuple-backed copy of its contents.
+
+    Built-in data files are served from the compiled data pack when one is
+    available and the file's size still matches it (see DataPack.lookup),
+    so their strings are decoded lazily from a shared memory map instead of
+    being read into memory.
+
+    With file_backed=True, a file is not read into memory at all: its lines
+    are served by a FileBackedList through a sidecar line index.
+
+    If maxsize is set, the least recently used lists are evicted once more
+    than maxsize lists are cached.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._lists = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lists)
+
+    def __contains__(self, path):
+        path = os.path.realpath(path)
+        return any(key[0] == path for key in self._lists)
+
+    def get(self, path, parser=None, file_backed=False):
+        """
+        Return the word list for path, loading it if it is not cached or
+        if the file has changed on disk.
+
+        parser, if given, is called with the tuple of lines and its result
+        is cached in place of the lines.
+        If file_backed is true, the lines are a FileBackedList instead of a tuple.
+        """
+        path = os.path.realpath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = (path, parser, file_backed)
+        with self._lock:
+            entry = self._lists.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._lists.move_to_end(key)
+                return entry[1]
+
+        data = None
+        if file_backed:
+            data = open_line_file(path)
+        else:
+            pack = get_data_pack()
+            if pack is not None:
+                data = pack.lookup(path)
+        if data is None:
+            data = read_word_list(path)
+        if parser is not None:
+            data = parser(data)
+
+        with self._lock:
+            # stamp, data, values derived from data (see get_derived)
+            self._lists[key] = [stamp, data, {}]
+            self._lists.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._lists) > self.maxsize:
+                    self._lists.popitem(last=False)
+        return data
+
+    def get_decoded(self, data):
+        """
+        Return a word list cached in this registry as a tuple of ready-made
+        strings, for bulk draws that touch most of the list. The tuple is
+        built once and cached with the list, so every generator using the
+        list shares it. Returns None if data is not a list cached here.
+        """
+        return self.get_derived(data, "decoded", tuple)
+
+    def get_derived(self, data, name, build):
+        """
+        Return build(data), computed once per word list cached in this
+        registry and kept with the list under name, so it is shared by every
+        generator using the list and dropped when the list is reloaded.
+        Returns None if data is not a list cached here.
+        """
+        with self._lock:
+            for key, entry in self._lists.items():
+                if entry[1] is data:
+                    break
+            else:
+                return None
+            if name in entry[2]:
+                return entry[2][name]
+        value = build(data)
+        with self._lock:
+            entry = self._lists.get(key)
+            if entry is not None and entry[1] is data:
+                value = entry[2].setdefault(name, value)
+        return value
+
+    def preload(self, paths, parser=None):
+        """
+        Load a collection of files into the registry ahead of time.
+        """
+        for path in paths:
+            self.get(path, parser=parser)
+
+    def clear(self):
+        """
+        Drop every cached word list.
+        """
+        with self._lock:
+            self._lists.clear()
+
+
+# The registry shared by all generators in this process
+word_lists = WordListRegistry()
+
+
+def get_word_list(path, parser=None, file_backed=False):
+    return word_lists.get(path, parser=parser, file_backed=file_backed)
+
+
+def preload(paths=None, parser=None):
+    """
+    Load word lists into the shared registry. With no paths, load the
+    built-in team, league/division, first name and last name lists.
+    """
+    if paths is None:
+        word_lists.preload(
+            [
+                get_team_names_data_file(),
+                get_first_names_data_file(),
+                get_last_names_data_file(),
+            ]
+        )
+        word_lists.get(get_leagues_divisions_data_file(), parser=parse_leagues_divisions)
+    else:
+        word_lists.preload(paths, parser=parser)
+
+
+def clear():
+    word_lists.clear()
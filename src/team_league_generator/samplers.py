@@ -0,0 +1,532 @@
+import hashlib
+import heapq
+from itertools import islice
+import math
+import random
+
+
+# Marks the end of an iterator
+_END = object()
+
+
+def get_rng(rng=None):
+    """
+    Turn an rng argument into a random number generator.
+
+    None means the module-level random generator (shared process-wide state),
+    a random.Random instance is used as is, and anything else is treated as
+    a seed for a new random.Random instance.
+    """
+    if rng is None or rng is random:
+        return random
+    if isinstance(rng, random.Random):
+        return rng
+    return random.Random(rng)
+
+
+class AliasTable(object):
+    """
+    Walker/Vose alias table for sampling indices from a fixed discrete
+    distribution in O(1) time per draw.
+
+    The table is built once in O(n) from a list of (unnormalized) weights.
+    Each draw then costs a single call to rng.random().
+    """
+
+    def __init__(self, weights):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("Error: AliasTable requires at least one weight")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("Error: AliasTable weights must sum to a positive number")
+
+        # Scale weights so that the average bucket holds probability 1
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = g
+            scaled[g] = (scaled[g] + scaled[s]) - 1.0
+            if scaled[g] < 1.0:
+                small.append(g)
+            else:
+                large.append(g)
+
+        # Anything left over is (up to rounding error) exactly full
+        for i in large + small:
+            prob[i] = 1.0
+
+        self.n = n
+        self.prob = prob
+        self.alias = alias
+
+    @classmethod
+    def from_arrays(cls, prob, alias):
+        """
+        Make a table from the prob and alias arrays of a table built earlier
+        (e.g. loaded from disk), without rebuilding it from the weights.
+        """
+        if len(prob) == 0 or len(prob) != len(alias):
+            raise ValueError("Error: AliasTable needs non-empty prob and alias arrays of the same length")
+        table = cls.__new__(cls)
+        table.n = len(prob)
+        table.prob = prob
+        table.alias = alias
+        return table
+
+    def __len__(self):
+        return self.n
+
+    def weights(self):
+        """
+        Recover the table's weights, scaled to sum to n. They are computed
+        once, in O(n), and the same list is returned every time after that,
+        so it must not be modified.
+        """
+        weights = getattr(self, "_weights", None)
+        if weights is None:
+            weights = list(self.prob)
+            for i in range(self.n):
+                weights[self.alias[i]] += 1.0 - self.prob[i]
+            self._weights = weights
+        return weights
+
+    def sample(self, rng=random):
+        """
+        Draw a single index in [0, n) according to the table's weights.
+        """
+        u = rng.random() * self.n
+        i = int(u)
+        if i >= self.n:
+            i = self.n - 1
+        if u - i < self.prob[i]:
+            return i
+        return self.alias[i]
+
+    def sample_many(self, k, rng=random):
+        """
+        Draw k indices (with replacement) according to the table's weights.
+        """
+        n = self.n
+        prob = self.prob
+        alias = self.alias
+        rand = rng.random
+        out = []
+        for _ in range(k):
+            u = rand() * n
+            i = int(u)
+            if i >= n:
+                i = n - 1
+            out.append(i if u - i < prob[i] else alias[i])
+        return out
+
+
+def _isqrt_newton(x):
+    """
+    Return the integer square root of x >= 0, by Newton's method on integers
+    """
+    if x == 0:
+        return 0
+    r = 1 << ((x.bit_length() + 1) // 2)
+    while True:
+        y = (r + x // r) // 2
+        if y >= r:
+            return r
+        r = y
+
+
+# math.isqrt needs Python 3.8
+_isqrt = getattr(math, "isqrt", _isqrt_newton)
+
+
+class LinearSampler(object):
+    """
+    Sample indices in [0, n) with the linear weights n, n-1, ..., 1 in O(1)
+    time and memory, by inverting the cumulative weights in closed form.
+
+    Counted from the back of the list, item b has weight b + 1, so the items
+    up to and including b hold the triangular number (b + 1)(b + 2) / 2 of
+    the total weight. A uniform integer below the total weight therefore
+    maps to b with one integer square root, exactly, with no table.
+    Same interface as AliasTable, for lists too big to build a table for.
+    """
+
+    def __init__(self, n):
+        if n < 1:
+            raise ValueError("Error: LinearSampler requires n >= 1")
+        self.n = n
+        self.total = n * (n + 1) // 2
+
+    def __len__(self):
+        return self.n
+
+    def sample(self, rng=random):
+        """
+        Draw a single index in [0, n), biased toward the front.
+        """
+        v = rng.randrange(self.total)
+        return self.n - 1 - (_isqrt(8 * v + 1) - 1) // 2
+
+    def sample_many(self, k, rng=random):
+        """
+        Draw k indices (with replacement), biased toward the front.
+        """
+        last = self.n - 1
+        total = self.total
+        randbelow = rng.randrange
+        isqrt = _isqrt
+        return [last - (isqrt(8 * randbelow(total) + 1) - 1) // 2 for _ in range(k)]
+
+
+def linear_weights(n):
+    """
+    Return the linear weights n, n-1, ..., 1 that bias toward the front of a list.
+    """
+    return list(range(n, 0, -1))
+
+
+def weighted_sample_without_replacement(weights, k, rng=random):
+    """
+    Sample k distinct indices in proportion to weights, without replacement,
+    using the Efraimidis-Spirakis exponential key method.
+
+    Each index i gets the key log(u_i) / w_i for u_i uniform in (0, 1]; the
+    k largest keys are the sample. This is a single pass over the weights
+    and runs in O(n log k). The indices are returned in order of decreasing
+    key, which is the order successive weighted draws would produce.
+    Items with a weight of zero are never selected.
+    """
+    rand = rng.random
+    keyed = (
+        (math.log(1.0 - rand()) / w, i) for i, w in enumerate(weights) if w > 0
+    )
+    return [i for _, i in heapq.nlargest(k, keyed)]
+
+
+def iter_weighted_ranking(weights, rng=random):
+    """
+    Yield every index with a positive weight exactly once, in the order
+    successive weighted draws without replacement would produce.
+
+    This is the exponential key method of weighted_sample_without_replacement,
+    made lazy: the keys are heapified in O(n) up front, then each index is
+    popped in O(log n) as it is needed, so a stream that is abandoned early
+    never pays for a full sort.
+    """
+    rand = rng.random
+    keyed = [(-math.log(1.0 - rand()) / w, i) for i, w in enumerate(weights) if w > 0]
+    heapq.heapify(keyed)
+    while keyed:
+        yield heapq.heappop(keyed)[1]
+
+
+def reservoir_sample(iterable, k, rng=random):
+    """
+    Sample k items uniformly, without replacement, from an iterable of
+    unknown length, in a single pass and O(k) memory.
+
+    This is Li's Algorithm L: after the reservoir fills, it computes how
+    many items to skip before the next replacement instead of drawing a
+    random number per item, so it costs O(k (1 + log(n / k))) random draws.
+    Returns fewer than k items if the iterable runs out first, in random order.
+    """
+    if k < 0:
+        raise ValueError(f"Error: cannot sample {k} items")
+    iterator = iter(iterable)
+    reservoir = list(islice(iterator, k))
+    if len(reservoir) < k or k == 0:
+        rng.shuffle(reservoir)
+        return reservoir
+
+    rand = rng.random
+    w = math.exp(math.log(1.0 - rand()) / k)
+    while True:
+        skip = int(math.log(1.0 - rand()) / math.log(1.0 - w)) if w < 1.0 else 0
+        nxt = next(islice(iterator, skip, None), _END)
+        if nxt is _END:
+            break
+        reservoir[rng.randrange(k)] = nxt
+        w *= math.exp(math.log(1.0 - rand()) / k)
+    rng.shuffle(reservoir)
+    return reservoir
+
+
+def _exp_jump(log_key, rand):
+    """
+    Draw how much weight A-ExpJ skips before an item beats the key exp(log_key)
+    """
+    if log_key >= 0:
+        # Nothing can beat the largest possible key
+        return math.inf
+    return math.log(1.0 - rand()) / log_key
+
+
+def _key_above(log_key, w, rand):
+    """
+    Draw the log of a key for an item of weight w, conditioned on beating exp(log_key)
+    """
+    t = math.exp(log_key * w)
+    return math.log(t + (1.0 - t) * (1.0 - rand())) / w
+
+
+def weighted_reservoir_sample(iterable, k, weight, rng=random):
+    """
+    Sample k items without replacement from an iterable of unknown length,
+    in proportion to weight(i) for the item at position i, in a single pass
+    and O(k) memory.
+
+    This is the Efraimidis-Spirakis A-ExpJ algorithm: the reservoir keeps the
+    k largest keys u^(1/w), and instead of drawing a key for every item it
+    draws how much weight to skip before the next item that gets in.
+    Items come back in order of decreasing key, which is the order
+    successive weighted draws would produce. Items with a weight of zero
+    or less are never selected.
+    """
+    if k < 0:
+        raise ValueError(f"Error: cannot sample {k} items")
+    if k == 0:
+        return []
+    rand = rng.random
+    heap = []
+    threshold = None
+    for i, item in enumerate(iterable):
+        w = weight(i)
+        if w <= 0:
+            continue
+        if len(heap) < k:
+            heapq.heappush(heap, (math.log(1.0 - rand()) / w, i, item))
+            if len(heap) == k:
+                threshold = _exp_jump(heap[0][0], rand)
+            continue
+        threshold -= w
+        if threshold > 0:
+            continue
+        # This item gets in: draw its key from above the smallest key in the reservoir
+        heapq.heapreplace(heap, (_key_above(heap[0][0], w, rand), i, item))
+        threshold = _exp_jump(heap[0][0], rand)
+    return [item for _, _, item in sorted(heap, reverse=True)]
+
+
+def reservoir_sample_with_replacement(iterable, k, rng=random, weight=None):
+    """
+    Sample k items with replacement from an iterable of unknown length, in
+    a single pass and O(k) memory, in proportion to weight(i) for the item
+    at position i (uniformly if weight is None).
+
+    Each of the k slots is an independent one-item A-ExpJ reservoir. Slots
+    are kept in a heap by the cumulative weight at which they next jump, so
+    an item costs O(1) unless some slot jumps to it. Returns an empty list
+    if no item has a positive weight.
+    """
+    if k < 0:
+        raise ValueError(f"Error: cannot sample {k} items")
+    rand = rng.random
+    slots = [None] * k
+    keys = [0.0] * k
+    jumps = []
+    total = 0.0
+    for i, item in enumerate(iterable):
+        w = 1.0 if weight is None else weight(i)
+        if w <= 0:
+            continue
+        if not jumps:
+            # First item: it fills every slot
+            for j in range(k):
+                slots[j] = item
+                keys[j] = math.log(1.0 - rand()) / w
+                jumps.append((total + w + _exp_jump(keys[j], rand), j))
+            heapq.heapify(jumps)
+            total += w
+            continue
+        total += w
+        while jumps and jumps[0][0] <= total:
+            _, j = jumps[0]
+            keys[j] = _key_above(keys[j], w, rand)
+            slots[j] = item
+            heapq.heapreplace(jumps, (total + _exp_jump(keys[j], rand), j))
+    if not jumps:
+        return []
+    return slots
+
+
+def sample_indices(n, k, rng=random):
+    """
+    Sample k distinct indices uniformly from range(n), without replacement.
+
+    This is a partial Fisher-Yates shuffle over a virtual array: only the
+    positions that have been swapped are stored, in a dict, so it runs in
+    O(k) time and memory no matter how large n is. The indices come back
+    in random order.
+    """
+    if k < 0 or k > n:
+        raise ValueError(f"Error: cannot sample {k} distinct indices from {n}")
+    randbelow = rng.randrange
+    swapped = {}
+    out = []
+    for i in range(k):
+        j = randbelow(i, n)
+        out.append(swapped.get(j, j))
+        swapped[j] = swapped.get(i, i)
+    return out
+
+
+class Deck(object):
+    """
+    A shuffled deck of the indices in range(n), dealt a few at a time.
+
+    The shuffle is an incremental Fisher-Yates: each dealt index costs one
+    random draw and no rejection, and only the positions that have been
+    swapped but not yet dealt are stored, so nothing of size n is built.
+    No index is dealt twice until the deck is reset or reshuffled.
+
+    The deck owns its random stream (seeded with seed), so its position can
+    be saved with checkpoint() and restored exactly with restore().
+    """
+
+    def __init__(self, n, seed=None):
+        if n < 0:
+            raise ValueError(f"Error: Deck size {n} must not be negative")
+        self.n = n
+        self.rng = random.Random(seed)
+        self.reshuffle()
+
+    def __len__(self):
+        """
+        Number of indices left to deal
+        """
+        return self.n - self.cursor
+
+    def draw(self, k=1):
+        """
+        Deal the next k indices from the deck
+        """
+        if k < 0 or k > len(self):
+            raise ValueError(f"Error: cannot deal {k} indices, {len(self)} are left in the deck")
+        randbelow = self.rng.randrange
+        swapped = self.swapped
+        n = self.n
+        out = []
+        for i in range(self.cursor, self.cursor + k):
+            j = randbelow(i, n)
+            top = swapped.pop(i, i)
+            if j == i:
+                out.append(top)
+            else:
+                out.append(swapped.get(j, j))
+                swapped[j] = top
+        self.cursor += k
+        return out
+
+    def reset(self):
+        """
+        Put every index back, to be dealt again in the same order as this round
+        """
+        self.rng.setstate(self._round_state)
+        self.cursor = 0
+        self.swapped = {}
+
+    def reshuffle(self):
+        """
+        Put every index back, to be dealt in a new order
+        """
+        self._round_state = self.rng.getstate()
+        self.cursor = 0
+        self.swapped = {}
+
+    def checkpoint(self):
+        """
+        Return the deck's position, to be passed back to restore()
+        """
+        return {
+            "n": self.n,
+            "cursor": self.cursor,
+            "swapped": dict(self.swapped),
+            "rng_state": self.rng.getstate(),
+            "round_state": self._round_state,
+        }
+
+    def restore(self, checkpoint):
+        """
+        Return the deck to a position saved by checkpoint()
+        """
+        if checkpoint["n"] != self.n:
+            raise ValueError(f"Error: checkpoint is for a deck of {checkpoint['n']}, not {self.n}")
+        self.cursor = checkpoint["cursor"]
+        self.swapped = dict(checkpoint["swapped"])
+        self.rng.setstate(checkpoint["rng_state"])
+        self._round_state = checkpoint["round_state"]
+
+
+def derive_seed(seed, index):
+    """
+    Derive an independent 64-bit seed for stream number index from a master seed.
+    The same (seed, index) pair gives the same result in every process.
+    """
+    digest = hashlib.sha256(f"{seed}:{index}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x):
+    """
+    SplitMix64 finalizer: a fast, well-distributed 64-bit integer hash
+    """
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK64
+    return x ^ (x >> 31)
+
+
+class FeistelPermutation(object):
+    """
+    A seeded pseudorandom permutation of range(n) that is computed on demand.
+
+    permute(i) maps each index in range(n) to a distinct index in range(n)
+    in O(1) time and memory, so walking i = 0, 1, 2, ... visits every index
+    exactly once in shuffled order without materializing the shuffle.
+
+    This is a balanced Feistel network over the smallest even number of bits
+    that covers n, with cycle walking to stay inside range(n) (on average
+    fewer than four rounds of the network per index).
+    """
+
+    def __init__(self, n, seed, rounds=4):
+        if n < 1:
+            raise ValueError("Error: FeistelPermutation requires n >= 1")
+        self.n = n
+        self.seed = seed
+        half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        self._keys = [derive_seed(seed, r) for r in range(rounds)]
+
+    def __len__(self):
+        return self.n
+
+    def _encrypt(self, x):
+        bits = self._half_bits
+        mask = self._half_mask
+        left = x >> bits
+        right = x & mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix64(right ^ key) & mask)
+        return (left << bits) | right
+
+    def permute(self, i):
+        """
+        Return the image of index i under the permutation
+        """
+        if i < 0 or i >= self.n:
+            raise IndexError(f"Error: index {i} is outside range({self.n})")
+        x = self._encrypt(i)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
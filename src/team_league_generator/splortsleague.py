@@ -1,4 +1,12 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
 import random
+from .errors import InvalidSizeRequestError, KeywordError
+from .generics import check_chunk_size, chunked
+from .league import League
+from .samplers import derive_seed, get_rng
 from .teams import (
     TeamNameGenerator,
     LeagueNameGenerator,
@@ -22,8 +30,26 @@ class SplortsLeagueGenerator(object):
     Use various generators to assemble a league of splorts teams.
     """
 
-    def __init__(self, geo="bigcities", country_code="usa", **kwargs):
-        kwargs['country_code'] = country_code
+    def __init__(
+        self,
+        geo="bigcities",
+        country_code="usa",
+        rng=None,
+        team_names_file=None,
+        leagues_divisions_file=None,
+        **kwargs
+    ):
+        # Keep the constructor arguments so worker processes can build a copy
+        self._init_kwargs = dict(
+            kwargs,
+            geo=geo,
+            country_code=country_code,
+            team_names_file=team_names_file,
+            leagues_divisions_file=leagues_divisions_file,
+        )
+        # Options left in kwargs (backend, file_backed, ...) go to every part
+        self.rng = get_rng(rng)
+        kwargs['rng'] = self.rng
         self.geo_type_map = {
             "cities": CitiesGenerator,
             "bigcities": BigCitiesGenerator,
@@ -39,14 +65,234 @@ class SplortsLeagueGenerator(object):
             )
         GeoGen = self.geo_type_map[geo]
 
-        self.geo = GeoGen(**kwargs)
-        self.team = TeamNameGenerator(**kwargs)
-        self.lea = LeagueNameGenerator(**kwargs)
-        self.div = DivisionNameGenerator(**kwargs)
+        self.geo = GeoGen(country_code=country_code, **kwargs)
+        self.team = TeamNameGenerator(team_names_file=team_names_file, **kwargs)
+        self.lea = LeagueNameGenerator(leagues_divisions_file=leagues_divisions_file, **kwargs)
+        self.div = DivisionNameGenerator(leagues_divisions_file=leagues_divisions_file, **kwargs)
+
+    def set_rng(self, rng):
+        """
+        Replace the random stream shared by this generator and all of its parts.
+        """
+        self.rng = get_rng(rng)
+        for gen in (self.geo, self.team, self.lea, self.div):
+            gen.set_rng(self.rng)
+
+    def warm(self):
+        """
+        Load every word list this league generator uses now, instead of on first use.
+        Returns self.
+        """
+        for gen in (self.geo, self.team, self.lea, self.div):
+            gen.warm()
+        return self
 
     def generate(
-        self, nleagues=2, ndivisions=2, teams_per_division=4, geo=None, **kwargs
+        self, nleagues=2, ndivisions=2, teams_per_division=4, geo=None, rng=None, **kwargs
+    ):
+        """
+        Generate a league as a dictionary: {league name: {division name: [team names]}}.
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
+        self._check_sizes(nleagues, ndivisions)
+        rng = self.rng if rng is None else get_rng(rng)
+
+        league_names, division_names = self._generate_league_division_names(nleagues, ndivisions, rng)
+
+        # Generate all teams at once
+        all_locs = sorted(self.geo.generate(size=nleagues*ndivisions*teams_per_division, rng=rng))
+        rng.shuffle(all_locs)
+
+        all_teams = sorted(self.team.generate(size=nleagues*ndivisions*teams_per_division, rng=rng))
+        rng.shuffle(all_teams)
+
+        return self._assemble(
+            sorted(league_names), sorted(division_names), teams_per_division, all_locs, all_teams
+        )
+
+    def generate_large(self, nleagues, ndivisions, teams_per_division=4, rng=None):
+        """
+        Generate a league of any size, in the same form as generate().
+
+        League and division names are drawn from every distinct name in the
+        leagues/divisions file rather than from a single row, so the only
+        limits are the sizes of the word lists: nleagues + ndivisions must not
+        exceed the number of distinct league/division names, and the total
+        number of teams must not exceed the number of locations. Team names
+        are reused, in a fresh random order each time, once every one of them
+        has been used; each line of the location file is used at most once.
+
+        Time and memory are linear in the number of teams.
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
+        if teams_per_division < 0:
+            raise KeywordError(f"Error: number of teams per division {teams_per_division} was invalid")
+        rng = self.rng if rng is None else get_rng(rng)
+        league_names, division_names = self.lea.generate_names(nleagues, ndivisions, rng)
+
+        nteams = nleagues * ndivisions * teams_per_division
+        all_locs = self.geo.generate(size=nteams, rng=rng)
+        # Biased samples come back in draw order, shuffle so every division is alike
+        rng.shuffle(all_locs)
+        team_data = self.team.data
+        all_teams = [team_data[i] for i in self._nickname_indices(nteams, rng)]
+
+        return self._assemble(
+            sorted(league_names), sorted(division_names), teams_per_division, all_locs, all_teams
+        )
+
+    def generate_league(self, nleagues=2, ndivisions=2, teams_per_division=4, large=False, rng=None):
+        """
+        Generate a league as a compact League object, which stores indices
+        into the shared word lists instead of strings.
+        League.to_dict() returns the same form as generate().
+
+        With large=True, league sizes are limited as in generate_large()
+        rather than as in generate().
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
+        rng = self.rng if rng is None else get_rng(rng)
+        if large:
+            if teams_per_division < 0:
+                raise KeywordError(f"Error: number of teams per division {teams_per_division} was invalid")
+            league_names, division_names = self.lea.generate_names(nleagues, ndivisions, rng)
+        else:
+            self._check_sizes(nleagues, ndivisions)
+            league_names, division_names = self._generate_league_division_names(nleagues, ndivisions, rng)
+
+        nteams = nleagues * ndivisions * teams_per_division
+        # Biased samples come back in draw order, shuffle so every division is alike
+        loc_indices = self.geo.generate_indices(size=nteams, rng=rng)
+        rng.shuffle(loc_indices)
+        team_indices = self._nickname_indices(nteams, rng)
+        rng.shuffle(team_indices)
+
+        return League(
+            sorted(league_names),
+            sorted(division_names),
+            teams_per_division,
+            self.geo.data,
+            self.team.data,
+            loc_indices,
+            team_indices,
+        )
+
+    def generate_many(self, n, nleagues=2, ndivisions=2, teams_per_division=4):
+        """
+        Generate n leagues, yielding them one at a time in the same form as generate().
+
+        Sizes are checked and word lists are loaded once for the whole batch,
+        and each league costs O(number of teams) to sample and assemble,
+        so memory use does not grow with n.
+        """
+        # Check every argument now, not when the first league is drawn
+        if n < 0:
+            raise InvalidSizeRequestError(f"Error: number of leagues to generate {n} was invalid")
+        self._check_sizes(nleagues, ndivisions)
+        return islice(self.iter_generate(nleagues, ndivisions, teams_per_division), n)
+
+    def iter_generate(self, nleagues=2, ndivisions=2, teams_per_division=4, unique=False):
+        """
+        Yield leagues one at a time, in the same form as generate().
+
+        By default the stream never ends. If unique is true, no location is
+        used twice anywhere in the stream (so no team appears in two leagues),
+        and the stream ends when there are not enough locations left for
+        another league. A unique stream keeps track of the locations that are
+        left, see the geo generator's iter_generate.
+        """
+        # Check every argument now, not when the first league is drawn
+        self._check_sizes(nleagues, ndivisions)
+        self.warm()
+        return self._iter_generate(nleagues, ndivisions, teams_per_division, unique)
+
+    def _iter_generate(self, nleagues, ndivisions, teams_per_division, unique):
+        nteams = nleagues * ndivisions * teams_per_division
+        gen_locs = self.geo.generate
+        gen_teams = self.team.generate
+        if unique:
+            loc_stream = self.geo.iter_generate(unique=True)
+        while True:
+            league_names, division_names = self._generate_league_division_names(nleagues, ndivisions, self.rng)
+            if unique:
+                all_locs = list(islice(loc_stream, nteams))
+                if len(all_locs) < nteams:
+                    return
+            else:
+                all_locs = gen_locs(size=nteams)
+            # Biased samples come back in draw order, biggest first; shuffle so every division is alike
+            self.rng.shuffle(all_locs)
+            yield self._assemble(
+                sorted(league_names),
+                sorted(division_names),
+                teams_per_division,
+                all_locs,
+                gen_teams(size=nteams),
+            )
+
+    def stream(self, nleagues=2, ndivisions=2, teams_per_division=4, unique=False, chunk_size=64):
+        """
+        Same as iter_generate, but yields lists of chunk_size leagues.
+        """
+        return chunked(self.iter_generate(nleagues, ndivisions, teams_per_division, unique), chunk_size)
+
+    def generate_parallel(
+        self, n, seed, nleagues=2, ndivisions=2, teams_per_division=4, workers=None, chunk_size=64
     ):
+        """
+        Generate n leagues across a pool of worker processes, yielding them
+        in order in the same form as generate().
+
+        League number i is generated from its own random stream, seeded with
+        derive_seed(seed, i), so the output for a given seed is identical no
+        matter how many workers are used or how the work is chunked.
+
+        Word lists are loaded before the pool starts. Workers started by
+        forking share them (and the memory-mapped data pack) with this process,
+        and each worker builds its league generator only once.
+        """
+        # Check every argument now, not when the first league is drawn
+        if n < 0:
+            raise InvalidSizeRequestError(f"Error: number of leagues to generate {n} was invalid")
+        self._check_sizes(nleagues, ndivisions)
+        check_chunk_size(chunk_size)
+        self.warm()
+
+        sizes = dict(nleagues=nleagues, ndivisions=ndivisions, teams_per_division=teams_per_division)
+        return self._generate_parallel(n, seed, sizes, workers, chunk_size)
+
+    def _generate_parallel(self, n, seed, sizes, workers, chunk_size):
+        chunks = ((start, min(start + chunk_size, n)) for start in range(0, n, chunk_size))
+        if workers is None:
+            workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self._init_kwargs,)
+        ) as executor:
+            # Keep a bounded number of chunks in flight so memory stays flat
+            window = 2 * workers
+            pending = deque()
+            for start, stop in chunks:
+                pending.append(executor.submit(_generate_chunk, seed, start, stop, sizes))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def generate_seeded(self, seed, index, nleagues=2, ndivisions=2, teams_per_division=4):
+        """
+        Generate league number index of the stream for a master seed,
+        exactly as generate_parallel() would. The league is drawn from its
+        own random stream, so this generator's random stream is left
+        untouched and threads can share the generator.
+        """
+        return self.generate(
+            nleagues=nleagues,
+            ndivisions=ndivisions,
+            teams_per_division=teams_per_division,
+            rng=random.Random(derive_seed(seed, index)),
+        )
+
+    def _check_sizes(self, nleagues, ndivisions):
         if (nleagues < 0 or ndivisions < 0) or (
             nleagues > MAX_LEAGUES_DIVISIONS or ndivisions > MAX_LEAGUES_DIVISIONS
         ):
@@ -54,36 +300,46 @@ class SplortsLeagueGenerator(object):
                 f"Error: number of leagues {nleagues} or divisions {ndivisions} was invalid"
             )
 
-        league_names = self.lea.generate(size=nleagues)
+    def _generate_league_division_names(self, nleagues, ndivisions, rng):
         # League and division names should have no overlap
-        ntries = 0
-        division_names = self.div.generate(size=nleagues)
-        while len(set(division_names).intersection(set(league_names))) > 0:
-            division_names = self.div.generate(size=nleagues)
+        return self.lea.generate_pair(nleagues, ndivisions, rng)
 
-        # Generate all teams at once
-        all_locs = sorted(self.geo.generate(size=nleagues*ndivisions*teams_per_division))
-        random.shuffle(all_locs)
-
-        all_teams = sorted(self.team.generate(size=nleagues*ndivisions*teams_per_division))
-        random.shuffle(all_teams)
+    def _nickname_indices(self, nteams, rng):
+        """
+        Draw nteams team name indices, unique until every team name has been
+        used, then starting over in a fresh random order.
+        """
+        nnames = len(self.team)
+        if nnames == 0:
+            # Let the team generator report the size error
+            return self.team.generate_indices(size=nteams, rng=rng)
+        indices = []
+        while len(indices) < nteams:
+            indices.extend(self.team.generate_indices(size=min(nnames, nteams - len(indices)), rng=rng))
+        return indices
 
+    @staticmethod
+    def _assemble(league_names, division_names, teams_per_division, locs, teams):
+        """
+        Build the league dictionary, walking the location and team lists with
+        a single cursor so that nothing is copied per division.
+        """
         final = {}
-        for iL, league_name in enumerate(sorted(league_names)):
+        k = 0
+        for league_name in league_names:
             league = {}
-            for iD, division_name in enumerate(sorted(division_names)):
-                division = []
-                div_locs, all_locs = all_locs[:teams_per_division], all_locs[teams_per_division:]
-                div_teams, all_teams = all_teams[:teams_per_division], all_teams[teams_per_division:]
-                for location_name, team_name in zip(div_locs, div_teams):
-                    division.append(" ".join([location_name, team_name]))
-                league[division_name] = division
+            for division_name in division_names:
+                league[division_name] = [
+                    locs[j] + " " + teams[j] for j in range(k, k + teams_per_division)
+                ]
+                k += teams_per_division
             final[league_name] = league
-
         return final
 
     @staticmethod
     def extract_leagues_divisions_teams(league_dict):
+        if isinstance(league_dict, League):
+            return sorted(league_dict.leagues), sorted(league_dict.divisions), sorted(set(league_dict.teams))
         leagues = set(league_dict.keys())
         divs = set()
         teams = set()
@@ -92,3 +348,16 @@ class SplortsLeagueGenerator(object):
             for div_name, team_list in div_dict.items():
                 [teams.add(j) for j in team_list]
         return sorted(list(leagues)), sorted(list(divs)), sorted(list(teams))
+
+
+# League generator owned by each worker process of generate_parallel()
+_worker_generator = None
+
+
+def _init_worker(init_kwargs):
+    global _worker_generator
+    _worker_generator = SplortsLeagueGenerator(**init_kwargs).warm()
+
+
+def _generate_chunk(seed, start, stop, sizes):
+    return [_worker_generator.generate_seeded(seed, i, **sizes) for i in range(start, stop)]
@@ -1,7 +1,14 @@
-import random
+from bisect import bisect_left
 import os
+from .errors import InvalidSizeRequestError
 from .generics import IterableDataLoader, UniformGenerator
-from .utils import get_team_names_data_file, get_leagues_divisions_data_file
+from .registry import get_word_list, word_lists
+from .samplers import sample_indices
+from .utils import (
+    get_team_names_data_file,
+    get_leagues_divisions_data_file,
+    parse_leagues_divisions,
+)
 
 
 HERE = os.path.abspath(os.path.dirname(__file__))
@@ -16,10 +23,11 @@ class TeamNameGeneratorBase(IterableDataLoader):
             raise FileNotFoundError(
                 f"{self.__class__.__name__}: Error: specified teams file does not exist: {team_names_file}"
             )
-        with open(team_names_file, "r") as f:
-            data = f.readlines()
-        data = [j.strip() for j in data if len(j.strip()) > 0]
-        super().__init__(data)
+        self.team_names_file = team_names_file
+        super().__init__(**kwargs)
+
+    def load_data(self):
+        return get_word_list(self.team_names_file, file_backed=self.file_backed)
 
 
 class TeamNameGenerator(TeamNameGeneratorBase, UniformGenerator):
@@ -34,22 +42,127 @@ class LeagueDivisionNameGeneratorBase(IterableDataLoader):
             raise FileNotFoundError(
                 f"{self.__class__.__name__}: Error: specified leagues/divisions file does not exist: {leagues_divisions_file}"
             )
-        with open(leagues_divisions_file, "r") as f:
-            data = f.readlines()
-        data = [j.strip() for j in data if len(j.strip()) > 0]
-        data = [[k.strip().title() for k in j.split(",")] for j in data]
-        self.max_len = max([len(j) for j in data])
-        super().__init__(data)
+        self.leagues_divisions_file = leagues_divisions_file
+        super().__init__(**kwargs)
+
+    def load_data(self):
+        return get_word_list(
+            self.leagues_divisions_file, parser=parse_leagues_divisions, file_backed=self.file_backed
+        )
+
+    def get_index(self):
+        """
+        Return the LeagueDivisionIndex for self.data, building it if the data
+        has changed since it was last built. Lists from the registry share
+        one index, built the first time any generator needs it.
+        """
+        index = word_lists.get_derived(self.data, "league_division_index", LeagueDivisionIndex)
+        if index is not None:
+            return index
+        cached = getattr(self, "_index_cache", None)
+        if cached is None or cached[0] is not self.data:
+            cached = (self.data, LeagueDivisionIndex(self.data))
+            self._index_cache = cached
+        return cached[1]
+
+    @property
+    def max_len(self):
+        return self.get_index().max_len
 
-    def generate(self, size=1, reverse=False):
+    def check_size(self, size):
         if size > self.max_len:
-            raise InvalidSizeRequestError(f"{self.__class__.__name__}: Error: specified size exceeded maximum length {max_len}")
+            raise InvalidSizeRequestError(f"{self.__class__.__name__}: Error: specified size exceeded maximum length {self.max_len}")
         elif size < 1:
             raise InvalidSizeRequestError(f"{self.__class__.__name__}: Error: size parameter {size} was too small")
 
-        valid_data = [j for j in self.data if len(j) >= size]
-        choice = random.choice(valid_data)[:]
-        return choice[:size]
+    def generate(self, size=1, reverse=False, rng=None):
+        self.check_size(size)
+        row = self.get_rng(rng).choice(self.get_index().rows_by_size[size])
+        return list(self.data[row][:size])
+
+    def generate_pair(self, nleagues, ndivisions, rng=None):
+        """
+        Return a list of nleagues league names and a list of ndivisions
+        division names, with no name in common, in a single draw each.
+
+        The division row is drawn uniformly from the rows that are long
+        enough and do not share a name with the chosen league names,
+        without retrying.
+        """
+        self.check_size(nleagues)
+        self.check_size(ndivisions)
+        index = self.get_index()
+        rng = self.get_rng(rng)
+
+        league_row = rng.choice(index.rows_by_size[nleagues])
+        league_names = self.data[league_row][:nleagues]
+
+        # Positions (within the candidate rows) of the rows that would overlap
+        candidates = index.rows_by_size[ndivisions]
+        conflicts = set()
+        for name in set(league_names):
+            for row, position in index.positions[name]:
+                if position < ndivisions and len(self.data[row]) >= ndivisions:
+                    conflicts.add(bisect_left(candidates, row))
+        available = len(candidates) - len(conflicts)
+        if available < 1:
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: no {ndivisions} division names avoid the league names {league_names}"
+            )
+
+        # Pick the k-th candidate that is not a conflict
+        k = rng.randrange(available)
+        for c in sorted(conflicts):
+            if c <= k:
+                k += 1
+            else:
+                break
+        division_names = self.data[candidates[k]][:ndivisions]
+        return list(league_names), list(division_names)
+
+    def generate_names(self, nleagues, ndivisions, rng=None):
+        """
+        Return a list of nleagues league names and a list of ndivisions
+        division names, drawn together without replacement from every
+        distinct name in the file, ignoring rows.
+
+        Used for leagues too big for any single row of the file.
+        Draws from rng if given, otherwise from this generator's random stream.
+        """
+        names = self.get_index().names
+        size = nleagues + ndivisions
+        if nleagues < 1 or ndivisions < 1 or size > len(names):
+            raise InvalidSizeRequestError(
+                f"{self.__class__.__name__}: Error: {nleagues} leagues and {ndivisions} divisions "
+                f"need {size} distinct names, {len(names)} are available"
+            )
+        indices = sample_indices(len(names), size, self.get_rng(rng))
+        return [names[i] for i in indices[:nleagues]], [names[i] for i in indices[nleagues:]]
+
+
+class LeagueDivisionIndex(object):
+    """
+    Lookups over the rows of a leagues/divisions file, built once per data set.
+
+    rows_by_size[size] holds the (sorted) indices of the rows with at least
+    size names, so a row that is long enough can be drawn in O(1).
+    positions maps each name to the (row, position) pairs where it appears,
+    and names holds every distinct name once, in order of first appearance
+    (name_indices maps each name back to its place in names).
+    """
+
+    def __init__(self, data):
+        self.max_len = max([len(j) for j in data])
+        self.rows_by_size = [()] + [
+            tuple(i for i, row in enumerate(data) if len(row) >= size)
+            for size in range(1, self.max_len + 1)
+        ]
+        self.positions = {}
+        for i, row in enumerate(data):
+            for position, name in enumerate(row):
+                self.positions.setdefault(name, []).append((i, position))
+        self.names = tuple(self.positions)
+        self.name_indices = {name: i for i, name in enumerate(self.names)}
 
 
 class LeagueNameGenerator(LeagueDivisionNameGeneratorBase, UniformGenerator):
@@ -1,41 +1,86 @@
 import os
-from glob import glob
-from .constants import HERE, DATA, GEO
+from functools import lru_cache
+from .constants import HERE, DATA, GEO, CITIES_BUCKET_DIVISOR, STATES_BUCKET_DIVISOR
 from .errors import CountryCodeError
+from .manifest import get_manifest, get_country_entry
 
 
 def get_city_country_codes():
     """Return a sorted list of country codes"""
-    country_codes = set()
-    for fpath in sorted(glob(GEO + "/*.txt")):
-        fname = os.path.basename(fpath)
-        if "states" in fname:
-            continue
-        country_code = fname.split(".")[0]
-        country_codes.add(country_code)
-    return sorted(list(country_codes))
+    return list(_city_country_codes())
 
 
 def get_state_country_codes():
-    country_codes = set()
-    for fpath in sorted(glob(GEO + "/*_states.txt")):
-        fname = os.path.basename(fpath)
-        country_code = fname.split("_")[0]
-        country_codes.add(country_code)
-    return sorted(list(country_codes))
+    return list(_state_country_codes())
+
+
+def is_city_country_code(country_code):
+    """Return True if there is a cities data file for this country code"""
+    entry = get_country_entry(country_code)
+    return entry is not None and entry["cities_file"] is not None
+
+
+def is_state_country_code(country_code):
+    """Return True if there is a states data file for this country code"""
+    entry = get_country_entry(country_code)
+    return entry is not None and entry["states_file"] is not None
+
+
+@lru_cache(maxsize=None)
+def _city_country_codes():
+    countries = get_manifest()["countries"]
+    return tuple(sorted(cc for cc, entry in countries.items() if entry["cities_file"] is not None))
+
+
+@lru_cache(maxsize=None)
+def _state_country_codes():
+    countries = get_manifest()["countries"]
+    return tuple(sorted(cc for cc, entry in countries.items() if entry["states_file"] is not None))
+
+
+@lru_cache(maxsize=None)
+def _country_name_index():
+    """
+    Build, once, a pair of dictionaries from the English names in the
+    manifest: lowercase country code to English name, and lowercase
+    English name to lowercase country code.
+    """
+    code_to_name = {}
+    name_to_code = {}
+    for cc, entry in get_manifest()["countries"].items():
+        name = entry["name"]
+        if name is None:
+            continue
+        code_to_name[cc.lower()] = name
+        name_to_code[name.lower()] = cc.lower()
+    return code_to_name, name_to_code
 
 
 def country_code_to_english(cc):
-    fname = get_abbr_key_file()
-    with open(fname, 'r') as f:
-        lines = f.readlines()
-    lines = [s.strip() for s in lines]
-    for line in lines:
-        split = line.split(" ")
-        if split[0].lower() == cc.lower():
-            return " ".join(split[1:])
+    code_to_name, _ = _country_name_index()
+    try:
+        return code_to_name[cc.lower()]
+    except KeyError:
+        raise CountryCodeError(f"Error: country code {cc} not found in abbreviations key file!")
+
 
-    raise CountryCodeError(f"Error: country code {cc} not found in abbreviations key file!")
+def country_codes_to_english(ccs):
+    """Return the English names for a collection of country codes, in the same order"""
+    return [country_code_to_english(cc) for cc in ccs]
+
+
+def english_to_country_code(name):
+    """Return the (lowercase) country code for an English country name"""
+    _, name_to_code = _country_name_index()
+    try:
+        return name_to_code[name.strip().lower()]
+    except KeyError:
+        raise CountryCodeError(f"Error: country name {name} not found in abbreviations key file!")
+
+
+def english_to_country_codes(names):
+    """Return the country codes for a collection of English country names, in the same order"""
+    return [english_to_country_code(name) for name in names]
 
 
 def get_cities_data_file_from_country_code(country_code):
@@ -70,27 +115,79 @@ def get_last_names_data_file():
     fname = "last_names.txt"
     return os.path.join(DATA, fname)
 
+
+def read_word_list(path):
+    """
+    Read a data file and return its stripped, non-empty lines as a tuple.
+    A line that repeats an earlier one is left out, so the first (highest
+    ranked) copy keeps its place and no word can be drawn twice.
+    """
+    with open(path, "r") as f:
+        data = f.readlines()
+    return tuple(dict.fromkeys(j.strip() for j in data if len(j.strip()) > 0))
+
+
+def parse_leagues_divisions(lines):
+    """
+    Turn lines of comma-separated names into a tuple of tuples of title-cased names
+    """
+    return tuple(tuple(k.strip().title() for k in j.split(",")) for j in lines)
+
+
 def get_cities_count(country_code):
-    city_fname = f"{country_code}.txt"
-    city_fpath = os.path.join(GEO, city_fname)
-    if not os.path.exists(city_fpath):
+    if not is_city_country_code(country_code):
         raise CountryCodeError(
             f"Error: could not run get_city_count(): invalid country code {country_code} for cities"
         )
-    with open(city_fpath, "r") as f:
-        data = f.readlines()
-    data = [j.strip() for j in data if len(j.strip()) > 0]
-    return len(data)
+    return get_country_entry(country_code)["cities_count"]
 
 
 def get_states_count(country_code):
-    st_fname = f"{country_code}_states.txt"
-    st_fpath = os.path.join(GEO, st_fname)
-    if not os.path.exists(st_fpath):
-        raise CountrryCodeError(
+    if not is_state_country_code(country_code):
+        raise CountryCodeError(
             f"Error: could not run get_state_count(): invalid country code {country_code} for states"
         )
-    with open(st_fpath, "r") as f:
-        data = f.readlines()
-    data = [j.strip() for j in data if len(j.strip()) > 0]
-    return len(data)
+    return get_country_entry(country_code)["states_count"]
+
+
+def _cities_bucket_sizes(count):
+    index = count // CITIES_BUCKET_DIVISOR
+    return {"cities": count, "bigcities": index, "smalltowns": count - index}
+
+
+def _states_bucket_sizes(count):
+    index = count // STATES_BUCKET_DIVISOR
+    return {"states": count, "bigstates": index, "smallstates": count - index}
+
+
+def get_cities_bucket_sizes(country_code):
+    """
+    Return the number of cities available to each cities generator
+    (cities, bigcities, smalltowns) for a country code
+    """
+    return _cities_bucket_sizes(get_cities_count(country_code))
+
+
+def get_states_bucket_sizes(country_code):
+    """
+    Return the number of states available to each states generator
+    (states, bigstates, smallstates) for a country code
+    """
+    return _states_bucket_sizes(get_states_count(country_code))
+
+
+def all_counts():
+    """
+    Return a dictionary mapping every country code to the number of
+    cities/states available to each geography generator, keyed like the
+    SplortsLeagueGenerator geo parameter. Kinds with no data file are omitted.
+    """
+    counts = {}
+    for country_code, entry in get_manifest()["countries"].items():
+        sizes = {}
+        if entry["cities_file"] is not None:
+            sizes.update(_cities_bucket_sizes(entry["cities_count"]))
+        if entry["states_file"] is not None:
+            sizes.update(_states_bucket_sizes(entry["states_count"]))
+        counts[country_code] = sizes
+    return counts
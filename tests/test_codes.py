@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from team_league_generator.codes import LEAGUE_CODE_PREFIX, decode_league, encode_league
+from team_league_generator.errors import LeagueCodeError
+from team_league_generator.pack import get_data_pack
+from team_league_generator.splortsleague import SplortsLeagueGenerator
+
+
+class LeagueCodeTests(unittest.TestCase):
+    """
+    Test encoding leagues as short codes and decoding them back.
+    """
+
+    def test_round_trip(self):
+        for geo, country_code in [("bigcities", "usa"), ("states", "rus"), ("smalltowns", "fra")]:
+            slg = SplortsLeagueGenerator(geo=geo, country_code=country_code, rng=420)
+            league = slg.generate_league(nleagues=3, ndivisions=2, teams_per_division=4)
+            code = encode_league(slg, league)
+            self.assertTrue(code.startswith(LEAGUE_CODE_PREFIX))
+            decoded = decode_league(code)
+            self.assertEqual(decoded, league)
+            self.assertEqual(decoded.to_dict(), league.to_dict())
+
+    def test_code_is_compact(self):
+        slg = SplortsLeagueGenerator(rng=420)
+        league = slg.generate_league(nleagues=2, ndivisions=2, teams_per_division=4)
+        code = encode_league(slg, league)
+        self.assertLess(len(code), len(str(league.to_dict())) // 4)
+
+    def test_large_round_trip(self):
+        slg = SplortsLeagueGenerator(geo="cities", rng=420)
+        league = slg.generate_league(nleagues=20, ndivisions=20, teams_per_division=10, large=True)
+        self.assertEqual(decode_league(encode_league(slg, league)), league)
+
+    def test_edited_data_files(self):
+        # Lists read from the text files can be encoded while the files match the pack
+        slg = SplortsLeagueGenerator(file_backed=True, rng=420)
+        league = slg.generate_league()
+        code = encode_league(slg, league)
+        self.assertEqual(decode_league(code).to_dict(), league.to_dict())
+
+        # An edited file is read instead of the pack, and its indices mean other names
+        pack = get_data_pack()
+        pack.lookup = lambda fpath: None
+        pack.is_current = lambda fpath: False
+        try:
+            slg = SplortsLeagueGenerator(rng=420)
+            with self.assertRaises(LeagueCodeError):
+                encode_league(slg, slg.generate_league())
+            with self.assertRaises(LeagueCodeError):
+                decode_league(code)
+        finally:
+            del pack.lookup
+            del pack.is_current
+        self.assertEqual(decode_league(code).to_dict(), league.to_dict())
+
+    def test_errors(self):
+        slg = SplortsLeagueGenerator(rng=420)
+        code = encode_league(slg, slg.generate_league())
+
+        with self.assertRaises(LeagueCodeError):
+            decode_league("blah")
+        with self.assertRaises(LeagueCodeError):
+            decode_league(code[:-6])
+        with self.assertRaises(LeagueCodeError):
+            decode_league(code + "AAAA")
+        with self.assertRaises(LeagueCodeError):
+            decode_league(LEAGUE_CODE_PREFIX + "AQID")
+
+        # A league from another generator's word lists
+        other = SplortsLeagueGenerator(country_code="rus", rng=420)
+        with self.assertRaises(LeagueCodeError):
+            encode_league(slg, other.generate_league())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            fpath = os.path.join(tmp, "teams.txt")
+            with open(fpath, "w") as f:
+                f.write("\n".join(f"Team{j}" for j in range(100)))
+            custom = SplortsLeagueGenerator(team_names_file=fpath, rng=420)
+            with self.assertRaises(LeagueCodeError):
+                encode_league(custom, custom.generate_league())
@@ -1,10 +1,16 @@
+import itertools
+import random
 import uuid
 import os
 import unittest
 import tempfile
+import threading
+import time
 import team_league_generator
 from team_league_generator.errors import (
+    BackendError,
     InvalidSizeRequestError,
+    KeywordError,
     NotIterableError,
 )
 from team_league_generator.generics import (
@@ -13,6 +19,7 @@ from team_league_generator.generics import (
     BaseLinearBiasedGenerator,
     LinearBiasedGenerator,
     ReversedLinearBiasedGenerator,
+    GeneratorPool,
 )
 
 
@@ -34,6 +41,47 @@ class GenericsTests(unittest.TestCase):
         with self.assertRaises(NotIterableError):
             i = IterableDataLoader(data)
 
+        # No data and no load_data() implementation
+        i = IterableDataLoader()
+        with self.assertRaises(NotIterableError):
+            i.data
+
+        # Options a generator does not use are ignored, the backend is checked
+        self.assertEqual(len(IterableDataLoader(self.random_data(10), team_names_file="teams.txt")), 10)
+        with self.assertRaises(BackendError):
+            IterableDataLoader(self.random_data(10), backend="numpi")
+
+    def test_lazy_data_loader(self):
+        data = self.random_data(100)
+        calls = []
+
+        class SampleLazyGenerator(IterableDataLoader, UniformGenerator):
+            def load_data(self):
+                calls.append(1)
+                time.sleep(0.01)
+                return data
+
+        g = SampleLazyGenerator()
+        self.assertEqual(len(calls), 0)
+        self.assertEqual(len(g), 100)
+        self.assertEqual(len(calls), 1)
+        g.generate(size=10)
+        self.assertEqual(len(calls), 1)
+
+        # Racing threads load the data exactly once
+        g = SampleLazyGenerator()
+        threads = [threading.Thread(target=g.generate) for j in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 2)
+
+        g = SampleLazyGenerator()
+        self.assertIs(g.warm(), g)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(g.data, data)
+
     def check_generator(self, GenClass):
         nsamples = 100
 
@@ -53,11 +101,25 @@ class GenericsTests(unittest.TestCase):
         with self.assertRaises(InvalidSizeRequestError):
             g.generate(size=nsamples + 1)
 
+    def check_generator_full(self, GenClass):
+        nsamples = 500
+
+        data = self.random_data(nsamples)
+        g = GenClass(data=data)
+
+        # Unique samples of the whole data set are allowed
+        samples = g.generate(size=nsamples)
+        self.assertEqual(sorted(samples), sorted(data))
+
+        samples = g.generate(size=(9 * nsamples) // 10)
+        self.assertEqual(len(set(samples)), (9 * nsamples) // 10)
+
     def test_uniform_generator(self):
         class SampleUniformGenerator(IterableDataLoader, UniformGenerator):
             pass
 
         self.check_generator(SampleUniformGenerator)
+        self.check_generator_full(SampleUniformGenerator)
 
     def test_base_linear_biased_generator(self):
         class SampleBaseLinearBiasedGenerator(
@@ -72,6 +134,7 @@ class GenericsTests(unittest.TestCase):
             pass
 
         self.check_generator(SampleLinearBiasedGenerator)
+        self.check_generator_full(SampleLinearBiasedGenerator)
 
     def test_reversed_linear_biased_generator(self):
         class SampleReversedLinearBiasedGenerator(
@@ -80,6 +143,228 @@ class GenericsTests(unittest.TestCase):
             pass
 
         self.check_generator(SampleReversedLinearBiasedGenerator)
+        self.check_generator_full(SampleReversedLinearBiasedGenerator)
+
+
+class RandomStreamTests(unittest.TestCase):
+    """
+    Test per-instance random streams and the thread-local generator pool.
+    """
+
+    class SampleUniformGenerator(IterableDataLoader, UniformGenerator):
+        pass
+
+    class SampleLinearBiasedGenerator(IterableDataLoader, LinearBiasedGenerator):
+        pass
+
+    def random_data(self, size):
+        return [str(j) for j in range(size)]
+
+    def test_instance_rng(self):
+        for GenClass in (self.SampleUniformGenerator, self.SampleLinearBiasedGenerator):
+            data = self.random_data(1000)
+            g = GenClass(data, rng=420)
+            h = GenClass(data, rng=random.Random(420))
+            random.seed(1)
+            res_g = g.generate(size=10) + g.generate_nonunique(size=10) + g.generate(size=900)
+            random.seed(2)
+            res_h = h.generate(size=10) + h.generate_nonunique(size=10) + h.generate(size=900)
+            self.assertEqual(res_g, res_h)
+
+            g.set_rng(420)
+            self.assertEqual(g.generate(size=10), res_g[:10])
+
+    def test_generator_pool(self):
+        data = self.random_data(1000)
+        pool = GeneratorPool(self.SampleUniformGenerator, data)
+        expected = self.SampleUniformGenerator(data, rng=420).generate(size=20)
+
+        gens = {}
+        results = {}
+
+        def worker(j):
+            gen = pool.get(seed=420)
+            gens[j] = gen
+            results[j] = gen.generate(size=20)
+
+        threads = [threading.Thread(target=worker, args=(j,)) for j in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # One instance per thread, each reproducible from its seed
+        self.assertEqual(len(set(id(g) for g in gens.values())), 4)
+        for j in range(4):
+            self.assertEqual(results[j], expected)
+        self.assertIs(pool.get(), pool.get())
+        self.assertIsNot(pool.get().rng, random)
+
+
+class StreamTests(unittest.TestCase):
+    """
+    Test the streaming iter_generate and stream methods.
+    """
+
+    class SampleUniformGenerator(IterableDataLoader, UniformGenerator):
+        pass
+
+    class SampleLinearBiasedGenerator(IterableDataLoader, LinearBiasedGenerator):
+        pass
+
+    class SampleReversedLinearBiasedGenerator(IterableDataLoader, ReversedLinearBiasedGenerator):
+        pass
+
+    def test_stream_with_replacement(self):
+        data = [str(j) for j in range(100)]
+        for GenClass in (
+            self.SampleUniformGenerator,
+            self.SampleLinearBiasedGenerator,
+            self.SampleReversedLinearBiasedGenerator,
+        ):
+            g = GenClass(data, rng=420)
+            items = list(itertools.islice(g.iter_generate(chunk_size=16), 1000))
+            self.assertEqual(len(items), 1000)
+            self.assertLess(len(set(items)), 1000)
+            for item in items:
+                self.assertIn(item, data)
+
+            chunks = list(itertools.islice(g.stream(chunk_size=16), 5))
+            self.assertEqual([len(chunk) for chunk in chunks], [16] * 5)
+
+        # A bad chunk size is reported right away, not on the first draw
+        for GenClass in (self.SampleUniformGenerator, self.SampleLinearBiasedGenerator):
+            with self.assertRaises(InvalidSizeRequestError):
+                GenClass(data).iter_generate(chunk_size=0)
+            with self.assertRaises(InvalidSizeRequestError):
+                GenClass(data).stream(chunk_size=0)
+
+    def test_stream_unique(self):
+        data = [str(j) for j in range(1000)]
+        for GenClass in (
+            self.SampleUniformGenerator,
+            self.SampleLinearBiasedGenerator,
+            self.SampleReversedLinearBiasedGenerator,
+        ):
+            g = GenClass(data, rng=420)
+            items = list(g.iter_generate(unique=True))
+            self.assertEqual(sorted(items), sorted(data))
+            self.assertNotEqual(items, data)
+
+            chunks = list(GenClass(data, rng=420).stream(chunk_size=300, unique=True))
+            self.assertEqual([len(chunk) for chunk in chunks], [300, 300, 300, 100])
+            self.assertEqual(sum(chunks, []), items)
+
+        # Biased no-repeat streams still draw the favoured end first
+        front = self.SampleLinearBiasedGenerator(data, rng=420).iter_generate(unique=True)
+        back = self.SampleReversedLinearBiasedGenerator(data, rng=420).iter_generate(unique=True)
+        front = [int(j) for j in itertools.islice(front, 100)]
+        back = [int(j) for j in itertools.islice(back, 100)]
+        self.assertLess(sum(front) / 100, 400)
+        self.assertGreater(sum(back) / 100, 600)
+
+
+class DeckModeTests(unittest.TestCase):
+    """
+    Test dealing items that stay unique across calls.
+    """
+
+    class SampleUniformGenerator(IterableDataLoader, UniformGenerator):
+        pass
+
+    def test_deal(self):
+        data = [str(j) for j in range(100)]
+        g = self.SampleUniformGenerator(data, rng=420)
+        dealt = g.deal(size=30) + g.deal(size=30) + g.deal(size=40)
+        self.assertEqual(sorted(dealt), sorted(data))
+        with self.assertRaises(InvalidSizeRequestError):
+            g.deal()
+
+        deck = g.get_deck()
+        deck.reset()
+        self.assertEqual(g.deal(size=100), dealt)
+        deck.reshuffle()
+        self.assertEqual(len(g.deal(size=100)), 100)
+
+        # Replacing the data starts a new deck
+        g.data = data[:50]
+        self.assertEqual(len(g.get_deck()), 50)
+
+
+class StreamingDataTests(unittest.TestCase):
+    """
+    Test sampling from data that cannot be indexed.
+    """
+
+    class SampleUniformGenerator(IterableDataLoader, UniformGenerator):
+        pass
+
+    class SampleLinearBiasedGenerator(IterableDataLoader, LinearBiasedGenerator):
+        pass
+
+    class SampleReversedLinearBiasedGenerator(IterableDataLoader, ReversedLinearBiasedGenerator):
+        pass
+
+    class Source(object):
+        """
+        A re-iterable source with no len() or indexing, that counts its passes
+        """
+
+        def __init__(self, n):
+            self.n = n
+            self.passes = 0
+
+        def __iter__(self):
+            self.passes += 1
+            return (str(j) for j in range(self.n))
+
+    def test_uniform_stream(self):
+        source = self.Source(100)
+        g = self.SampleUniformGenerator(source, rng=420)
+        self.assertTrue(g.is_streaming())
+        res = g.generate(size=100)
+        self.assertEqual(sorted(res), sorted(str(j) for j in range(100)))
+        self.assertEqual(len(g.generate_nonunique(size=500)), 500)
+        self.assertEqual(source.passes, 2)
+
+        with self.assertRaises(InvalidSizeRequestError):
+            g.generate(size=101)
+        with self.assertRaises(NotIterableError):
+            g.generate_indices(size=1)
+        with self.assertRaises(NotIterableError):
+            g.deal()
+
+        # A one-shot iterator can be sampled once
+        g = self.SampleUniformGenerator((str(j) for j in range(10)), rng=420)
+        self.assertEqual(len(g.generate(size=5)), 5)
+        with self.assertRaises(InvalidSizeRequestError):
+            g.generate(size=5)
+
+    def test_linear_biased_stream(self):
+        source = self.Source(5)
+        g = self.SampleReversedLinearBiasedGenerator(source, rng=420)
+        samples = [s for j in range(4000) for s in g.generate_nonunique(size=5)]
+        self.assertAlmostEqual(samples.count("4") / len(samples), 5 / 15, delta=0.02)
+        self.assertAlmostEqual(samples.count("0") / len(samples), 1 / 15, delta=0.02)
+        self.assertEqual(sorted(g.generate(size=5)), ["0", "1", "2", "3", "4"])
+
+        # Front bias needs to know where the stream ends
+        g = self.SampleLinearBiasedGenerator(source)
+        with self.assertRaises(KeywordError):
+            g.generate(size=2)
+        g = self.SampleLinearBiasedGenerator(source, rng=420, length_hint=5)
+        firsts = [g.generate(size=2)[0] for j in range(10000)]
+        self.assertAlmostEqual(firsts.count("0") / len(firsts), 5 / 15, delta=0.02)
+        self.assertEqual(len(list(itertools.islice(g.iter_generate(chunk_size=3), 10))), 10)
+
+        # A stream longer than length_hint is an error, not a silently short sample
+        g = self.SampleLinearBiasedGenerator(self.Source(8), rng=420, length_hint=5)
+        with self.assertRaises(KeywordError):
+            g.generate(size=2)
+        with self.assertRaises(KeywordError):
+            next(g.iter_generate(chunk_size=3))
+        with self.assertRaises(KeywordError):
+            self.SampleLinearBiasedGenerator(source).iter_generate()
 
 
 class BiasTests(unittest.TestCase):
@@ -157,3 +442,20 @@ class BiasTests(unittest.TestCase):
         revpct_blue = self.get_pct_samples("blue", revsamples)
         self.assertLess(revpct_blue, 0.08)
         self.assertGreater(revpct_blue, 0.04)
+
+    def test_alias_table_invalidation(self):
+        class SampleLinearBiasedGenerator(IterableDataLoader, LinearBiasedGenerator):
+            pass
+
+        g = SampleLinearBiasedGenerator(data=self.get_data())
+        table = g.get_alias_table()
+        self.assertIs(table, g.get_alias_table())
+        self.assertEqual(len(table), 5)
+
+        # Replacing the data must rebuild the table
+        g.data = g.data[:2]
+        table2 = g.get_alias_table()
+        self.assertIsNot(table, table2)
+        self.assertEqual(len(table2), 2)
+        for j in range(100):
+            self.assertIn(g.generate()[0], ["blue", "red"])
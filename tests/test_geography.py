@@ -1,7 +1,7 @@
 import random
 import unittest
 from team_league_generator.utils import get_city_country_codes, get_state_country_codes
-from team_league_generator.errors import CountryCodeError
+from team_league_generator.errors import CountryCodeError, GeographyError
 from team_league_generator.geography import (
     StatesGeneratorBase,
     StatesGenerator,
@@ -71,11 +71,16 @@ class TestGeography(unittest.TestCase):
 
         random.seed(420)
         res = cg.generate(size=10)
-        self.assertIn("Scranton", res)
+        self.assertIn("Appleton", res)
 
         random.seed(420)
         res2 = cg.generate_nonunique(size=10)
-        self.assertIn("Danbury", res2)
+        self.assertIn("Clemson", res2)
+
+        # Names that repeat in the file (one Springfield per state) are loaded once
+        self.assertEqual(len(cg.data), len(set(cg.data)))
+        self.assertEqual(cg.data.count("Springfield"), 1)
+        self.assertEqual(len(set(cg.generate(size=1000))), 1000)
 
     def test_cities_generator_errors(self):
         with self.assertRaises(CountryCodeError):
@@ -86,11 +91,11 @@ class TestGeography(unittest.TestCase):
 
         random.seed(420)
         res = cg.generate(size=10)
-        self.assertIn("Cold Spring Harbor", res)
+        self.assertIn("Machiasport", res)
 
         random.seed(420)
         res2 = cg.generate_nonunique(size=10)
-        self.assertIn("Cold Spring Harbor", res2)
+        self.assertIn("Machiasport", res2)
 
     def test_small_towns_generator_errors(self):
         with self.assertRaises(CountryCodeError):
@@ -101,11 +106,18 @@ class TestGeography(unittest.TestCase):
 
         random.seed(420)
         res = cg.generate_nonunique(size=10)
-        self.assertIn("Anchorage", res)
+        self.assertIn("Kendall", res)
 
         random.seed(420)
         res2 = cg.generate(size=10)
-        self.assertIn("Anchorage", res2)
+        self.assertIn("Kendall", res2)
+
+        # Biased draws without replacement never repeat a name either
+        self.assertEqual(len(cg.data), len(set(cg.data)))
+        self.assertEqual(len(set(cg.generate(size=1000))), 1000)
+        self.assertEqual(len(set(cg.generate(size=len(cg.data)))), len(cg.data))
+        sg = SmallTownsGenerator(country_code="usa", rng=420)
+        self.assertEqual(len(set(sg.generate(size=1000))), 1000)
 
     def test_big_cities_generator_errors(self):
         with self.assertRaises(CountryCodeError):
@@ -138,3 +150,11 @@ class TestGeography(unittest.TestCase):
                 StatesGenerator(country_code=country_code)
                 BigStatesGenerator(country_code=country_code)
                 SmallStatesGenerator(country_code=country_code)
+
+    def test_all_states(self):
+        sg = StatesGenerator(country_code="usa")
+        res = sg.generate(size=51)
+        self.assertEqual(len(set(res)), 51)
+
+        with self.assertRaises(GeographyError):
+            sg.generate(size=52)
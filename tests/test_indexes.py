@@ -0,0 +1,39 @@
+import random
+import unittest
+from team_league_generator.indexes import PrefixIndex
+from team_league_generator.players import LastNameGenerator
+
+
+class TestPrefixIndex(unittest.TestCase):
+    data = ["Alpha", "beta", "Bravo", "Charlie", "alto", "Delta"]
+
+    def test_prefix_index(self):
+        idx = PrefixIndex(self.data)
+        self.assertEqual(len(idx), 4)
+        self.assertEqual(idx.prefixes(), ["a", "b", "c", "d"])
+        self.assertEqual(idx.indices("A"), (0, 4))
+        self.assertEqual(idx.indices("Bob"), (1, 2))
+        self.assertEqual(idx.count("z"), 0)
+        self.assertIn("charlie", idx)
+        self.assertNotIn("Zulu", idx)
+
+        rng = random.Random(420)
+        for j in range(100):
+            self.assertIn(idx.sample("B", rng), (1, 2))
+        self.assertIsNone(idx.sample("Z", rng))
+
+    def test_prefix_index_length(self):
+        idx = PrefixIndex(self.data, length=2)
+        self.assertEqual(idx.indices("al"), (0, 4))
+        self.assertEqual(idx.indices("Be"), (1,))
+
+    def test_generator_prefix_index(self):
+        lng = LastNameGenerator()
+        idx = lng.get_prefix_index()
+        self.assertIs(idx, lng.get_prefix_index())
+        for i in idx.indices("M"):
+            self.assertEqual(lng.data[i][0], "M")
+
+        # Replacing the data rebuilds the index
+        lng.data = ["Smith", "Jones"]
+        self.assertEqual(lng.get_prefix_index().indices("s"), (0,))
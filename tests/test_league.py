@@ -0,0 +1,87 @@
+import sys
+import unittest
+from team_league_generator.errors import GeographyError
+from team_league_generator.league import League, TeamList
+from team_league_generator.splortsleague import SplortsLeagueGenerator
+
+
+class LeagueTests(unittest.TestCase):
+    """
+    Test the compact league model.
+    """
+
+    def make_league(self):
+        locations = ["Aville", "Bton", "Cburg", "Dfield"]
+        nicknames = ["Ants", "Bees"]
+        return League(["East", "West"], ["North", "South"], 1, locations, nicknames, [0, 1, 2, 3], [1, 0, 1, 0])
+
+    def test_league_accessors(self):
+        league = self.make_league()
+        self.assertEqual(league.leagues, ("East", "West"))
+        self.assertEqual(league.divisions, ("North", "South"))
+        self.assertEqual(league.nteams, 4)
+        self.assertEqual(len(league), 2)
+        self.assertEqual(len(list(league)), len(league))
+        self.assertEqual(list(league.teams), ["Aville Bees", "Bton Ants", "Cburg Bees", "Dfield Ants"])
+        self.assertEqual(league.division("West", "North"), ["Cburg Bees"])
+        self.assertEqual(league.team("West", "South", 0), "Dfield Ants")
+        self.assertEqual(league.teams[1:3], ["Bton Ants", "Cburg Bees"])
+        self.assertIsInstance(league.teams[1:3], TeamList)
+        self.assertIn("East", league)
+        self.assertEqual(league["East"], {"North": ["Aville Bees"], "South": ["Bton Ants"]})
+
+        with self.assertRaises(KeyError):
+            league.division("North", "East")
+        with self.assertRaises(IndexError):
+            league.team("East", "North", 1)
+        with self.assertRaises(IndexError):
+            league.teams[4]
+        with self.assertRaises(ValueError):
+            League(["East"], ["North"], 2, [], [], [0], [0])
+
+    def test_league_to_dict(self):
+        league = self.make_league()
+        self.assertEqual(
+            league.to_dict(),
+            {
+                "East": {"North": ["Aville Bees"], "South": ["Bton Ants"]},
+                "West": {"North": ["Cburg Bees"], "South": ["Dfield Ants"]},
+            },
+        )
+
+    def test_generate_league(self):
+        slg = SplortsLeagueGenerator(rng=420)
+        league = slg.generate_league(nleagues=3, ndivisions=4, teams_per_division=5)
+        self.assertEqual(league.nteams, 60)
+        self.assertEqual(league, SplortsLeagueGenerator(rng=420).generate_league(3, 4, 5))
+
+        res = league.to_dict()
+        self.assertEqual(sorted(res.keys()), list(league.leagues))
+        self.assertEqual(
+            SplortsLeagueGenerator.extract_leagues_divisions_teams(league),
+            SplortsLeagueGenerator.extract_leagues_divisions_teams(res),
+        )
+        self.assertEqual(len(set(league.location_indices)), 60)
+        self.assertEqual(len(set(league.nickname_indices)), 60)
+
+        # Word lists are shared, not copied
+        self.assertIs(league.locations, slg.geo.data)
+        self.assertIs(league.nicknames, slg.team.data)
+
+    def test_generate_league_large(self):
+        slg = SplortsLeagueGenerator(geo="cities", rng=420)
+        league = slg.generate_league(nleagues=40, ndivisions=25, teams_per_division=10, large=True)
+        self.assertEqual(league.nteams, 10000)
+        self.assertEqual(len(set(league.location_indices)), 10000)
+        # Two 4-byte columns, however long the names are
+        self.assertLess(sys.getsizeof(league.location_indices) + sys.getsizeof(league.nickname_indices), 10000 * 8 + 1024)
+
+    def test_generate_league_size_errors(self):
+        # Too many teams for the locations fails the same way as generate()
+        slg = SplortsLeagueGenerator(geo="cities", rng=420)
+        with self.assertRaises(GeographyError):
+            slg.generate(nleagues=4, ndivisions=4, teams_per_division=1000)
+        with self.assertRaises(GeographyError):
+            slg.generate_league(nleagues=4, ndivisions=4, teams_per_division=1000)
+        with self.assertRaises(GeographyError):
+            SplortsLeagueGenerator(geo="states").generate_league(nleagues=4, ndivisions=4, teams_per_division=10)
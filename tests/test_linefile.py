@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+from team_league_generator import linefile
+from team_league_generator.generics import (
+    IterableDataLoader,
+    LinearBiasedGenerator,
+)
+from team_league_generator.linefile import (
+    FileBackedList,
+    LINE_INDEX_SUFFIX,
+    open_line_file,
+)
+from team_league_generator.registry import get_word_list
+from team_league_generator.samplers import LinearSampler
+from team_league_generator.teams import TeamNameGenerator
+from team_league_generator.utils import read_word_list
+
+
+class LineFileTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.tmp = cls.tmpdir.name
+
+    def write(self, name, lines):
+        fpath = os.path.join(self.tmp, name)
+        with open(fpath, "w") as f:
+            f.write("\n".join(lines))
+        return fpath
+
+    def test_line_file(self):
+        fpath = self.write("words.txt", ["  Alpha ", "", "Beta", "   ", "Gämma", "Alpha", "Delta", " Beta"])
+        words = open_line_file(fpath)
+        self.assertIsInstance(words, FileBackedList)
+        self.assertTrue(os.path.exists(fpath + LINE_INDEX_SUFFIX))
+        self.assertEqual(words, read_word_list(fpath))
+        self.assertEqual(words[-1], "Delta")
+        self.assertEqual(words[1:3], ["Beta", "Gämma"])
+        self.assertIsInstance(words[1:3], FileBackedList)
+        with self.assertRaises(IndexError):
+            words[4]
+
+    def test_unicode_whitespace(self):
+        # str.strip() trims these, bytes.strip() does not
+        fpath = self.write("spaces.txt", ["\u00a0Alpha\u00a0", "\u00a0", "\x1cBeta\x1f", "\u3000", "Gamma"])
+        words = open_line_file(fpath)
+        self.assertEqual(words, read_word_list(fpath))
+        self.assertEqual(list(words), ["Alpha", "Beta", "Gamma"])
+
+    def test_unwritable_line_index(self):
+        fpath = self.write("readonly.txt", ["Alpha", "", "Beta"])
+
+        def build_line_index(path, index_path=None):
+            raise PermissionError(f"read-only: {index_path}")
+
+        original = linefile.build_line_index
+        linefile.build_line_index = build_line_index
+        try:
+            words = open_line_file(fpath)
+        finally:
+            linefile.build_line_index = original
+        self.assertFalse(os.path.exists(fpath + LINE_INDEX_SUFFIX))
+        self.assertEqual(words, ["Alpha", "Beta"])
+        self.assertEqual(words[1:], ["Beta"])
+
+    def test_line_index_invalidation(self):
+        fpath = self.write("changing.txt", ["Alpha", "Beta"])
+        self.assertEqual(len(open_line_file(fpath)), 2)
+
+        # Same size, new mtime
+        time.sleep(0.01)
+        self.write("changing.txt", ["Gamma", "Zeta"])
+        self.assertEqual(open_line_file(fpath), ["Gamma", "Zeta"])
+
+        # A corrupt index is rebuilt
+        with open(fpath + LINE_INDEX_SUFFIX, "wb") as f:
+            f.write(b"garbage")
+        self.assertEqual(open_line_file(fpath), ["Gamma", "Zeta"])
+
+    def test_file_backed_generators(self):
+        lines = [f"Team{j}" for j in range(1000)]
+        fpath = self.write("teams.txt", lines)
+
+        tg = TeamNameGenerator(team_names_file=fpath, file_backed=True, rng=420)
+        self.assertIsInstance(tg.data, FileBackedList)
+        self.assertIs(tg.data, get_word_list(fpath, file_backed=True))
+        self.assertEqual(sorted(tg.generate(size=1000)), sorted(lines))
+        self.assertEqual(len(tg.deal(size=10)), 10)
+
+        class FileLinearBiasedGenerator(IterableDataLoader, LinearBiasedGenerator):
+            def load_data(self):
+                return get_word_list(fpath, file_backed=self.file_backed)
+
+        g = FileLinearBiasedGenerator(file_backed=True, rng=420)
+        self.assertIsInstance(g.get_sampler(), LinearSampler)
+        samples = g.generate_nonunique(size=1000)
+        front = sum(1 for s in samples if int(s[4:]) < 500)
+        self.assertGreater(front, 650)
+        self.assertEqual(len(set(g.generate(size=100))), 100)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.tmpdir
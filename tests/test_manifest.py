@@ -0,0 +1,46 @@
+import json
+import unittest
+from team_league_generator.manifest import (
+    MANIFEST_FILE,
+    build_manifest,
+    get_manifest,
+    get_country_entry,
+)
+from team_league_generator.utils import (
+    is_city_country_code,
+    is_state_country_code,
+)
+
+
+class TestManifest(unittest.TestCase):
+    def test_manifest_up_to_date(self):
+        # The shipped manifest must match the data files
+        with open(MANIFEST_FILE, "r") as f:
+            shipped = json.load(f)
+        self.assertEqual(shipped, build_manifest())
+
+    def test_manifest_cached(self):
+        self.assertIs(get_manifest(), get_manifest())
+
+    def test_country_entry(self):
+        entry = get_country_entry("usa")
+        self.assertEqual(entry["name"], "United States")
+        self.assertEqual(entry["cities_file"], "usa.txt")
+        self.assertEqual(entry["states_file"], "usa_states.txt")
+        self.assertEqual(entry["cities_count"], 10821)
+        self.assertEqual(entry["states_count"], 51)
+
+        # Per-state US city lists have no states file
+        entry = get_country_entry("usatx")
+        self.assertEqual(entry["cities_file"], "usatx.txt")
+        self.assertIsNone(entry["states_file"])
+
+        self.assertIsNone(get_country_entry("narnia"))
+
+    def test_is_country_code(self):
+        self.assertTrue(is_city_country_code("usa"))
+        self.assertTrue(is_city_country_code("usatx"))
+        self.assertTrue(is_state_country_code("usa"))
+        self.assertFalse(is_state_country_code("usatx"))
+        self.assertFalse(is_city_country_code("narnia"))
+        self.assertFalse(is_state_country_code("narnia"))
@@ -0,0 +1,143 @@
+import random
+import subprocess
+import sys
+import unittest
+from team_league_generator import numpy_backend
+from team_league_generator.errors import BackendError
+from team_league_generator.generics import (
+    IterableDataLoader,
+    UniformGenerator,
+    LinearBiasedGenerator,
+    ReversedLinearBiasedGenerator,
+)
+from team_league_generator.numpy_backend import numpy_available
+from team_league_generator.players import NameGenerator
+from team_league_generator.splortsleague import SplortsLeagueGenerator
+
+
+class SampleUniformGenerator(IterableDataLoader, UniformGenerator):
+    pass
+
+
+class SampleLinearBiasedGenerator(IterableDataLoader, LinearBiasedGenerator):
+    pass
+
+
+class SampleRevLinearBiasedGenerator(IterableDataLoader, ReversedLinearBiasedGenerator):
+    pass
+
+
+class TestBackendSelection(unittest.TestCase):
+    def test_invalid_backend(self):
+        with self.assertRaises(BackendError):
+            SampleUniformGenerator(["a", "b"], backend="fortran")
+
+    def test_python_backend_skips_numpy(self):
+        # Importing the package and drawing with the Python backend never imports NumPy
+        code = (
+            "import sys\n"
+            "from team_league_generator.splortsleague import SplortsLeagueGenerator\n"
+            "from team_league_generator.players import NameGenerator\n"
+            "SplortsLeagueGenerator().generate()\n"
+            "NameGenerator().generate_rosters(2, 300)\n"
+            "print('numpy' in sys.modules)\n"
+        )
+        res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(res.stdout.strip(), "False")
+
+    @unittest.skipIf(numpy_available(), "NumPy is installed")
+    def test_numpy_missing(self):
+        with self.assertRaises(BackendError):
+            SampleUniformGenerator(["a", "b"], backend="numpy")
+
+        # auto falls back to the Python samplers
+        g = SampleUniformGenerator([str(j) for j in range(1000)], backend="auto")
+        self.assertEqual(len(set(g.generate(size=1000))), 1000)
+
+
+@unittest.skipUnless(numpy_available(), "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+    def get_data(self):
+        return ["blue", "red", "green", "yellow", "purple"]
+
+    def get_pct_samples(self, color, samples):
+        count = sum([1 for s in samples if s == color])
+        return count / len(samples)
+
+    def test_uniform(self):
+        data = [str(j) for j in range(1000)]
+        g = SampleUniformGenerator(data, rng=420, backend="numpy")
+        res = g.generate(size=1000)
+        self.assertEqual(sorted(res), sorted(data))
+        res = g.generate_nonunique(size=500)
+        self.assertEqual(len(res), 500)
+        for r in res:
+            self.assertIn(r, data)
+
+        # Reproducible from the Python seed
+        g.set_rng(420)
+        h = SampleUniformGenerator(data, rng=420, backend="numpy")
+        self.assertEqual(g.generate(size=100), h.generate(size=100))
+
+        # Every reseeding of the module-level generator reseeds the NumPy draws
+        g = SampleUniformGenerator(data, backend="numpy")
+        random.seed(420)
+        first = g.generate_nonunique(size=100)
+        self.assertNotEqual(g.generate_nonunique(size=100), first)
+        random.seed(420)
+        self.assertEqual(g.generate_nonunique(size=100), first)
+
+    def test_reproducible(self):
+        data = [str(j) for j in range(1000)]
+        g = SampleLinearBiasedGenerator(data, rng=420, backend="numpy")
+        h = SampleLinearBiasedGenerator(data, rng=420, backend="numpy")
+        self.assertEqual(g.generate(size=100), h.generate(size=100))
+        self.assertEqual(g.generate_nonunique(size=100), h.generate_nonunique(size=100))
+
+    def test_linear_bias(self):
+        g = SampleLinearBiasedGenerator(self.get_data(), rng=420, backend="numpy")
+        samples = [s for j in range(4000) for s in g.generate_nonunique(size=5)]
+        self.assertAlmostEqual(self.get_pct_samples("blue", samples), 5 / 15, delta=0.02)
+        self.assertAlmostEqual(self.get_pct_samples("purple", samples), 1 / 15, delta=0.02)
+
+        firsts = [g.generate(size=2)[0] for j in range(10000)]
+        self.assertAlmostEqual(self.get_pct_samples("blue", firsts), 5 / 15, delta=0.02)
+
+        h = SampleRevLinearBiasedGenerator(self.get_data(), rng=420, backend="numpy")
+        samples = [s for j in range(4000) for s in h.generate_nonunique(size=5)]
+        self.assertAlmostEqual(self.get_pct_samples("purple", samples), 5 / 15, delta=0.02)
+
+        ranking = h.generate(size=5)
+        self.assertEqual(sorted(ranking), sorted(self.get_data()))
+
+    def test_linear_indices(self):
+        np_rng = numpy_backend.make_rng(random.Random(420))
+        samples = numpy_backend.linear_indices(np_rng, 5, 20000).tolist()
+        for i, w in enumerate([5, 4, 3, 2, 1]):
+            self.assertAlmostEqual(samples.count(i) / len(samples), w / 15, delta=0.02)
+
+        # Stays in range and keeps its bias for lists too big for int64 triangular numbers
+        for n in [2 ** 31, 2 ** 33, 2 ** 62]:
+            samples = numpy_backend.linear_indices(np_rng, n, 10000)
+            self.assertTrue(((samples >= 0) & (samples < n)).all())
+            self.assertAlmostEqual(float((samples < n // 2).mean()), 0.75, delta=0.02)
+
+    def test_name_generator(self):
+        ng = NameGenerator(rng=420, backend="numpy")
+        names = ng.generate(size=1000, alliteration_rate=0.5)
+        self.assertEqual(len(names), 1000)
+        same = sum(1 for name in names if name[0] == name.split(" ")[-1][0])
+        self.assertGreater(same, 400)
+
+    def test_generate_rosters(self):
+        ng = NameGenerator(rng=420, backend="numpy")
+        rosters = ng.generate_rosters(20, 30)
+        self.assertEqual(len(rosters), 20)
+        self.assertEqual(len(rosters[-1]), 30)
+        self.assertEqual(NameGenerator(rng=420, backend="numpy").generate_rosters(20, 30), rosters)
+
+    def test_splorts_league(self):
+        slg = SplortsLeagueGenerator(rng=420, backend="numpy")
+        res = slg.generate(nleagues=3, ndivisions=3, teams_per_division=4)
+        _, _, teams = SplortsLeagueGenerator.extract_leagues_divisions_teams(res)
+        self.assertEqual(len(teams), 36)
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from team_league_generator.errors import DataPackError
+from team_league_generator.pack import (
+    DataPack,
+    PackedList,
+    compile_pack,
+    file_crc,
+    get_data_pack,
+    get_pack_sources,
+)
+from team_league_generator.registry import WordListRegistry
+from team_league_generator.utils import (
+    get_cities_data_file_from_country_code,
+    read_word_list,
+)
+from team_league_generator.geography import BigCitiesGenerator
+
+
+class TestPack(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.tmp = cls.tmpdir.name
+
+    def test_pack_up_to_date(self):
+        # The shipped pack must match the text data files
+        pack = get_data_pack()
+        self.assertIsNotNone(pack)
+        for name, source in get_pack_sources():
+            self.assertIn(name, pack)
+            self.assertEqual(pack.source_size(name), os.path.getsize(source))
+            self.assertEqual(pack.source_crc(name), file_crc(source))
+            self.assertTrue(pack.is_current(source))
+            self.assertEqual(pack.get(name), read_word_list(source))
+
+        fpath = os.path.join(self.tmp, "rebuilt.pack")
+        compile_pack(fpath)
+        self.assertEqual(DataPack(fpath).data_version, pack.data_version)
+
+    def test_packed_list(self):
+        pack = get_data_pack()
+        usa = pack.get("geography/usa.txt")
+        self.assertIsInstance(usa, PackedList)
+        words = read_word_list(get_cities_data_file_from_country_code("usa"))
+        self.assertEqual(len(usa), len(words))
+        self.assertEqual(usa[0], words[0])
+        self.assertEqual(usa[-1], words[-1])
+        self.assertEqual(usa[100:110], words[100:110])
+        self.assertIsInstance(usa[100:110], PackedList)
+        self.assertEqual(usa[10:1:-2], list(words[10:1:-2]))
+        self.assertEqual(len(usa[5:2]), 0)
+        with self.assertRaises(IndexError):
+            usa[len(usa)]
+
+        with self.assertRaises(DataPackError):
+            pack.get("geography/narnia.txt")
+
+    def test_registry_uses_pack(self):
+        reg = WordListRegistry()
+        data = reg.get(get_cities_data_file_from_country_code("usa"))
+        self.assertIsInstance(data, PackedList)
+
+        # Sliced generator data stays a view into the pack
+        bcg = BigCitiesGenerator(country_code="usa")
+        self.assertIsInstance(bcg.data, PackedList)
+
+        # Files outside the data directory are read as text
+        fpath = os.path.join(self.tmp, "teams.txt")
+        with open(fpath, "w") as f:
+            f.write("Ones\nTwos")
+        self.assertEqual(reg.get(fpath), ("Ones", "Twos"))
+
+    def test_pack_stale_source(self):
+        # Loading only checks the size; the CRC catches an edit that keeps it
+        data_dir = os.path.join(self.tmp, "stale")
+        os.makedirs(os.path.join(data_dir, "geography"))
+        fpath = os.path.join(data_dir, "teams.txt")
+        with open(fpath, "w") as f:
+            f.write("Ones\nTwos")
+        with open(os.path.join(data_dir, "geography", "_ABBR_KEY"), "w") as f:
+            f.write("USA United States")
+        pack_file = os.path.join(self.tmp, "stale.pack")
+        compile_pack(pack_file, data_dir=data_dir)
+
+        pack = DataPack(pack_file, data_dir=data_dir)
+        self.assertEqual(pack.lookup(fpath), ("Ones", "Twos"))
+        self.assertTrue(pack.is_current(fpath))
+        with open(fpath, "w") as f:
+            f.write("Ones\nTows")
+        self.assertFalse(pack.is_current(fpath))
+        with open(fpath, "w") as f:
+            f.write("Ones\nTwos\nThrees")
+        self.assertIsNone(pack.lookup(fpath))
+        self.assertFalse(pack.is_current(fpath))
+        self.assertIsNone(pack.lookup(os.path.join(self.tmp, "teams.txt")))
+        self.assertFalse(pack.is_current(os.path.join(self.tmp, "teams.txt")))
+
+    def test_pack_errors(self):
+        fpath = os.path.join(self.tmp, "bad.pack")
+        with open(fpath, "wb") as f:
+            f.write(b"\x00" * 64)
+        with self.assertRaises(DataPackError):
+            DataPack(fpath)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.tmpdir
@@ -1,13 +1,16 @@
+import itertools
 import os
 import random
 import tempfile
 import unittest
+from team_league_generator.errors import InvalidSizeRequestError
 from team_league_generator.players import (
     FirstNameGeneratorBase,
     FirstNameGenerator,
     LastNameGeneratorBase,
     LastNameGenerator,
     NameGenerator,
+    UniqueNameSampler,
 )
 
 
@@ -43,7 +46,7 @@ class TestPlayers(unittest.TestCase):
         fng = FirstNameGenerator()
         random.seed(420)
         res = fng.generate(size=4)
-        self.assertIn("Parker", res)
+        self.assertIn("Augusto", res)
 
     def test_last_name_generator(self):
         fng = LastNameGenerator()
@@ -57,6 +60,19 @@ class TestPlayers(unittest.TestCase):
         res = ng.generate(size=4)
         self.assertIn("Parker Pangreaser", res)
 
+    def test_name_generator_rng(self):
+        ng1 = NameGenerator(rng=420)
+        ng2 = NameGenerator(rng=420)
+        self.assertIs(ng1.fng.rng, ng1.rng)
+        self.assertIs(ng1.lng.rng, ng1.rng)
+        self.assertEqual(ng1.generate(size=20), ng2.generate(size=20))
+
+        # A per-call rng replays the names and leaves the instance's stream alone
+        state = ng1.rng.getstate()
+        res = ng1.generate(size=20, alliteration_rate=0.5, rng=7)
+        self.assertEqual(ng2.generate(size=20, alliteration_rate=0.5, rng=random.Random(7)), res)
+        self.assertEqual(ng1.rng.getstate(), state)
+
     def test_first_name_generator_data_file(self):
         fnames = self.fake_names
         fnfile = os.path.join(self.tmp, 'first_names.txt')
@@ -93,9 +109,121 @@ class TestPlayers(unittest.TestCase):
         ng = NameGenerator(first_names_file=fnfile, last_names_file=lnfile)
         random.seed(420)
         res = ng.generate(size=4)
-        self.assertIn('Zxcvb Asdf', res)
+        self.assertIn('Asdf Asdf', res)
         self.assertIn('Rtyu Rtyu', res)
 
+    def test_generate_rosters(self):
+        ng = NameGenerator(rng=420)
+        rosters = ng.generate_rosters(30, 25)
+        self.assertEqual(len(rosters), 30)
+        for roster in rosters:
+            self.assertEqual(len(roster), 25)
+
+        ng2 = NameGenerator(rng=420)
+        self.assertEqual(ng2.generate_rosters(30, 25), rosters)
+
+        self.assertEqual(ng.generate_rosters(0, 25), [])
+        with self.assertRaises(InvalidSizeRequestError):
+            ng.generate_rosters(3, 0)
+
+    def test_generate_rosters_data_file(self):
+        fnfile = os.path.join(self.tmp, 'roster_names.txt')
+        with open(fnfile, 'w') as f:
+            f.write("\n".join(self.fake_names))
+
+        ng = NameGenerator(first_names_file=fnfile, last_names_file=fnfile, rng=420)
+        rosters = ng.generate_rosters(4, 10, alliteration_rate=1.0)
+        for roster in rosters:
+            for name in roster:
+                first, last = name.split(" ")
+                self.assertEqual(first, last)
+
+        rosters = ng.generate_rosters(4, 10, alliteration_rate=0.0)
+        for roster in rosters:
+            for name in roster:
+                first, last = name.split(" ")
+                self.assertIn(first, self.fake_names)
+                self.assertIn(last, self.fake_names)
+
+    def test_unique_name_sampler(self):
+        fnfile = os.path.join(self.tmp, 'unique_names.txt')
+        with open(fnfile, 'w') as f:
+            f.write("\n".join(self.fake_names))
+
+        ng = NameGenerator(first_names_file=fnfile, last_names_file=fnfile, rng=420)
+        sampler = ng.unique_sampler()
+        self.assertEqual(len(sampler), 49)
+
+        names = sampler.generate(size=20)
+        seed, cursor = sampler.state()
+        self.assertEqual(cursor, 20)
+
+        # A new sampler resumes where the first one stopped
+        resumed = ng.unique_sampler(seed=seed, cursor=cursor)
+        rest = resumed.generate(size=29)
+        self.assertEqual(rest, sampler.generate(size=29))
+
+        names += rest
+        self.assertEqual(len(set(names)), 49)
+        self.assertEqual(len(resumed), 0)
+        with self.assertRaises(InvalidSizeRequestError):
+            resumed.generate()
+
+    def test_name_generator_stream(self):
+        fnfile = os.path.join(self.tmp, 'stream_names.txt')
+        with open(fnfile, 'w') as f:
+            f.write("\n".join(self.fake_names))
+
+        ng = NameGenerator(first_names_file=fnfile, last_names_file=fnfile, rng=420)
+        names = list(itertools.islice(ng.iter_generate(chunk_size=10), 100))
+        self.assertEqual(len(names), 100)
+        self.assertLess(len(set(names)), 100)
+
+        # No-repeat streams end once every first x last pair is used
+        names = list(ng.iter_generate(chunk_size=10, unique=True))
+        self.assertEqual(len(names), 49)
+        self.assertEqual(len(set(names)), 49)
+        chunks = list(ng.stream(chunk_size=20, unique=True))
+        self.assertEqual([len(chunk) for chunk in chunks], [20, 20, 9])
+
+    def test_unique_name_sampler_default_lists(self):
+        ng = NameGenerator()
+        sampler = ng.unique_sampler(seed=420)
+        self.assertEqual(len(sampler), len(ng.fng) * len(ng.lng))
+        names = sampler.generate(size=5000)
+        self.assertEqual(len(set(names)), 5000)
+        self.assertEqual(names[:10], ng.unique_sampler(seed=420).generate(size=10))
+
+        with self.assertRaises(InvalidSizeRequestError):
+            UniqueNameSampler(ng.fng, ng.lng, 420, cursor=-1)
+
+    def test_name_generator_alliteration(self):
+        # Every fake name has a different initial, so an alliterative
+        # last name must be the same as the first name
+        fnfile = os.path.join(self.tmp, 'alliteration_names.txt')
+        with open(fnfile, 'w') as f:
+            f.write("\n".join(self.fake_names))
+
+        ng = NameGenerator(first_names_file=fnfile, last_names_file=fnfile, rng=420)
+        names = ng.generate(size=50, alliteration_rate=1.0)
+        for name in names:
+            first, last = name.split(" ")
+            self.assertEqual(first, last)
+
+    def test_name_generator_alliteration_no_match(self):
+        # No last name starts with the first name's initial
+        fnfile = os.path.join(self.tmp, 'first_names_x.txt')
+        with open(fnfile, 'w') as f:
+            f.write("Xavier")
+        lnfile = os.path.join(self.tmp, 'last_names_x.txt')
+        with open(lnfile, 'w') as f:
+            f.write("\n".join(self.fake_names))
+
+        ng = NameGenerator(first_names_file=fnfile, last_names_file=lnfile, rng=420)
+        names = ng.generate(size=10, alliteration_rate=1.0)
+        for name in names:
+            self.assertIn(name.split(" ", 1)[1], self.fake_names)
+
     @classmethod
     def tearDownClass(cls):
         del cls.tmpdir
@@ -0,0 +1,137 @@
+from itertools import islice
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from team_league_generator.errors import GeographyError
+from team_league_generator.geography import (
+    CitiesGenerator,
+    StatesGenerator,
+    PopulationWeightedCitiesGenerator,
+    PopulationWeightedStatesGenerator,
+)
+from team_league_generator.population import (
+    build_alias_tables,
+    get_alias_file,
+    get_population_table,
+    read_alias_table,
+    write_alias_table,
+)
+from team_league_generator.samplers import AliasTable
+
+
+class PopulationTests(unittest.TestCase):
+    """
+    Test population-weighted geography generators and alias table files.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.ncities = len(CitiesGenerator(country_code="usa").data)
+        self.nstates = len(StatesGenerator(country_code="usa").data)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_pop(self, name, populations):
+        fpath = os.path.join(self.tmpdir, name)
+        with open(fpath, "w") as f:
+            f.write("\n".join(str(p) for p in populations))
+        return fpath
+
+    def test_population_weighted_cities(self):
+        # The first city holds half of the population
+        populations = [self.ncities - 1] + [1] * (self.ncities - 1)
+        pop_file = self.write_pop("usa.pop", populations)
+        pcg = PopulationWeightedCitiesGenerator(country_code="usa", population_file=pop_file)
+
+        random.seed(420)
+        res = []
+        for j in range(4):
+            res += pcg.generate_nonunique(size=5000)
+        pct = res.count(pcg.data[0]) / len(res)
+        self.assertAlmostEqual(pct, 0.5, delta=0.02)
+
+        random.seed(420)
+        res = pcg.generate(size=100)
+        self.assertEqual(len(res), 100)
+        self.assertEqual(len(set(pcg.generate_indices(size=1000))), 1000)
+        self.assertIn(pcg.data[0], pcg.generate(size=self.ncities // 2))
+
+    def test_population_weighted_skewed(self):
+        # Ten cities hold nearly all of the population: skipping repeats
+        # would take about 10 ** 11 tries per draw once they are taken
+        populations = [10 ** 12] * 10 + [1] * (self.ncities - 10)
+        pop_file = self.write_pop("usa.pop", populations)
+        pcg = PopulationWeightedCitiesGenerator(country_code="usa", population_file=pop_file, rng=420)
+        indices = pcg.generate_indices(size=100)
+        self.assertEqual(len(set(indices)), 100)
+        self.assertEqual(sorted(indices[:10]), list(range(10)))
+
+    def test_population_weighted_streams(self):
+        populations = [1] * self.nstates
+        populations[0] = 10 ** 6
+        pop_file = self.write_pop("usa_states.pop", populations)
+        psg = PopulationWeightedStatesGenerator(country_code="usa", population_file=pop_file, rng=420)
+
+        # Draws with replacement never run out, even past the number of states
+        drawn = list(islice(psg.iter_generate(chunk_size=16), 200))
+        self.assertGreater(drawn.count(psg.data[0]), 190)
+        chunks = list(islice(psg.stream(chunk_size=16), 3))
+        self.assertEqual([len(chunk) for chunk in chunks], [16, 16, 16])
+
+        unique = list(psg.iter_generate(unique=True))
+        self.assertEqual(sorted(unique), sorted(psg.data))
+        self.assertEqual(unique[0], psg.data[0])
+        self.assertEqual(sum(len(chunk) for chunk in psg.stream(chunk_size=10, unique=True)), self.nstates)
+
+    def test_population_weighted_states(self):
+        populations = [1] * self.nstates
+        populations[-1] = 10 ** 6
+        pop_file = self.write_pop("usa_states.pop", populations)
+        psg = PopulationWeightedStatesGenerator(country_code="usa", population_file=pop_file)
+
+        random.seed(420)
+        res = psg.generate_nonunique(size=50) + psg.generate_nonunique(size=50)
+        self.assertGreater(res.count(psg.data[-1]), 90)
+        self.assertEqual(sorted(psg.generate(size=self.nstates)), sorted(psg.data))
+
+    def test_alias_table_files(self):
+        pop_file = self.write_pop("usa_states.pop", range(1, self.nstates + 1))
+        self.assertEqual(build_alias_tables(self.tmpdir), [get_alias_file(pop_file)])
+
+        table = read_alias_table(get_alias_file(pop_file))
+        built = AliasTable(list(range(1, self.nstates + 1)))
+        self.assertEqual(list(table.prob), list(built.prob))
+        self.assertEqual(list(table.alias), list(built.alias))
+        self.assertIs(get_population_table(get_alias_file(pop_file)), get_population_table(get_alias_file(pop_file)))
+
+        psg = PopulationWeightedStatesGenerator(country_code="usa", population_file=get_alias_file(pop_file))
+        random.seed(420)
+        self.assertEqual(len(psg.generate_nonunique(size=10)), 10)
+
+        alias_file = os.path.join(self.tmpdir, "copy.alias")
+        write_alias_table(built, alias_file)
+        with open(alias_file, "rb") as f:
+            data = f.read()
+        with open(alias_file, "wb") as f:
+            f.write(data[:-4])
+        with self.assertRaises(GeographyError):
+            read_alias_table(alias_file)
+
+    def test_population_errors(self):
+        # No population data ships for the built-in countries unless parse_all.py is re-run
+        usa_cities = CitiesGenerator(country_code="usa").cities_file
+        if not os.path.exists(get_alias_file(usa_cities)):
+            with self.assertRaises(GeographyError):
+                PopulationWeightedCitiesGenerator(country_code="usa")
+        with self.assertRaises(FileNotFoundError):
+            PopulationWeightedCitiesGenerator(country_code="usa", population_file="/no/such/file.pop")
+
+        pcg = PopulationWeightedCitiesGenerator(country_code="usa", population_file=self.write_pop("short.pop", [1, 2]))
+        with self.assertRaises(GeographyError):
+            pcg.generate(size=1)
+
+        with self.assertRaises(GeographyError):
+            get_population_table(self.write_pop("zero.pop", [1, 0, 2]))
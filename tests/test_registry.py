@@ -0,0 +1,86 @@
+from collections.abc import Sequence
+import os
+import tempfile
+import unittest
+from team_league_generator.registry import (
+    WordListRegistry,
+    word_lists,
+    preload,
+    clear,
+)
+from team_league_generator.players import FirstNameGenerator
+from team_league_generator.teams import TeamNameGenerator
+from team_league_generator.utils import get_team_names_data_file
+
+
+class TestRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.tmp = cls.tmpdir.name
+
+    def write_file(self, name, lines):
+        fpath = os.path.join(self.tmp, name)
+        with open(fpath, "w") as f:
+            f.write("\n".join(lines))
+        return fpath
+
+    def test_registry_shared(self):
+        tg1 = TeamNameGenerator()
+        tg2 = TeamNameGenerator()
+        self.assertIs(tg1.data, tg2.data)
+        self.assertIsInstance(tg1.data, Sequence)
+        self.assertIn(get_team_names_data_file(), word_lists)
+
+    def test_registry_decoded_shared(self):
+        # Bulk draws share one decoded copy of a packed list across generators
+        fng1 = FirstNameGenerator()
+        fng2 = FirstNameGenerator()
+        decoded = fng1.get_decoded_data()
+        self.assertIsInstance(decoded, tuple)
+        self.assertEqual(decoded, tuple(fng1.data))
+        self.assertIs(fng2.get_decoded_data(), decoded)
+        self.assertIs(word_lists.get_decoded(fng1.data), decoded)
+        self.assertIsNone(word_lists.get_decoded(fng1.data[:10]))
+
+    def test_registry_reload(self):
+        reg = WordListRegistry()
+        fpath = self.write_file("reload.txt", ["Ones", "", "  Twos  "])
+        self.assertEqual(reg.get(fpath), ("Ones", "Twos"))
+        self.assertIs(reg.get(fpath), reg.get(fpath))
+
+        # Changing the file invalidates the cached list
+        self.write_file("reload.txt", ["Ones", "Twos", "Threes"])
+        st = os.stat(fpath)
+        os.utime(fpath, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(reg.get(fpath), ("Ones", "Twos", "Threes"))
+
+    def test_registry_parser(self):
+        reg = WordListRegistry()
+        fpath = self.write_file("parser.txt", ["a", "b"])
+        self.assertEqual(reg.get(fpath, parser=lambda lines: len(lines)), 2)
+        self.assertEqual(reg.get(fpath), ("a", "b"))
+
+    def test_registry_lru(self):
+        reg = WordListRegistry(maxsize=2)
+        fpaths = [self.write_file(f"lru{j}.txt", [str(j)]) for j in range(3)]
+        reg.preload(fpaths[:2])
+        reg.get(fpaths[0])
+        reg.get(fpaths[2])
+        self.assertEqual(len(reg), 2)
+        self.assertIn(fpaths[0], reg)
+        self.assertNotIn(fpaths[1], reg)
+        self.assertIn(fpaths[2], reg)
+
+        reg.clear()
+        self.assertEqual(len(reg), 0)
+
+    def test_preload_clear(self):
+        clear()
+        self.assertEqual(len(word_lists), 0)
+        preload()
+        self.assertIn(get_team_names_data_file(), word_lists)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.tmpdir
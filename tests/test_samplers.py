@@ -0,0 +1,256 @@
+import random
+import unittest
+from team_league_generator.samplers import (
+    AliasTable,
+    Deck,
+    FeistelPermutation,
+    LinearSampler,
+    _isqrt_newton,
+    linear_weights,
+    reservoir_sample,
+    reservoir_sample_with_replacement,
+    sample_indices,
+    weighted_reservoir_sample,
+    weighted_sample_without_replacement,
+)
+
+
+class AliasTableTests(unittest.TestCase):
+    """
+    Test the alias table sampler.
+    """
+
+    def test_alias_table_errors(self):
+        with self.assertRaises(ValueError):
+            AliasTable([])
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0, 0])
+
+    def test_alias_table_distribution(self):
+        weights = linear_weights(5)
+        self.assertEqual(weights, [5, 4, 3, 2, 1])
+
+        table = AliasTable(weights)
+        self.assertEqual(len(table), 5)
+
+        random.seed(420)
+        samples = table.sample_many(20000)
+        for i, w in enumerate(weights):
+            pct = samples.count(i) / len(samples)
+            self.assertAlmostEqual(pct, w / 15, delta=0.02)
+
+    def test_alias_table_zero_weight(self):
+        table = AliasTable([0, 1, 0, 1])
+        random.seed(420)
+        samples = set(table.sample() for j in range(1000))
+        self.assertEqual(samples, {1, 3})
+
+
+class LinearSamplerTests(unittest.TestCase):
+    """
+    Test the table-free linear sampler.
+    """
+
+    def test_linear_sampler_exact(self):
+        # Every uniform draw below the total weight maps to the right index
+        n = 7
+        sampler = LinearSampler(n)
+
+        class Counter(object):
+            v = 0
+
+            def randrange(self, total):
+                return self.v
+
+        counter = Counter()
+        counts = [0] * n
+        for v in range(sampler.total):
+            counter.v = v
+            counts[sampler.sample(counter)] += 1
+        self.assertEqual(counts, linear_weights(n))
+
+    def test_isqrt_newton(self):
+        # Fallback for Python 3.7, which has no math.isqrt
+        for x in list(range(2000)) + [10 ** 24, 10 ** 24 - 1, (1 << 127) - 1]:
+            r = _isqrt_newton(x)
+            self.assertLessEqual(r * r, x)
+            self.assertGreater((r + 1) * (r + 1), x)
+
+    def test_linear_sampler_distribution(self):
+        sampler = LinearSampler(5)
+        random.seed(420)
+        samples = sampler.sample_many(20000)
+        for i, w in enumerate(linear_weights(5)):
+            self.assertAlmostEqual(samples.count(i) / len(samples), w / 15, delta=0.02)
+
+        huge = LinearSampler(10 ** 12)
+        for i in huge.sample_many(1000):
+            self.assertIn(i, range(10 ** 12))
+        with self.assertRaises(ValueError):
+            LinearSampler(0)
+
+
+class WeightedSampleTests(unittest.TestCase):
+    """
+    Test weighted sampling without replacement.
+    """
+
+    def test_weighted_sample_full_ranking(self):
+        random.seed(420)
+        ranking = weighted_sample_without_replacement(linear_weights(200), 200)
+        self.assertEqual(sorted(ranking), list(range(200)))
+
+    def test_weighted_sample_zero_weight(self):
+        random.seed(420)
+        sample = weighted_sample_without_replacement([1, 0, 1, 0], 4)
+        self.assertEqual(sorted(sample), [0, 2])
+
+    def test_weighted_sample_bias(self):
+        """
+        The first pick of each sample follows the weights exactly.
+        """
+        weights = linear_weights(5)
+        random.seed(420)
+        firsts = [weighted_sample_without_replacement(weights, 2)[0] for j in range(20000)]
+        for i, w in enumerate(weights):
+            pct = firsts.count(i) / len(firsts)
+            self.assertAlmostEqual(pct, w / 15, delta=0.02)
+
+
+class SampleIndicesTests(unittest.TestCase):
+    """
+    Test uniform sampling of distinct indices.
+    """
+
+    def test_sample_indices(self):
+        random.seed(420)
+        sample = sample_indices(1000, 100)
+        self.assertEqual(len(set(sample)), 100)
+        for i in sample:
+            self.assertIn(i, range(1000))
+
+    def test_sample_indices_full(self):
+        random.seed(420)
+        sample = sample_indices(50, 50)
+        self.assertEqual(sorted(sample), list(range(50)))
+
+    def test_sample_indices_errors(self):
+        with self.assertRaises(ValueError):
+            sample_indices(5, 6)
+        with self.assertRaises(ValueError):
+            sample_indices(5, -1)
+
+
+class FeistelPermutationTests(unittest.TestCase):
+    """
+    Test the on-demand pseudorandom permutation.
+    """
+
+    def test_permutation_is_bijection(self):
+        for n in [1, 2, 3, 10, 64, 1000, 4097]:
+            perm = FeistelPermutation(n, seed=420)
+            self.assertEqual(len(perm), n)
+            self.assertEqual(sorted(perm.permute(i) for i in range(n)), list(range(n)))
+
+    def test_permutation_seeded(self):
+        a = [FeistelPermutation(1000, seed=420).permute(i) for i in range(1000)]
+        b = [FeistelPermutation(1000, seed=420).permute(i) for i in range(1000)]
+        c = [FeistelPermutation(1000, seed=421).permute(i) for i in range(1000)]
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertNotEqual(a, list(range(1000)))
+
+    def test_permutation_errors(self):
+        with self.assertRaises(ValueError):
+            FeistelPermutation(0, seed=420)
+        perm = FeistelPermutation(10, seed=420)
+        with self.assertRaises(IndexError):
+            perm.permute(10)
+        with self.assertRaises(IndexError):
+            perm.permute(-1)
+
+
+class DeckTests(unittest.TestCase):
+    """
+    Test the incremental Fisher-Yates deck.
+    """
+
+    def test_deck_deals_every_index_once(self):
+        deck = Deck(1000, seed=420)
+        dealt = []
+        while len(deck) > 0:
+            dealt += deck.draw(min(37, len(deck)))
+        self.assertEqual(sorted(dealt), list(range(1000)))
+        self.assertNotEqual(dealt, list(range(1000)))
+        self.assertEqual(deck.swapped, {})
+        with self.assertRaises(ValueError):
+            deck.draw()
+
+    def test_deck_reset_reshuffle(self):
+        deck = Deck(100, seed=420)
+        first = deck.draw(60)
+        deck.reset()
+        self.assertEqual(len(deck), 100)
+        self.assertEqual(deck.draw(60), first)
+        deck.reshuffle()
+        self.assertEqual(len(deck), 100)
+        self.assertNotEqual(deck.draw(60), first)
+
+    def test_deck_checkpoint_restore(self):
+        deck = Deck(100, seed=420)
+        deck.draw(30)
+        checkpoint = deck.checkpoint()
+        rest = deck.draw(70)
+
+        restored = Deck(100)
+        restored.restore(checkpoint)
+        self.assertEqual(len(restored), 70)
+        self.assertEqual(restored.draw(70), rest)
+        with self.assertRaises(ValueError):
+            Deck(99).restore(checkpoint)
+
+
+class ReservoirTests(unittest.TestCase):
+    """
+    Test single-pass sampling from iterables of unknown length.
+    """
+
+    def test_reservoir_sample(self):
+        random.seed(420)
+        counts = [0] * 10
+        for j in range(10000):
+            sample = reservoir_sample(iter(range(10)), 3)
+            self.assertEqual(len(set(sample)), 3)
+            for i in sample:
+                counts[i] += 1
+        for count in counts:
+            self.assertAlmostEqual(count / 10000, 0.3, delta=0.02)
+
+        self.assertEqual(sorted(reservoir_sample(iter(range(3)), 5)), [0, 1, 2])
+        self.assertEqual(reservoir_sample(iter(range(3)), 0), [])
+        with self.assertRaises(ValueError):
+            reservoir_sample([], -1)
+
+    def test_weighted_reservoir_sample(self):
+        random.seed(420)
+        weights = [1, 2, 3, 4, 5]
+        firsts = [weighted_reservoir_sample(iter(range(5)), 2, lambda i: weights[i])[0] for j in range(20000)]
+        for i, w in enumerate(weights):
+            self.assertAlmostEqual(firsts.count(i) / len(firsts), w / 15, delta=0.02)
+
+        sample = weighted_reservoir_sample(iter(range(100)), 100, lambda i: i % 2)
+        self.assertEqual(sorted(sample), list(range(1, 100, 2)))
+
+    def test_reservoir_sample_with_replacement(self):
+        random.seed(420)
+        weights = [1, 2, 3, 4, 5]
+        samples = []
+        for j in range(4000):
+            samples += reservoir_sample_with_replacement(iter(range(5)), 5, weight=lambda i: weights[i])
+        for i, w in enumerate(weights):
+            self.assertAlmostEqual(samples.count(i) / len(samples), w / 15, delta=0.02)
+
+        samples = reservoir_sample_with_replacement(iter(range(5)), 20000)
+        for i in range(5):
+            self.assertAlmostEqual(samples.count(i) / len(samples), 0.2, delta=0.02)
+        self.assertEqual(reservoir_sample_with_replacement(iter([]), 3), [])
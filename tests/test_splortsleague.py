@@ -1,5 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import os
 import random
+import tempfile
 import unittest
+from team_league_generator.errors import GeographyError, InvalidSizeRequestError, KeywordError
+from team_league_generator.players import NameGenerator
 from team_league_generator.splortsleague import SplortsLeagueGenerator
 
 
@@ -12,13 +18,199 @@ class TestSplortsLeague(unittest.TestCase):
         res = slg.generate()
 
         league_names = ["Aleatoric", "Epistemic"]
-        division_names = ["Peanut", "Raspberry"]
+        division_names = ["Postminimalism", "Primitivism"]
         for league_name in league_names:
             self.assertIn(league_name, res.keys())
             for division_name in division_names:
                 self.assertIn(division_name, res[league_name])
 
-        self.assertIn("Jersey City Neutron Equations", res[league_names[0]][division_names[0]])
+        self.assertIn("Kendall Noggins", res[league_names[0]][division_names[0]])
+
+    def test_splorts_league_generator_rng(self):
+        slg1 = SplortsLeagueGenerator(rng=420)
+        slg2 = SplortsLeagueGenerator(rng=random.Random(420))
+        random.seed(1)
+        res1 = slg1.generate(nleagues=3, ndivisions=3)
+        random.seed(2)
+        res2 = slg2.generate(nleagues=3, ndivisions=3)
+        self.assertEqual(res1, res2)
+        for gen in (slg1.geo, slg1.team, slg1.lea, slg1.div):
+            self.assertIs(gen.rng, slg1.rng)
+
+        # Replaying a seeded league leaves the instance's stream alone
+        rng = slg1.rng
+        state = rng.getstate()
+        slg1.generate_seeded(420, 0)
+        self.assertIs(slg1.rng, rng)
+        self.assertIs(slg1.geo.rng, rng)
+        self.assertEqual(rng.getstate(), state)
+
+        # So do per-call random streams on every other path
+        self.assertEqual(slg1.generate_large(3, 3, 4, rng=7), slg2.generate_large(3, 3, 4, rng=7))
+        league1 = slg1.generate_league(3, 3, 4, rng=7)
+        self.assertEqual(league1.to_dict(), slg2.generate_league(3, 3, 4, rng=7).to_dict())
+        league1 = slg1.generate_league(30, 30, 2, large=True, rng=7)
+        self.assertEqual(league1.to_dict(), slg2.generate_league(30, 30, 2, large=True, rng=7).to_dict())
+        self.assertEqual(rng.getstate(), state)
+
+    def test_shared_options(self):
+        # One set of options can be passed to every generator
+        options = dict(country_code="can", rng=420, first_names_file=None, team_names_file=None)
+        self.assertEqual(len(SplortsLeagueGenerator(**options).generate()), 2)
+        self.assertEqual(len(NameGenerator(**options).generate(size=3)), 3)
+
+    def test_generate_seeded_threads(self):
+        slg = SplortsLeagueGenerator(rng=420)
+        expected = [slg.generate_seeded(420, i) for i in range(40)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            res = list(executor.map(lambda i: slg.generate_seeded(420, i), range(40)))
+        self.assertEqual(res, expected)
+
+        # An explicit rng works the same on a plain generate call
+        self.assertEqual(slg.generate(rng=random.Random(7)), slg.generate(rng=random.Random(7)))
+
+    def test_generate_large(self):
+        slg = SplortsLeagueGenerator(geo="cities", rng=420)
+        res = slg.generate_large(nleagues=30, ndivisions=25, teams_per_division=8)
+        self.assertEqual(len(res), 30)
+        league_names, division_names, team_names = SplortsLeagueGenerator.extract_leagues_divisions_teams(res)
+        self.assertEqual(len(division_names), 25)
+        self.assertEqual(set(league_names) & set(division_names), set())
+        nteams = 0
+        for div_dict in res.values():
+            self.assertEqual(list(div_dict.keys()), division_names)
+            for team_list in div_dict.values():
+                self.assertEqual(len(team_list), 8)
+                nteams += len(team_list)
+        self.assertEqual(nteams, 6000)
+
+        # Same seed, same league
+        res2 = SplortsLeagueGenerator(geo="cities", rng=420).generate_large(30, 25, 8)
+        self.assertEqual(res, res2)
+
+        with self.assertRaises(InvalidSizeRequestError):
+            slg.generate_large(nleagues=1000, ndivisions=1000)
+        with self.assertRaises(GeographyError):
+            slg.generate_large(nleagues=100, ndivisions=100, teams_per_division=100)
+
+        # An empty team name list is an error, not an endless loop
+        with tempfile.TemporaryDirectory() as tmp:
+            fpath = os.path.join(tmp, "teams.txt")
+            with open(fpath, "w") as f:
+                f.write("\n")
+            empty = SplortsLeagueGenerator(geo="cities", team_names_file=fpath, rng=420)
+            with self.assertRaises(InvalidSizeRequestError):
+                empty.generate_large(nleagues=2, ndivisions=2)
+
+    def test_iter_generate(self):
+        slg = SplortsLeagueGenerator(rng=420)
+        leagues = list(itertools.islice(slg.iter_generate(), 5))
+        self.assertEqual(len(leagues), 5)
+        chunks = list(itertools.islice(slg.stream(chunk_size=3), 2))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3])
+        # Same argument order as iter_generate
+        chunk = next(slg.stream(3, 2, 1, chunk_size=2))
+        self.assertEqual([len(res) for res in chunk], [3, 3])
+        with self.assertRaises(KeywordError):
+            slg.iter_generate(nleagues=1000)
+
+        # No team is used twice in a no-repeat stream, which ends with the locations
+        slg = SplortsLeagueGenerator(geo="bigstates", country_code="usa", rng=420)
+        leagues = list(slg.iter_generate(nleagues=1, ndivisions=2, teams_per_division=3, unique=True))
+        teams = [team for league in leagues for team in SplortsLeagueGenerator.extract_leagues_divisions_teams(league)[2]]
+        self.assertEqual(len(leagues), len(slg.geo) // 6)
+        self.assertEqual(len(set(teams)), 6 * len(leagues))
+
+    def test_generate_many(self):
+        slg = SplortsLeagueGenerator()
+        random.seed(420)
+        leagues = slg.generate_many(50, nleagues=3, ndivisions=2, teams_per_division=5)
+        self.assertNotIsInstance(leagues, list)
+
+        count = 0
+        for res in leagues:
+            count += 1
+            self.assertEqual(len(res), 3)
+            (
+                league_names,
+                division_names,
+                team_names,
+            ) = SplortsLeagueGenerator.extract_leagues_divisions_teams(res)
+            self.assertEqual(len(division_names), 2)
+            self.assertEqual(len(team_names), 30)
+            self.assertEqual(len(set(league_names) & set(division_names)), 0)
+        self.assertEqual(count, 50)
+
+        # Bad arguments are reported when generate_many is called
+        with self.assertRaises(InvalidSizeRequestError):
+            slg.generate_many(-1)
+        with self.assertRaises(KeywordError):
+            slg.generate_many(10, nleagues=1000)
+        with self.assertRaises(TypeError):
+            slg.generate_many(10, geo="states")
+
+    def division_ranks(self, leagues, locations):
+        """
+        Mean rank (position in the location list) of the locations in the
+        first and in the last division of every league. Team names must be one word.
+        """
+        rank = {}
+        for i, loc in enumerate(locations):
+            rank.setdefault(loc, i)
+        first, last = [], []
+        for res in leagues:
+            for league in res.values():
+                divisions = list(league.values())
+                first.extend(rank[team.rsplit(" ", 1)[0]] for team in divisions[0])
+                last.extend(rank[team.rsplit(" ", 1)[0]] for team in divisions[-1])
+        return sum(first) / len(first), sum(last) / len(last)
+
+    def test_division_balance(self):
+        # Biased locations come out biggest first, but every division gets a fair share
+        with tempfile.TemporaryDirectory() as tmp:
+            fpath = os.path.join(tmp, "teams.txt")
+            with open(fpath, "w") as f:
+                f.write("\n".join(f"Team{j}" for j in range(200)))
+            slg = SplortsLeagueGenerator(geo="bigstates", team_names_file=fpath, rng=420)
+            leagues = slg.generate_many(3000, nleagues=2, ndivisions=2, teams_per_division=4)
+            first, last = self.division_ranks(leagues, slg.geo.data)
+            self.assertAlmostEqual(first, last, delta=0.5)
+            leagues = [slg.generate_large(1, 5, 4) for j in range(1000)]
+            first, last = self.division_ranks(leagues, slg.geo.data)
+            self.assertAlmostEqual(first, last, delta=0.5)
+
+    def test_generate_parallel(self):
+        slg = SplortsLeagueGenerator(country_code="can")
+        sizes = dict(nleagues=2, ndivisions=3, teams_per_division=3)
+        res1 = list(slg.generate_parallel(20, seed=420, workers=1, chunk_size=7, **sizes))
+        res3 = list(slg.generate_parallel(20, seed=420, workers=3, chunk_size=2, **sizes))
+        self.assertEqual(len(res1), 20)
+        self.assertEqual(res1, res3)
+
+        # Each league can be replayed on its own
+        self.assertEqual(res1[13], slg.generate_seeded(420, 13, **sizes))
+
+        res4 = list(slg.generate_parallel(20, seed=421, workers=2, **sizes))
+        self.assertNotEqual(res1, res4)
+
+        # Bad arguments are reported before any worker starts
+        with self.assertRaises(InvalidSizeRequestError):
+            slg.generate_parallel(-1, seed=420)
+        with self.assertRaises(KeywordError):
+            slg.generate_parallel(10, seed=420, nleagues=1000)
+
+    def test_splorts_league_generator_lazy(self):
+        slg = SplortsLeagueGenerator()
+        for gen in (slg.geo, slg.team, slg.lea, slg.div):
+            self.assertIsNone(gen._data)
+
+        slg.team.generate(size=4)
+        self.assertIsNotNone(slg.team._data)
+        self.assertIsNone(slg.geo._data)
+
+        self.assertIs(slg.warm(), slg)
+        for gen in (slg.geo, slg.team, slg.lea, slg.div):
+            self.assertIsNotNone(gen._data)
 
     def test_extract_leagues_divisions_teams_sim(self):
         league = {
@@ -63,9 +255,9 @@ class TestSplortsLeague(unittest.TestCase):
         ) = SplortsLeagueGenerator.extract_leagues_divisions_teams(res)
         self.assertIn("Aleatoric", league_names)
         self.assertIn("Epistemic", league_names)
-        self.assertIn("Peanut", division_names)
-        self.assertIn("Raspberry", division_names)
-        self.assertIn("Albany Flying Scots", team_names)
+        self.assertIn("Postminimalism", division_names)
+        self.assertIn("Primitivism", division_names)
+        self.assertIn("Asheville Frivolities", team_names)
 
     def test_league_geo_type(self):
         # -----
@@ -82,11 +274,11 @@ class TestSplortsLeague(unittest.TestCase):
         ) = SplortsLeagueGenerator.extract_leagues_divisions_teams(res)
         self.assertIn('Aleatoric', league_names)
         self.assertIn('Epistemic', league_names)
-        self.assertIn('Peanut', division_names)
-        self.assertIn('Raspberry', division_names)
-        self.assertIn('Avtury Flying Scots', team_names)
-        self.assertIn('Podolsk Pharynges', team_names)
-        self.assertIn('Saratov Dogcatchers', team_names)
+        self.assertIn('Postminimalism', division_names)
+        self.assertIn('Primitivism', division_names)
+        self.assertIn('Aznakay Frivolities', team_names)
+        self.assertIn('Mozdok Pharynges', team_names)
+        self.assertIn('Norilsk Drunken Surgeons', team_names)
 
         # -----
         # States
@@ -102,11 +294,11 @@ class TestSplortsLeague(unittest.TestCase):
         ) = SplortsLeagueGenerator.extract_leagues_divisions_teams(res2)
         self.assertIn('Alpha', league_names2)
         self.assertIn('Bravo', league_names2)
-        self.assertIn('Apricot', division_names2)
-        self.assertIn('Lime', division_names2)
-        self.assertIn('Altai Krai Spartans', team_names2)
-        self.assertIn('Khabarovsk Necessities', team_names2)
-        self.assertIn('Tomsk Purple Quokkas', team_names2)
+        self.assertIn('Honeydew', division_names2)
+        self.assertIn('Pineapple', division_names2)
+        self.assertIn('Altai Krai Wealth Redistributors', team_names2)
+        self.assertIn('Kursk Kangaroos', team_names2)
+        self.assertIn('Orenburg Purple Capes', team_names2)
 
         # -----
         # Failure
@@ -9,6 +9,7 @@ from team_league_generator.teams import (
     LeagueNameGenerator,
     DivisionNameGenerator,
 )
+from team_league_generator.errors import InvalidSizeRequestError
 
 
 class TestTeams(unittest.TestCase):
@@ -28,7 +29,7 @@ class TestTeams(unittest.TestCase):
         tg = TeamNameGenerator()
         random.seed(420)
         res = tg.generate(size=4)
-        self.assertIn("Ritualists", res)
+        self.assertIn("People Eaters", res)
 
     def test_team_name_generator_data_file(self):
         teams = [
@@ -120,6 +121,45 @@ class LeagueDivisionTest(unittest.TestCase):
         self.assertIn('Kabba', res)
         self.assertIn('Labba', res)
 
+    def test_league_division_generate_pair(self):
+        leagues_divisions = [
+            "Zabba,Babba,Cabba",
+            "Babba,Zabba,Fabba",
+            "Kabba,Labba,Mabba,Nabba",
+            "Cabba,Qabba",
+            "Pabba",
+        ]
+        tempfile = os.path.join(self.tmp, 'leagues_divisions_pair.txt')
+        with open(tempfile, 'w') as f:
+            f.write('\n'.join(leagues_divisions))
+
+        lg = LeagueNameGenerator(leagues_divisions_file=tempfile, rng=420)
+        self.assertEqual(lg.max_len, 4)
+        self.assertEqual(lg.get_index().rows_by_size[3], (0, 1, 2))
+
+        # The index (and max_len) is built once per list and shared
+        dg = DivisionNameGenerator(leagues_divisions_file=tempfile, rng=420)
+        self.assertIs(dg.get_index(), lg.get_index())
+        self.assertEqual(dg.max_len, 4)
+
+        for j in range(200):
+            leagues, divisions = lg.generate_pair(2, 2)
+            self.assertEqual(len(leagues), 2)
+            self.assertEqual(len(divisions), 2)
+            self.assertEqual(set(leagues) & set(divisions), set())
+
+        # Rows 0 and 1 only pair with row 2
+        for j in range(50):
+            leagues, divisions = lg.generate_pair(3, 3)
+            if leagues[0] in ('Zabba', 'Babba'):
+                self.assertEqual(divisions, ['Kabba', 'Labba', 'Mabba'])
+
+        # Only one row is long enough for both
+        with self.assertRaises(InvalidSizeRequestError):
+            lg.generate_pair(4, 4)
+        with self.assertRaises(InvalidSizeRequestError):
+            lg.generate_pair(5, 1)
+
     @classmethod
     def tearDownClass(cls):
         del cls.tmpdir
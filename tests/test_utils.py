@@ -2,17 +2,30 @@ import os
 import random
 import unittest
 from team_league_generator.constants import DATA, GEO
+from team_league_generator.errors import CountryCodeError
 from team_league_generator.utils import (
     get_city_country_codes,
     get_state_country_codes,
     get_cities_data_file_from_country_code,
     get_states_data_file_from_country_code,
     country_code_to_english,
+    country_codes_to_english,
+    english_to_country_code,
+    english_to_country_codes,
     get_abbr_key_file,
     get_team_names_data_file,
     get_leagues_divisions_data_file,
     get_cities_count,
     get_states_count,
+    get_cities_bucket_sizes,
+    get_states_bucket_sizes,
+    all_counts,
+)
+from team_league_generator.geography import (
+    BigCitiesGenerator,
+    SmallTownsGenerator,
+    BigStatesGenerator,
+    SmallStatesGenerator,
 )
 
 class TestUtils(unittest.TestCase):
@@ -52,6 +65,33 @@ class TestUtils(unittest.TestCase):
         for country_code, country_name in gold.items():
             self.assertEqual(country_code_to_english(country_code), country_name)
 
+        self.assertEqual(country_codes_to_english(list(gold.keys())), list(gold.values()))
+
+        with self.assertRaises(CountryCodeError):
+            country_code_to_english('narnia')
+
+    def test_english_to_country_code(self):
+        gold = {
+            'Russia': 'rus',
+            'united states': 'usa',
+            'CHILE': 'chi',
+            'Ivory Coast': 'civ',
+        }
+        for country_name, country_code in gold.items():
+            self.assertEqual(english_to_country_code(country_name), country_code)
+
+        self.assertEqual(english_to_country_codes(list(gold.keys())), list(gold.values()))
+
+        with self.assertRaises(CountryCodeError):
+            english_to_country_code('Narnia')
+
+        # Every name in the abbreviations key is in the manifest
+        with open(get_abbr_key_file(), 'r') as f:
+            for line in f:
+                split = line.strip().split(" ")
+                if len(split) > 1:
+                    self.assertEqual(english_to_country_code(" ".join(split[1:])), split[0].lower())
+
     def test_get_abbr_key_file(self):
         our_path = os.path.join(GEO, '_ABBR_KEY')
         their_path = get_abbr_key_file()
@@ -69,11 +109,11 @@ class TestUtils(unittest.TestCase):
 
     def test_cities_count(self):
         counts = {
-            'usa': 14895,
-            'rus': 4589,
-            'fra': 9022,
-            'ger': 7525,
-            'can': 1181,
+            'usa': 10821,
+            'rus': 4196,
+            'fra': 8873,
+            'ger': 7020,
+            'can': 1162,
         }
         for cc in counts:
             count = get_cities_count(cc)
@@ -90,3 +130,32 @@ class TestUtils(unittest.TestCase):
         for cc in counts:
             count = get_states_count(cc)
             self.assertEqual(counts[cc], count)
+
+    def test_bucket_sizes(self):
+        for cc in ['usa', 'rus', 'can']:
+            sizes = get_cities_bucket_sizes(cc)
+            self.assertEqual(sizes['cities'], get_cities_count(cc))
+            self.assertEqual(sizes['bigcities'], len(BigCitiesGenerator(country_code=cc).data))
+            self.assertEqual(sizes['smalltowns'], len(SmallTownsGenerator(country_code=cc).data))
+
+            sizes = get_states_bucket_sizes(cc)
+            self.assertEqual(sizes['states'], get_states_count(cc))
+            self.assertEqual(sizes['bigstates'], len(BigStatesGenerator(country_code=cc).data))
+            self.assertEqual(sizes['smallstates'], len(SmallStatesGenerator(country_code=cc).data))
+
+    def test_counts_errors(self):
+        with self.assertRaises(CountryCodeError):
+            get_cities_count('narnia')
+        with self.assertRaises(CountryCodeError):
+            get_states_count('narnia')
+        with self.assertRaises(CountryCodeError):
+            get_states_bucket_sizes('usatx')
+
+    def test_all_counts(self):
+        counts = all_counts()
+        self.assertEqual(set(counts.keys()), set(get_city_country_codes()) | set(get_state_country_codes()))
+        self.assertEqual(counts['usa']['cities'], 10821)
+        self.assertEqual(counts['usa']['states'], 51)
+        self.assertEqual(counts['usa']['bigstates'], 25)
+        self.assertEqual(counts['usa']['smallstates'], 26)
+        self.assertNotIn('states', counts['usatx'])